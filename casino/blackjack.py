@@ -3,18 +3,22 @@ from __future__ import annotations
 import asyncio
 import os
 import random
-import tempfile
+import threading
+from collections import OrderedDict
 from contextlib import suppress
-from typing import Dict, List, Optional, TypedDict
+from io import BytesIO
+from typing import Dict, List, Optional, Sequence, Tuple, TypedDict
 
 import discord
 from PIL import Image
-from redbot.core import Config, bank, commands
+from redbot.core import bank, commands
 from .casino_core import mark_played, refund_wager, settle_game, validate_bet
+from .stats import game_stats
 
 
-CONFIG = Config.get_conf(None, identifier=1234567890)
-CONFIG.register_user(total_wins=0, total_losses=0, total_bet=0)
+CARDS_DIR = os.path.join(os.path.dirname(__file__), "cards")
+CARD_SIZE = (100, 145)
+HAND_CACHE_SIZE = 256
 
 SUIT_EMOJIS = {
     "H": "♥",
@@ -63,6 +67,57 @@ def make_deck() -> List[str]:
     return [f"{rank}{suit}" for rank in ranks for suit in "SHDC"]
 
 
+_ATLAS: Dict[str, Image.Image] = {}
+_HAND_CACHE: "OrderedDict[Tuple[Tuple[str, ...], Tuple[str, ...]], bytes]" = OrderedDict()
+_RENDER_LOCK = threading.Lock()
+
+
+def _card_atlas() -> Dict[str, Image.Image]:
+    """Every card face plus the back, converted and resized once per process."""
+    if not _ATLAS:
+        for name in make_deck() + ["back"]:
+            with Image.open(os.path.join(CARDS_DIR, f"{name}.png")) as source:
+                _ATLAS[name] = source.convert("RGBA").resize(CARD_SIZE)
+    return _ATLAS
+
+
+def render_hand(player: Sequence[str], dealer: Sequence[str], reveal_all: bool = True) -> bytes:
+    """PNG of the dealer's hand above the player's, cached by the cards shown.
+
+    Blocking; run it in an executor. With ``reveal_all`` off the dealer's hole
+    card is drawn face down, and the cache key only contains what's visible.
+    """
+    shown_dealer = tuple("back" if index == 1 and not reveal_all else card for index, card in enumerate(dealer))
+    key = (tuple(player), shown_dealer)
+    with _RENDER_LOCK:
+        cached = _HAND_CACHE.get(key)
+        if cached is not None:
+            _HAND_CACHE.move_to_end(key)
+            return cached
+        atlas = _card_atlas()
+
+    width, height = CARD_SIZE
+    player_width = width * len(player)
+    dealer_width = width * len(shown_dealer)
+    total_width = max(player_width, dealer_width)
+    with Image.new("RGBA", (total_width, height * 2 + 20), (0, 0, 0, 0)) as combo:
+        for row, y, row_width in ((shown_dealer, 0, dealer_width), (key[0], height + 10, player_width)):
+            x = (total_width - row_width) // 2
+            for card in row:
+                image = atlas[card]
+                combo.paste(image, (x, y), image)
+                x += width
+        output = BytesIO()
+        combo.save(output, format="PNG")
+
+    png = output.getvalue()
+    with _RENDER_LOCK:
+        _HAND_CACHE[key] = png
+        while len(_HAND_CACHE) > HAND_CACHE_SIZE:
+            _HAND_CACHE.popitem(last=False)
+    return png
+
+
 class BlackjackView(discord.ui.View):
     def __init__(self, cog: "Blackjack", ctx: commands.Context):
         super().__init__(timeout=60)
@@ -209,22 +264,6 @@ class Blackjack(commands.Cog):
                     + ("Your wager was refunded." if refunded == bet else "Your refund was limited by the bank balance cap.")
                 )
 
-    def _load_card_images(self, hand: List[str], reveal_all: bool = True) -> List[Image.Image]:
-        images: List[Image.Image] = []
-        cards_dir = os.path.join(os.path.dirname(__file__), "cards")
-
-        try:
-            for index, card in enumerate(hand):
-                filename = "back.png" if index == 1 and not reveal_all else f"{card}.png"
-                path = os.path.join(cards_dir, filename)
-                with Image.open(path) as source:
-                    images.append(source.convert("RGBA").resize((100, 145)))
-            return images
-        except Exception:
-            for image in images:
-                image.close()
-            raise
-
     async def show_game(
         self,
         ctx: commands.Context,
@@ -240,35 +279,12 @@ class Blackjack(commands.Cog):
 
         player_hand = game["player"]
         dealer_hand = game["dealer"]
-        player_images: List[Image.Image] = []
-        dealer_images: List[Image.Image] = []
-        combo: Optional[Image.Image] = None
-        temp_path: Optional[str] = None
         file: Optional[discord.File] = None
 
         try:
-            player_images = self._load_card_images(player_hand)
-            dealer_images = self._load_card_images(dealer_hand, reveal_all=not start)
-
-            player_width = sum(image.width for image in player_images)
-            dealer_width = sum(image.width for image in dealer_images)
-            total_width = max(player_width, dealer_width)
-            total_height = 145 * 2 + 20
-            combo = Image.new("RGBA", (total_width, total_height), (0, 0, 0, 0))
-
-            x = (total_width - player_width) // 2
-            for image in player_images:
-                combo.paste(image, (x, 155), image)
-                x += image.width
-
-            x = (total_width - dealer_width) // 2
-            for image in dealer_images:
-                combo.paste(image, (x, 0), image)
-                x += image.width
-
-            with tempfile.NamedTemporaryFile(delete=False, suffix=".png") as temp:
-                temp_path = temp.name
-            combo.save(temp_path)
+            png = await asyncio.get_running_loop().run_in_executor(
+                None, render_hand, tuple(player_hand), tuple(dealer_hand), not start
+            )
 
             player_text = " ".join(format_card(card) for card in player_hand)
             dealer_text = (
@@ -290,7 +306,7 @@ class Blackjack(commands.Cog):
             )
             embed.set_image(url="attachment://hand.png")
 
-            file = discord.File(temp_path, filename="hand.png")
+            file = discord.File(BytesIO(png), filename="hand.png")
             active_view = view or game.get("view")
 
             if message is not None:
@@ -302,13 +318,6 @@ class Blackjack(commands.Cog):
         finally:
             if file is not None:
                 file.close()
-            if temp_path:
-                with suppress(OSError):
-                    os.remove(temp_path)
-            if combo is not None:
-                combo.close()
-            for image in player_images + dealer_images:
-                image.close()
 
     async def expire_game(self, ctx: commands.Context, view: BlackjackView) -> None:
         user_id = ctx.author.id
@@ -366,7 +375,6 @@ class Blackjack(commands.Cog):
 
             player_value = hand_value(player_hand)
             dealer_value = hand_value(dealer_hand)
-            user_config = CONFIG.user(ctx.author)
 
             payout = 0
             outcome = "loss"
@@ -389,14 +397,6 @@ class Blackjack(commands.Cog):
 
             settlement = await settle_game(ctx.author, "blackjack", bet, payout, outcome, channel=ctx.channel)
             deposited = settlement.deposited
-            try:
-                await user_config.total_bet.set(await user_config.total_bet() + bet)
-                if outcome == "win":
-                    await user_config.total_wins.set(await user_config.total_wins() + 1)
-                elif outcome == "loss":
-                    await user_config.total_losses.set(await user_config.total_losses() + 1)
-            except Exception:
-                self.log.exception("Failed to update legacy blackjack stats for user %s", user_id)
             self.games.pop(user_id, None)
 
         try:
@@ -426,10 +426,10 @@ class Blackjack(commands.Cog):
     @commands.command()
     async def bjstats(self, ctx: commands.Context) -> None:
         """Show your blackjack stats."""
-        data = await CONFIG.user(ctx.author).all()
+        data = await game_stats(ctx.author.id, "blackjack")
         await ctx.send(
-            f"Wins: {data['total_wins']}, Losses: {data['total_losses']}, "
-            f"Bet total: {data['total_bet']:,}"
+            f"Wins: {data['wins']}, Losses: {data['losses']}, Pushes: {data['pushes']}, "
+            f"Bet total: {data['wagered']:,}"
         )
 
 
@@ -0,0 +1,148 @@
+from __future__ import annotations
+
+import bisect
+from typing import Dict, List, Optional, Tuple
+
+BOARD_METRICS = ("wagered", "profit", "games", "wins", "losses", "payout")
+
+
+def board_values(data: dict, game: Optional[str] = None) -> Optional[dict]:
+    """Board metrics for a member stats document, overall or for one game.
+
+    Returns None when the member hasn't played (that game), so they stay off
+    the board.
+    """
+    if game:
+        source = data.get("games", {}).get(game)
+        if not source:
+            return None
+        wagered = source.get("wagered", 0)
+        values = {
+            "wagered": wagered,
+            "profit": source.get("paid", 0) - wagered,
+            "games": source.get("games", 0),
+            "wins": source.get("wins", 0),
+            "losses": source.get("losses", 0),
+            "payout": source.get("biggest_payout", 0),
+        }
+    else:
+        wagered = data.get("total_wagered", 0)
+        values = {
+            "wagered": wagered,
+            "profit": data.get("total_paid", 0) - wagered,
+            "games": data.get("total_games", 0),
+            "wins": data.get("wins", 0),
+            "losses": data.get("losses", 0),
+            "payout": data.get("biggest_payout", 0),
+        }
+    return values if values["games"] else None
+
+
+class RankedBoard:
+    """Members ordered by one metric, kept sorted as values change.
+
+    Updates and rank lookups are a bisect into a sorted list of
+    ``(-value, member_id)``; the top of the board is a slice.
+    """
+
+    def __init__(self) -> None:
+        self._order: List[Tuple[int, int]] = []
+        self._value: Dict[int, int] = {}
+
+    def __len__(self) -> int:
+        return len(self._order)
+
+    def set(self, member_id: int, value: int) -> None:
+        old = self._value.get(member_id)
+        if old == value:
+            return
+        if old is not None:
+            del self._order[bisect.bisect_left(self._order, (-old, member_id))]
+        self._value[member_id] = value
+        bisect.insort(self._order, (-value, member_id))
+
+    def remove(self, member_id: int) -> None:
+        old = self._value.pop(member_id, None)
+        if old is not None:
+            del self._order[bisect.bisect_left(self._order, (-old, member_id))]
+
+    def rank(self, member_id: int) -> Optional[int]:
+        """1-based position of a member, or None if they aren't on the board."""
+        value = self._value.get(member_id)
+        if value is None:
+            return None
+        return bisect.bisect_left(self._order, (-value, member_id)) + 1
+
+    def top(self, start: int = 0, stop: Optional[int] = None) -> List[Tuple[int, int]]:
+        """``(member_id, value)`` pairs in board order."""
+        return [(member_id, -neg) for neg, member_id in self._order[start:stop]]
+
+
+class GuildBoards:
+    """Every (game, metric) board for one guild, plus the record shown beside each name."""
+
+    def __init__(self) -> None:
+        self.boards: Dict[Tuple[Optional[str], str], RankedBoard] = {}
+        self.values: Dict[Tuple[Optional[str], int], dict] = {}
+
+    def board(self, game: Optional[str], metric: str) -> RankedBoard:
+        board = self.boards.get((game, metric))
+        if board is None:
+            board = self.boards[(game, metric)] = RankedBoard()
+        return board
+
+    def update(self, member_id: int, data: dict, game: Optional[str] = None) -> None:
+        """Re-rank a member from their stats document (overall, and `game` if given)."""
+        for scope in (None, game) if game else (None,):
+            values = board_values(data, scope)
+            if values is None:
+                continue
+            self.values[(scope, member_id)] = values
+            for metric in BOARD_METRICS:
+                self.board(scope, metric).set(member_id, values[metric])
+
+    def load(self, member_id: int, data: dict) -> None:
+        self.update(member_id, data)
+        for game in data.get("games", {}):
+            self.update(member_id, data, game)
+
+    def remove(self, member_id: int) -> None:
+        for (scope, mid) in [k for k in self.values if k[1] == member_id]:
+            del self.values[(scope, mid)]
+        for board in self.boards.values():
+            board.remove(member_id)
+
+
+class CasinoBoards:
+    """Per-guild casino board indexes, built from the settlement ledger on first use.
+
+    ``record_game`` keeps built guilds current; guilds nobody has asked about
+    since load cost nothing until their first board or rank lookup.
+    """
+
+    def __init__(self, ledger) -> None:
+        self.ledger = ledger
+        self._guilds: Dict[int, GuildBoards] = {}
+
+    async def get(self, guild) -> GuildBoards:
+        boards = self._guilds.get(guild.id)
+        if boards is None:
+            stored = await self.ledger.all_members(guild)
+            boards = self._guilds.get(guild.id)
+            if boards is None:
+                boards = GuildBoards()
+                for member_id, data in stored.items():
+                    boards.load(member_id, data)
+                # Settlements that landed while Config was being read
+                for member_id, data in self.ledger.cached_members(guild.id).items():
+                    boards.load(member_id, data)
+                self._guilds[guild.id] = boards
+        return boards
+
+    def update(self, guild_id: int, member_id: int, data: dict, game: str) -> None:
+        boards = self._guilds.get(guild_id)
+        if boards is not None:
+            boards.update(member_id, data, game)
+
+    def discard(self, guild_id: int) -> None:
+        self._guilds.pop(guild_id, None)
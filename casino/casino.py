@@ -8,8 +8,12 @@ import time
 import discord
 from redbot.core import bank, checks, commands
 
-from .casino_core import ACTIVE_GAMES, CONFIG, DEFAULT_GAME_SETTINGS, safe_deposit
+from .boards import RankedBoard
+from .casino_core import (
+    ACTIVE_GAMES, BOARDS, CONFIG, DEFAULT_GAME_SETTINGS, LEDGER, MEMBER_STAT_KEYS, safe_deposit,
+)
 from .progression import ACHIEVEMENTS, ACHIEVEMENT_MAP, challenge_definitions, ensure_rotations
+from .stats import game_totals, migrate_legacy_stats, user_totals
 
 
 class Casino(commands.Cog):
@@ -18,12 +22,27 @@ class Casino(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
 
+    async def cog_load(self):
+        await LEDGER.start()
+        await migrate_legacy_stats()
+
+    async def cog_unload(self):
+        await LEDGER.close()
+
+    async def stat_totals(self) -> dict:
+        """Lifetime casino totals per user id, for other cogs (see stats.user_totals)."""
+        return await user_totals()
+
+    async def game_totals(self, *games: str) -> dict:
+        """Lifetime wagered / wins per user id over the named games (see stats.game_totals)."""
+        return await game_totals(games)
+
     @commands.group(name="casino", invoke_without_command=True)
     @commands.guild_only()
     async def casino(self, ctx: commands.Context, member: discord.Member = None):
         """Show a unified casino profile or manage the casino."""
         member = member or ctx.author
-        data = await CONFIG.member(member).all()
+        data = await LEDGER.member_data(member)
         net = data["total_paid"] - data["total_wagered"]
         win_rate = data["wins"] / data["total_games"] * 100 if data["total_games"] else 0
         favorite = max(data["games"].items(), key=lambda item: item[1].get("games", 0))[0].title() if data["games"] else "None"
@@ -262,46 +281,22 @@ class Casino(commands.Cog):
             )
 
         game = game.lower().strip() if game else None
-        all_members = await CONFIG.all_members(ctx.guild)
+        boards = await BOARDS.get(ctx.guild)
+        # Look up without creating: a typed game name must not add a board
+        board = boards.boards.get((game, metric)) or RankedBoard()
         rows = []
-        for user_id, data in all_members.items():
-            member = ctx.guild.get_member(int(user_id))
-            if not member or member.bot:
-                continue
-
-            source = data
-            if game:
-                source = data.get("games", {}).get(game)
-                if not source:
-                    continue
-
-            if game:
-                wagered = source.get("wagered", 0)
-                paid = source.get("paid", 0)
-                values = {
-                    "wagered": wagered,
-                    "profit": paid - wagered,
-                    "games": source.get("games", 0),
-                    "wins": source.get("wins", 0),
-                    "losses": source.get("losses", 0),
-                    "payout": source.get("biggest_payout", 0),
-                }
-            else:
-                wagered = data.get("total_wagered", 0)
-                paid = data.get("total_paid", 0)
-                values = {
-                    "wagered": wagered,
-                    "profit": paid - wagered,
-                    "games": data.get("total_games", 0),
-                    "wins": data.get("wins", 0),
-                    "losses": data.get("losses", 0),
-                    "payout": data.get("biggest_payout", 0),
-                }
-            if not values["games"]:
-                continue
-            rows.append((member.display_name, values[metric], values))
-
-        rows.sort(key=lambda row: row[1], reverse=True)
+        # Walk the ranked board until ten current, non-bot members are found;
+        # members who left stay indexed in case they come back.
+        start = 0
+        while len(rows) < 10 and start < len(board):
+            for user_id, value in board.top(start, start + 25):
+                member = ctx.guild.get_member(user_id)
+                if member and not member.bot:
+                    rows.append((member.display_name, value, boards.values[(game, user_id)]))
+                    if len(rows) == 10:
+                        break
+            start += 25
+
         title_game = f" — {game.title()}" if game else ""
         display_metric = {"games": "played", "payout": "biggest win"}.get(metric, metric)
         embed = discord.Embed(
@@ -309,7 +304,7 @@ class Casino(commands.Cog):
             description=f"Top players by **{display_metric}**",
             color=discord.Color.gold(),
         )
-        for index, (name, value, values) in enumerate(rows[:10], 1):
+        for index, (name, value, values) in enumerate(rows, 1):
             record = (
                 f"Wins: **{values['wins']:,}** | "
                 f"Losses: **{values['losses']:,}** | "
@@ -323,6 +318,15 @@ class Casino(commands.Cog):
             )
         if not rows:
             embed.description = "No matching casino games have been recorded yet."
+        rank = board.rank(ctx.author.id)
+        if rank is not None:
+            # Rank among the same current, non-bot members the board lists
+            above = 0
+            for user_id, _ in board.top(0, rank - 1):
+                member = ctx.guild.get_member(user_id)
+                if member and not member.bot:
+                    above += 1
+            embed.set_footer(text=f"Your rank: #{above + 1:,}")
         await ctx.send(embed=embed)
 
 
@@ -331,7 +335,7 @@ class Casino(commands.Cog):
     async def achievements(self, ctx: commands.Context, member: discord.Member = None):
         """Show all achievements and a member's progress."""
         member = member or ctx.author
-        data = await CONFIG.member(member).all()
+        data = await LEDGER.member_data(member)
         unlocked = set(data.get("achievements", []))
         pages = []
         for start in range(0, len(ACHIEVEMENTS), 10):
@@ -364,7 +368,7 @@ class Casino(commands.Cog):
         """Show the current rotating daily and weekly challenges."""
         member = member or ctx.author
         daily_ids, weekly_ids = await ensure_rotations(ctx.guild)
-        data = await CONFIG.member(member).all()
+        data = await LEDGER.member_data(member)
         embed = discord.Embed(title=f"📋 {member.display_name}'s Ruthless Dealer Challenges", color=discord.Color.blurple())
         for label, ids, weekly in (("☀️ Daily", daily_ids, False), ("🗓️ Weekly", weekly_ids, True)):
             state = data.get("weekly_state" if weekly else "daily_state", {})
@@ -383,7 +387,7 @@ class Casino(commands.Cog):
     @commands.guild_only()
     async def title_group(self, ctx: commands.Context):
         """List unlocked titles or manage the equipped title."""
-        data = await CONFIG.member(ctx.author).all()
+        data = await LEDGER.member_data(ctx.author)
         unlocked_ids = set(data.get("achievements", []))
         titles = [a["title"] for a in ACHIEVEMENTS if a.get("title") and a["id"] in unlocked_ids]
         equipped = data.get("equipped_title") or "None"
@@ -392,7 +396,7 @@ class Casino(commands.Cog):
 
     @title_group.command(name="equip")
     async def title_equip(self, ctx: commands.Context, selection: int):
-        data = await CONFIG.member(ctx.author).all()
+        data = await LEDGER.member_data(ctx.author)
         unlocked_ids = set(data.get("achievements", []))
         titles = [a["title"] for a in ACHIEVEMENTS if a.get("title") and a["id"] in unlocked_ids]
         if selection < 1 or selection > len(titles):
@@ -411,7 +415,7 @@ class Casino(commands.Cog):
     async def profile_card(self, ctx: commands.Context, member: discord.Member = None):
         """Generate a casino profile card using the member's Discord avatar."""
         member = member or ctx.author
-        data = await CONFIG.member(member).all()
+        data = await LEDGER.member_data(member)
         try:
             from PIL import Image, ImageDraw, ImageFont, ImageOps
             avatar_bytes = await member.display_avatar.with_size(256).read()
@@ -479,7 +483,7 @@ class Casino(commands.Cog):
     @checks.admin_or_permissions(manage_guild=True)
     @commands.guild_only()
     async def analytics(self, ctx: commands.Context):
-        data = await CONFIG.guild(ctx.guild).all()
+        data = await LEDGER.guild_data(ctx.guild)
         house_profit = data["total_wagered"] - data["total_paid"]
         edge = house_profit / data["total_wagered"] * 100 if data["total_wagered"] else 0
         winner = ctx.guild.get_member(data["biggest_payout_user"])
@@ -508,46 +512,54 @@ class Casino(commands.Cog):
                 f"Run `{ctx.clean_prefix}casino resetprogress CONFIRM` to continue."
             )
 
-        all_members = await CONFIG.all_members(ctx.guild)
-        reset_count = 0
-        for user_id in all_members:
-            member_conf = CONFIG.member_from_ids(ctx.guild.id, int(user_id))
-            async with member_conf.all() as data:
-                data.update({
-                    "total_wagered": 0,
-                    "total_paid": 0,
-                    "total_games": 0,
-                    "wins": 0,
-                    "losses": 0,
-                    "pushes": 0,
-                    "biggest_bet": 0,
-                    "biggest_payout": 0,
-                    "games": {},
-                    "achievements": [],
-                    "equipped_title": "",
-                    "current_win_streak": 0,
-                    "longest_win_streak": 0,
-                    "best_highlow_streak": 0,
-                    "daily_completed": 0,
-                    "weekly_completed": 0,
-                    "daily_state": {},
-                    "weekly_state": {},
-                })
-            reset_count += 1
-
-        guild_conf = CONFIG.guild(ctx.guild)
-        async with guild_conf.all() as data:
+        # Stats are reset through the settlement ledger, so a game settling while
+        # this runs updates the same documents instead of writing old totals back.
+        guild_id = ctx.guild.id
+        member_ids = {int(uid) for uid in await CONFIG.all_members(ctx.guild)}
+        member_ids.update(LEDGER.cached_members(guild_id))
+        for member_id in member_ids:
+            data = await LEDGER.member(guild_id, member_id)
             data.update({
                 "total_wagered": 0,
                 "total_paid": 0,
                 "total_games": 0,
-                "total_wins": 0,
-                "total_losses": 0,
-                "total_pushes": 0,
+                "wins": 0,
+                "losses": 0,
+                "pushes": 0,
+                "biggest_bet": 0,
                 "biggest_payout": 0,
-                "biggest_payout_user": 0,
-                "biggest_payout_game": "",
+                "games": {},
+                "achievements": [],
+                "current_win_streak": 0,
+                "longest_win_streak": 0,
+                "best_highlow_streak": 0,
+                "daily_completed": 0,
+                "weekly_completed": 0,
+                "daily_state": {},
+                "weekly_state": {},
             })
+            LEDGER.mark("member", guild_id, member_id, MEMBER_STAT_KEYS)
+            await CONFIG.member_from_ids(guild_id, member_id).equipped_title.set("")
+        reset_count = len(member_ids)
+
+        data = await LEDGER.guild(guild_id)
+        data.update({
+            "total_wagered": 0,
+            "total_paid": 0,
+            "total_games": 0,
+            "total_wins": 0,
+            "total_losses": 0,
+            "total_pushes": 0,
+            "biggest_payout": 0,
+            "biggest_payout_user": 0,
+            "biggest_payout_game": "",
+        })
+        LEDGER.mark("guild", guild_id, 0, (
+            "total_wagered", "total_paid", "total_games", "total_wins", "total_losses", "total_pushes",
+            "biggest_payout", "biggest_payout_user", "biggest_payout_game",
+        ))
+        # Dropped only now: a board built mid-reset would cache half-reset rankings.
+        BOARDS.discard(guild_id)
 
         await ctx.send(
             f"✅ Casino progression has been reset for **{reset_count:,}** tracked members. "
@@ -3,12 +3,16 @@ from __future__ import annotations
 import logging
 import time
 from dataclasses import dataclass
+from pathlib import Path
 from typing import Dict, Optional, Tuple
 
 import discord
 from redbot.core import Config, bank
 from redbot.core.errors import BalanceTooHigh
 
+from .boards import CasinoBoards
+from .ledger import SettlementLedger
+
 CASINO_CONFIG_ID = 2468135790
 ACTIVE_GAMES = ("blackjack", "coinflip", "slots", "roulette", "highlow")
 DEFAULT_GAME_SETTINGS = {
@@ -69,6 +73,45 @@ CONFIG.register_member(
     bailout_claimed_at=0.0,
     scratch_claimed_at=0.0,
 )
+# Cross-guild lifetime stats, one document per user. This is the single store
+# behind slotstats / bjstats / cfstats / roulettestats and external readers
+# such as CrewStats; legacy_migrated marks that the user's old per-game
+# counters (see stats.LEGACY_SOURCES) have been folded in.
+CONFIG.register_user(
+    total_wagered=0,
+    total_paid=0,
+    total_games=0,
+    wins=0,
+    losses=0,
+    pushes=0,
+    games={},
+    legacy_migrated=False,
+)
+CONFIG.register_global(legacy_migrated=False)
+
+# Config keys that settlements change. These go through the ledger's write-behind
+# cache; read them with LEDGER.member_data / guild_data / all_members.
+MEMBER_STAT_KEYS = (
+    "total_wagered", "total_paid", "total_games", "wins", "losses", "pushes",
+    "biggest_bet", "biggest_payout", "games", "achievements",
+    "current_win_streak", "longest_win_streak", "best_highlow_streak",
+    "daily_completed", "weekly_completed", "daily_state", "weekly_state",
+)
+USER_STAT_KEYS = (
+    "total_wagered", "total_paid", "total_games", "wins", "losses", "pushes", "games", "legacy_migrated",
+)
+GUILD_STAT_KEYS = (
+    "total_wagered", "total_paid", "total_games", "total_wins", "total_losses", "total_pushes",
+    "biggest_payout", "biggest_payout_user", "biggest_payout_game", "progression",
+)
+LEDGER = SettlementLedger(
+    CONFIG,
+    MEMBER_STAT_KEYS,
+    GUILD_STAT_KEYS,
+    USER_STAT_KEYS,
+    Path(__file__).parent / "data" / "settlements.jsonl",
+)
+BOARDS = CasinoBoards(LEDGER)
 
 LOG = logging.getLogger("red.crewcogs.casino")
 _LAST_PLAY: Dict[Tuple[int, int, str], float] = {}
@@ -163,6 +206,29 @@ async def refund_wager(member: discord.Member, game: str, wager: int, *, reason:
     return deposited
 
 
+def new_game_stats() -> dict:
+    return {
+        "wagered": 0,
+        "paid": 0,
+        "games": 0,
+        "wins": 0,
+        "losses": 0,
+        "pushes": 0,
+        "biggest_bet": 0,
+        "biggest_payout": 0,
+    }
+
+
+def _add_game_result(games: dict, game: str, wager: int, payout: int, outcome_key: str) -> None:
+    game_data = games.setdefault(game, new_game_stats())
+    game_data["wagered"] += wager
+    game_data["paid"] += payout
+    game_data["games"] += 1
+    game_data[outcome_key] += 1
+    game_data["biggest_bet"] = max(game_data["biggest_bet"], wager)
+    game_data["biggest_payout"] = max(game_data["biggest_payout"], payout)
+
+
 async def record_game(
     member: discord.Member,
     game: str,
@@ -172,7 +238,10 @@ async def record_game(
     *,
     include_economy: bool = True,
 ) -> None:
-    """Record one completed result in member, per-game, and guild totals."""
+    """Record one completed result in member, per-game, guild, and user totals.
+
+    Changes land in the settlement ledger; Config is updated by its flush loop.
+    """
     if member.guild is None:
         return
 
@@ -184,50 +253,49 @@ async def record_game(
     if wager < 0 or payout < 0:
         raise ValueError("wager and payout cannot be negative")
 
-    member_conf = CONFIG.member(member)
-    guild_conf = CONFIG.guild(member.guild)
-
-    async with member_conf.all() as data:
-        if include_economy:
-            data["total_wagered"] += wager
-            data["total_paid"] += payout
-            data["biggest_bet"] = max(data["biggest_bet"], wager)
-            data["biggest_payout"] = max(data["biggest_payout"], payout)
-        data["total_games"] += 1
-        data[outcome_key] += 1
-
-        game_data = data["games"].setdefault(
-            game,
-            {
-                "wagered": 0,
-                "paid": 0,
-                "games": 0,
-                "wins": 0,
-                "losses": 0,
-                "pushes": 0,
-                "biggest_bet": 0,
-                "biggest_payout": 0,
-            },
-        )
-        # Per-game fields remain useful for Daily Spin boards even when its
-        # free reward is excluded from overall casino economics.
-        game_data["wagered"] += wager
-        game_data["paid"] += payout
-        game_data["games"] += 1
-        game_data[outcome_key] += 1
-        game_data["biggest_bet"] = max(game_data["biggest_bet"], wager)
-        game_data["biggest_payout"] = max(game_data["biggest_payout"], payout)
-
-    async with guild_conf.all() as data:
-        if include_economy:
-            data["total_wagered"] += wager
-            data["total_paid"] += payout
-        data["total_games"] += 1
-        data[f"total_{outcome_key}"] += 1
-        if include_economy and payout > data["biggest_payout"]:
-            data["biggest_payout"] = payout
-            data["biggest_payout_user"] = member.id
-            data["biggest_payout_game"] = game
+    guild_id = member.guild.id
+    data = await LEDGER.member(guild_id, member.id)
+    guild_data = await LEDGER.guild(guild_id)
+
+    if include_economy:
+        data["total_wagered"] += wager
+        data["total_paid"] += payout
+        data["biggest_bet"] = max(data["biggest_bet"], wager)
+        data["biggest_payout"] = max(data["biggest_payout"], payout)
+    data["total_games"] += 1
+    data[outcome_key] += 1
+
+    # Per-game fields remain useful for Daily Spin boards even when its
+    # free reward is excluded from overall casino economics.
+    _add_game_result(data["games"], game, wager, payout, outcome_key)
+
+    LEDGER.mark("member", guild_id, member.id, (
+        "total_wagered", "total_paid", "biggest_bet", "biggest_payout", "total_games", outcome_key, "games",
+    ))
+    BOARDS.update(guild_id, member.id, data, game)
+
+    if include_economy:
+        guild_data["total_wagered"] += wager
+        guild_data["total_paid"] += payout
+    guild_data["total_games"] += 1
+    guild_data[f"total_{outcome_key}"] += 1
+    if include_economy and payout > guild_data["biggest_payout"]:
+        guild_data["biggest_payout"] = payout
+        guild_data["biggest_payout_user"] = member.id
+        guild_data["biggest_payout_game"] = game
+    LEDGER.mark("guild", guild_id, 0, (
+        "total_wagered", "total_paid", "total_games", f"total_{outcome_key}",
+        "biggest_payout", "biggest_payout_user", "biggest_payout_game",
+    ))
+
+    user_data = await LEDGER.user(member.id)
+    if include_economy:
+        user_data["total_wagered"] += wager
+        user_data["total_paid"] += payout
+    user_data["total_games"] += 1
+    user_data[outcome_key] += 1
+    _add_game_result(user_data["games"], game, wager, payout, outcome_key)
+    LEDGER.mark("user", 0, member.id, ("total_wagered", "total_paid", "total_games", outcome_key, "games"))
 
 
 async def settle_game(
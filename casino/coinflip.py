@@ -3,9 +3,10 @@ import os
 import random
 
 from discord import Embed, File
-from redbot.core import Config, bank, commands
+from redbot.core import bank, commands
 
 from .casino_core import mark_played, refund_wager, settle_game, validate_bet
+from .stats import game_stats
 
 
 class CoinFlip(commands.Cog):
@@ -13,8 +14,6 @@ class CoinFlip(commands.Cog):
 
     def __init__(self, bot):
         self.bot = bot
-        self.CONFIG = Config.get_conf(None, identifier=9876543210)
-        self.CONFIG.register_user(total_cf_wins=0, total_cf_losses=0, total_cf_bet=0)
 
     @commands.command()
     @commands.max_concurrency(1, per=commands.BucketType.user, wait=False)
@@ -44,13 +43,6 @@ class CoinFlip(commands.Cog):
             )
             settled = True
 
-            cfg = self.CONFIG.user(ctx.author)
-            await cfg.total_cf_bet.set(await cfg.total_cf_bet() + bet)
-            if won:
-                await cfg.total_cf_wins.set(await cfg.total_cf_wins() + 1)
-            else:
-                await cfg.total_cf_losses.set(await cfg.total_cf_losses() + 1)
-
             image_path = os.path.join(os.path.dirname(__file__), "cards", f"{result}.png")
             file = File(image_path, filename="coin.png")
             embed = Embed(title="🪙 Ruthless Dealer • Coin Flip", description=f"You bet **{bet:,}** on **{side.title()}**.")
@@ -74,16 +66,16 @@ class CoinFlip(commands.Cog):
                 "Coin Flip failed for user %s", ctx.author.id
             )
             await ctx.send(
-                "Ruthless Dealer’s Coin Flip settled, but the result message or legacy stats failed."
+                "Ruthless Dealer’s Coin Flip settled, but the result message failed."
                 if settled
                 else "Ruthless Dealer’s Coin Flip hit an unexpected error. The unsettled wager was refunded."
             )
 
     @commands.command()
     async def cfstats(self, ctx):
-        """Show your legacy coinflip stats."""
-        data = await self.CONFIG.user(ctx.author).all()
-        await ctx.send(f"Ruthless Dealer Coin Flip — Wins: {data['total_cf_wins']}, Losses: {data['total_cf_losses']}, Bet total: {data['total_cf_bet']:,}")
+        """Show your coinflip stats."""
+        data = await game_stats(ctx.author.id, "coinflip")
+        await ctx.send(f"Ruthless Dealer Coin Flip — Wins: {data['wins']}, Losses: {data['losses']}, Bet total: {data['wagered']:,}")
 
 
 async def setup(bot):
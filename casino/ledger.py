@@ -0,0 +1,280 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import os
+import time
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+LOG = logging.getLogger("red.crewcogs.casino.ledger")
+
+FLUSH_INTERVAL = 15      # seconds between coalesced Config writes
+IDLE_EVICT = 1800        # clean cached documents unused this long are dropped
+
+DocKey = Tuple[str, int, int]   # ("member", guild_id, member_id), ("guild", guild_id, 0) or ("user", 0, user_id)
+
+
+class SettlementLedger:
+    """Write-behind cache for the casino stats that settlements change.
+
+    Settlement code mutates the cached member / guild documents in memory and
+    calls ``mark`` with the keys it touched. Each ``mark`` queues the new
+    values of those keys for an append-only journal, which a writer task
+    appends and fsyncs in an executor, off the event loop. Replaying the
+    journal on load just sets the same keys again, so a crash or power loss
+    between flushes only loses lines still queued for the writer (normally
+    the last event-loop tick's worth). The flush loop writes every dirty document back to Config in one
+    ``all()`` cycle per document, updating only the ledger-owned keys, and then
+    compacts the journal down to whatever is still unflushed.
+
+    Only the keys listed in ``member_keys`` / ``guild_keys`` / ``user_keys`` are cached; other
+    Config values (cooldown timestamps, equipped titles, game settings) are
+    untouched and still read and written directly.
+    """
+
+    def __init__(
+        self,
+        config,
+        member_keys: Iterable[str],
+        guild_keys: Iterable[str],
+        user_keys: Iterable[str],
+        path: Path,
+    ) -> None:
+        self.config = config
+        self.owned = {"member": tuple(member_keys), "guild": tuple(guild_keys), "user": tuple(user_keys)}
+        self.path = path
+        self._docs: Dict[DocKey, dict] = {}
+        self._seen: Dict[DocKey, float] = {}
+        self._dirty: Dict[DocKey, Set[str]] = {}
+        self._journal = None             # append handle; only touched inside executor jobs
+        self._queued: List[str] = []
+        self._writer: Optional[asyncio.Task] = None
+        self._io_lock = asyncio.Lock()   # orders appends against compaction
+        self._task: Optional[asyncio.Task] = None
+        self._flush_lock = asyncio.Lock()
+
+    # -- documents ---------------------------------------------------------
+
+    def _group(self, key: DocKey):
+        kind, guild_id, member_id = key
+        if kind == "member":
+            return self.config.member_from_ids(guild_id, member_id)
+        if kind == "user":
+            return self.config.user_from_id(member_id)
+        return self.config.guild_from_id(guild_id)
+
+    async def _load(self, key: DocKey) -> dict:
+        doc = self._docs.get(key)
+        if doc is None:
+            stored = await self._group(key).all()
+            # Another settlement may have loaded it while we awaited
+            doc = self._docs.get(key)
+            if doc is None:
+                doc = self._docs[key] = {k: stored[k] for k in self.owned[key[0]]}
+        self._seen[key] = time.monotonic()
+        return doc
+
+    async def member(self, guild_id: int, member_id: int) -> dict:
+        """Live, mutable stats document for a member. Call ``mark`` after changing it."""
+        return await self._load(("member", guild_id, member_id))
+
+    async def guild(self, guild_id: int) -> dict:
+        """Live, mutable stats document for a guild. Call ``mark`` after changing it."""
+        return await self._load(("guild", guild_id, 0))
+
+    async def user(self, user_id: int) -> dict:
+        """Live, mutable cross-guild stats document for a user. Call ``mark`` after changing it."""
+        return await self._load(("user", 0, user_id))
+
+    def mark(self, kind: str, guild_id: int, member_id: int, keys: Iterable[str]) -> None:
+        """Record that `keys` of a cached document changed and journal their new values.
+
+        User documents are keyed ``("user", 0, user_id)``; pass 0 as `guild_id`.
+        """
+        key: DocKey = (kind, guild_id, 0 if kind == "guild" else member_id)
+        doc = self._docs[key]
+        keys = set(keys)
+        self._dirty.setdefault(key, set()).update(keys)
+        # Serialised here, on the loop, so the writer never sees a document mid-change
+        self._queued.append(json.dumps(
+            {"k": kind, "g": guild_id, "m": key[2], "v": {k: doc[k] for k in keys}}, separators=(",", ":")
+        ) + "\n")
+        if self._writer is None or self._writer.done():
+            self._writer = asyncio.create_task(self._drain())
+
+    # -- reads that include unflushed changes --------------------------------
+
+    async def member_data(self, member) -> dict:
+        """Full member Config document with the ledger's pending values applied."""
+        data = await self.config.member(member).all()
+        doc = self._docs.get(("member", member.guild.id, member.id))
+        if doc is not None:
+            data.update(json.loads(json.dumps(doc)))
+        return data
+
+    async def guild_data(self, guild) -> dict:
+        """Full guild Config document with the ledger's pending values applied."""
+        data = await self.config.guild(guild).all()
+        doc = self._docs.get(("guild", guild.id, 0))
+        if doc is not None:
+            data.update(json.loads(json.dumps(doc)))
+        return data
+
+    async def user_data(self, user_id: int) -> dict:
+        """Full user Config document with the ledger's pending values applied."""
+        data = await self.config.user_from_id(user_id).all()
+        doc = self._docs.get(("user", 0, user_id))
+        if doc is not None:
+            data.update(json.loads(json.dumps(doc)))
+        return data
+
+    async def all_users(self) -> Dict[int, dict]:
+        """``Config.all_users()`` with pending values applied."""
+        stored = {int(uid): data for uid, data in (await self.config.all_users()).items()}
+        for (kind, _, user_id), doc in list(self._docs.items()):
+            if kind != "user":
+                continue
+            if user_id not in stored:
+                stored[user_id] = await self.config.user_from_id(user_id).all()
+            stored[user_id].update(json.loads(json.dumps(doc)))
+        return stored
+
+    async def all_members(self, guild) -> Dict[int, dict]:
+        """``Config.all_members(guild)`` with pending values applied."""
+        stored = {int(mid): data for mid, data in (await self.config.all_members(guild)).items()}
+        for (kind, guild_id, member_id), doc in list(self._docs.items()):
+            if kind != "member" or guild_id != guild.id:
+                continue
+            if member_id not in stored:
+                stored[member_id] = await self.config.member_from_ids(guild_id, member_id).all()
+            stored[member_id].update(json.loads(json.dumps(doc)))
+        return stored
+
+    def cached_members(self, guild_id: int) -> Dict[int, dict]:
+        """Live cached member documents for a guild (ledger-owned keys only; don't mutate)."""
+        return {
+            member_id: doc for (kind, gid, member_id), doc in self._docs.items()
+            if kind == "member" and gid == guild_id
+        }
+
+    # -- journal -------------------------------------------------------------
+
+    async def _drain(self) -> None:
+        async with self._io_lock:
+            loop = asyncio.get_running_loop()
+            while self._queued:
+                lines, self._queued = self._queued, []
+                try:
+                    await loop.run_in_executor(None, self._write_lines, lines)
+                except OSError:
+                    LOG.exception("Casino ledger could not append to %s", self.path)
+
+    def _write_lines(self, lines: List[str]) -> None:
+        if self._journal is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._journal = open(self.path, "a", encoding="utf-8")
+        self._journal.write("".join(lines))
+        self._journal.flush()
+        os.fsync(self._journal.fileno())
+
+    async def _rewrite_journal(self) -> None:
+        """Replace the journal with one entry per still-dirty document."""
+        async with self._io_lock:
+            # Every queued line belongs to a key that is still dirty, so the
+            # snapshot taken here supersedes them.
+            self._queued = []
+            text = "".join(
+                json.dumps({"k": kind, "g": gid, "m": mid, "v": {k: self._docs[(kind, gid, mid)][k] for k in keys}},
+                           separators=(",", ":")) + "\n"
+                for (kind, gid, mid), keys in self._dirty.items()
+            )
+            try:
+                await asyncio.get_running_loop().run_in_executor(None, self._replace_journal, text)
+            except OSError:
+                LOG.exception("Casino ledger could not compact %s", self.path)
+
+    def _replace_journal(self, text: str) -> None:
+        self._close_journal()
+        tmp = self.path.with_suffix(".tmp")
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with open(tmp, "w", encoding="utf-8") as fh:
+            fh.write(text)
+            fh.flush()
+            os.fsync(fh.fileno())
+        os.replace(tmp, self.path)
+
+    def _close_journal(self) -> None:
+        if self._journal is not None:
+            self._journal.close()
+            self._journal = None
+
+    async def replay(self) -> int:
+        """Re-apply journal entries left by a previous run. Returns the entry count."""
+        if not self.path.exists():
+            return 0
+        count = 0
+        with open(self.path, encoding="utf-8") as fh:
+            lines = fh.readlines()
+        for line in lines:
+            try:
+                entry = json.loads(line)
+            except ValueError:
+                continue   # a torn final line from a crash mid-write
+            key: DocKey = (entry["k"], int(entry["g"]), int(entry["m"]))
+            doc = await self._load(key)
+            doc.update(entry["v"])
+            self._dirty.setdefault(key, set()).update(entry["v"])
+            count += 1
+        return count
+
+    # -- flushing ------------------------------------------------------------
+
+    async def flush(self) -> None:
+        """Write every dirty document's changed keys to Config, then compact the journal."""
+        async with self._flush_lock:
+            pending, self._dirty = self._dirty, {}
+            for key, keys in pending.items():
+                doc = self._docs.get(key)
+                if doc is None:
+                    continue
+                values = json.loads(json.dumps({k: doc[k] for k in keys}))
+                try:
+                    async with self._group(key).all() as data:
+                        data.update(values)
+                except Exception:
+                    LOG.exception("Casino ledger flush failed for %s; will retry", key)
+                    self._dirty.setdefault(key, set()).update(keys)
+            now = time.monotonic()
+            for key, seen in list(self._seen.items()):
+                if key not in self._dirty and now - seen > IDLE_EVICT:
+                    self._docs.pop(key, None)
+                    self._seen.pop(key, None)
+            await self._rewrite_journal()
+
+    async def _flush_loop(self) -> None:
+        while True:
+            await asyncio.sleep(FLUSH_INTERVAL)
+            try:
+                await self.flush()
+            except Exception:
+                LOG.exception("Casino ledger flush loop error")
+
+    async def start(self) -> None:
+        """Replay any journal from the last run and start the flush loop."""
+        if self._task is not None:
+            return
+        replayed = await self.replay()
+        if replayed:
+            LOG.info("Casino ledger replayed %s journal entries", replayed)
+            await self.flush()
+        self._task = asyncio.create_task(self._flush_loop())
+
+    async def close(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+        await self.flush()
+        async with self._io_lock:
+            self._close_journal()
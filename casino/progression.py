@@ -7,7 +7,7 @@ from typing import Any, Dict, Iterable, List, Optional, Tuple
 import discord
 from redbot.core import bank
 
-from .casino_core import CONFIG, safe_deposit
+from .casino_core import LEDGER, safe_deposit
 
 # Five early/mid-game title achievements award credits. Five prestige titles are
 # cosmetic bragging rights. The other ten achievements award permanent badges.
@@ -93,20 +93,24 @@ def _choose(pool: Iterable[dict], previous: Iterable[str]) -> List[str]:
 
 
 async def ensure_rotations(guild: discord.Guild) -> Tuple[List[str], List[str]]:
-    conf = CONFIG.guild(guild)
-    async with conf.progression() as state:
-        dk, wk = daily_key(), weekly_key()
-        if state.get("daily_key") != dk:
-            previous = state.get("daily_ids", [])
-            state["previous_daily_ids"] = previous
-            state["daily_ids"] = _choose(DAILY_POOL, previous)
-            state["daily_key"] = dk
-        if state.get("weekly_key") != wk:
-            previous = state.get("weekly_ids", [])
-            state["previous_weekly_ids"] = previous
-            state["weekly_ids"] = _choose(WEEKLY_POOL, previous)
-            state["weekly_key"] = wk
-        return list(state["daily_ids"]), list(state["weekly_ids"])
+    state = (await LEDGER.guild(guild.id))["progression"]
+    dk, wk = daily_key(), weekly_key()
+    rotated = False
+    if state.get("daily_key") != dk:
+        previous = state.get("daily_ids", [])
+        state["previous_daily_ids"] = previous
+        state["daily_ids"] = _choose(DAILY_POOL, previous)
+        state["daily_key"] = dk
+        rotated = True
+    if state.get("weekly_key") != wk:
+        previous = state.get("weekly_ids", [])
+        state["previous_weekly_ids"] = previous
+        state["weekly_ids"] = _choose(WEEKLY_POOL, previous)
+        state["weekly_key"] = wk
+        rotated = True
+    if rotated:
+        LEDGER.mark("guild", guild.id, 0, ("progression",))
+    return list(state["daily_ids"]), list(state["weekly_ids"])
 
 
 def stat_value(data: dict, stat: str) -> int:
@@ -141,57 +145,60 @@ async def process_progress(member: discord.Member, game: str, wager: int, paid:
     metadata = metadata or {}
     daily_ids, weekly_ids = await ensure_rotations(member.guild)
     daily_defs = {x["id"]:x for x in DAILY_POOL}; weekly_defs = {x["id"]:x for x in WEEKLY_POOL}
-    member_conf = CONFIG.member(member)
     notices: List[str] = []
     reward_total = 0
-    async with member_conf.all() as data:
-        # Streak and game-specific durable stats.
-        if outcome == "win":
-            data["current_win_streak"] = data.get("current_win_streak", 0) + 1
-            data["longest_win_streak"] = max(data.get("longest_win_streak", 0), data["current_win_streak"])
-        else:
-            data["current_win_streak"] = 0
-        hs = int(metadata.get("highlow_streak", 0))
-        data["best_highlow_streak"] = max(data.get("best_highlow_streak", 0), hs)
-
-        periods = (("daily", daily_key(), daily_ids, daily_defs), ("weekly", weekly_key(), weekly_ids, weekly_defs))
-        for kind, key, ids, defs in periods:
-            state = data.setdefault(f"{kind}_state", {})
-            if state.get("key") != key:
-                state.clear(); state.update({"key":key,"progress":{},"claimed":[]})
-            for cid in ids:
-                definition = defs[cid]
-                metric = definition["metric"]
-                if metric == "all_games_played":
-                    counts = state.setdefault("game_counts", {}).setdefault(cid, {})
-                    if game in {"blackjack", "coinflip", "slots", "roulette", "highlow"}:
-                        counts[game] = int(counts.get(game, 0)) + 1
-                    new = min((int(counts.get(g, 0)) for g in ("blackjack", "coinflip", "slots", "roulette", "highlow")), default=0)
-                else:
-                    old = int(state["progress"].get(cid, 0))
-                    inc = _metric_increment(metric, game, wager, paid, outcome, metadata)
-                    # streak challenges use max, not sum
-                    new = max(old, inc) if metric == "highlow_streak" else old + inc
-                state["progress"][cid] = new
-                if new >= definition["goal"] and cid not in state["claimed"]:
-                    state["claimed"].append(cid)
-                    reward_total += definition["reward"]
-                    data[f"{kind}_completed"] = data.get(f"{kind}_completed", 0) + 1
-                    notices.append(f"✅ **{kind.title()} challenge complete:** {definition['name']} (+{definition['reward']:,})")
-
-        unlocked = set(data.get("achievements", []))
-        # Two passes allow Casino Legend to unlock on the same settlement.
-        for _ in range(2):
-            for achievement in ACHIEVEMENTS:
-                aid = achievement["id"]
-                if aid in unlocked: continue
-                if stat_value(data, achievement["stat"]) >= achievement["goal"]:
-                    unlocked.add(aid); data["achievements"] = list(unlocked)
-                    reward_total += achievement["reward"]
-                    title = f" Title unlocked: **{achievement['title']}**" if achievement.get("title") else ""
-                    reward = f" (+{achievement['reward']:,})" if achievement["reward"] else ""
-                    notices.append(f"🏆 **Achievement unlocked:** {achievement['emoji']} {achievement['name']}{reward}.{title}")
-        data["achievements"] = sorted(unlocked)
+    data = await LEDGER.member(member.guild.id, member.id)
+    # Streak and game-specific durable stats.
+    if outcome == "win":
+        data["current_win_streak"] = data.get("current_win_streak", 0) + 1
+        data["longest_win_streak"] = max(data.get("longest_win_streak", 0), data["current_win_streak"])
+    else:
+        data["current_win_streak"] = 0
+    hs = int(metadata.get("highlow_streak", 0))
+    data["best_highlow_streak"] = max(data.get("best_highlow_streak", 0), hs)
+
+    periods = (("daily", daily_key(), daily_ids, daily_defs), ("weekly", weekly_key(), weekly_ids, weekly_defs))
+    for kind, key, ids, defs in periods:
+        state = data.setdefault(f"{kind}_state", {})
+        if state.get("key") != key:
+            state.clear(); state.update({"key":key,"progress":{},"claimed":[]})
+        for cid in ids:
+            definition = defs[cid]
+            metric = definition["metric"]
+            if metric == "all_games_played":
+                counts = state.setdefault("game_counts", {}).setdefault(cid, {})
+                if game in {"blackjack", "coinflip", "slots", "roulette", "highlow"}:
+                    counts[game] = int(counts.get(game, 0)) + 1
+                new = min((int(counts.get(g, 0)) for g in ("blackjack", "coinflip", "slots", "roulette", "highlow")), default=0)
+            else:
+                old = int(state["progress"].get(cid, 0))
+                inc = _metric_increment(metric, game, wager, paid, outcome, metadata)
+                # streak challenges use max, not sum
+                new = max(old, inc) if metric == "highlow_streak" else old + inc
+            state["progress"][cid] = new
+            if new >= definition["goal"] and cid not in state["claimed"]:
+                state["claimed"].append(cid)
+                reward_total += definition["reward"]
+                data[f"{kind}_completed"] = data.get(f"{kind}_completed", 0) + 1
+                notices.append(f"✅ **{kind.title()} challenge complete:** {definition['name']} (+{definition['reward']:,})")
+
+    unlocked = set(data.get("achievements", []))
+    # Two passes allow Casino Legend to unlock on the same settlement.
+    for _ in range(2):
+        for achievement in ACHIEVEMENTS:
+            aid = achievement["id"]
+            if aid in unlocked: continue
+            if stat_value(data, achievement["stat"]) >= achievement["goal"]:
+                unlocked.add(aid); data["achievements"] = list(unlocked)
+                reward_total += achievement["reward"]
+                title = f" Title unlocked: **{achievement['title']}**" if achievement.get("title") else ""
+                reward = f" (+{achievement['reward']:,})" if achievement["reward"] else ""
+                notices.append(f"🏆 **Achievement unlocked:** {achievement['emoji']} {achievement['name']}{reward}.{title}")
+    data["achievements"] = sorted(unlocked)
+    LEDGER.mark("member", member.guild.id, member.id, (
+        "current_win_streak", "longest_win_streak", "best_highlow_streak",
+        "daily_state", "weekly_state", "daily_completed", "weekly_completed", "achievements",
+    ))
 
     deposited = await safe_deposit(member, reward_total)
     if notices and channel is not None:
@@ -2,18 +2,27 @@ import asyncio
 import logging
 import math
 import random
-import tempfile
+import shutil
+import threading
+from functools import lru_cache
+from io import BytesIO
 from pathlib import Path
-from typing import Optional
+from typing import Dict, Optional, Tuple
 
 import discord
 from PIL import Image, ImageDraw, ImageFont
-from redbot.core import Config, bank, commands
+from redbot.core import bank, commands
 
 from .casino_core import mark_played, refund_wager, settle_game, validate_bet
+from .stats import game_stats
 
-ROULETTE_CONFIG_ID = 8642097531
 WHEEL_ORDER = ["0", "28", "9", "26", "30", "11", "7", "20", "32", "17", "5", "22", "34", "15", "3", "24", "36", "13", "1", "00", "27", "10", "25", "29", "12", "8", "19", "31", "18", "6", "21", "33", "16", "4", "23", "35", "14", "2"]
+# Bump when the wheel artwork changes; older cache directories are removed.
+RENDER_VERSION = 1
+ASSET_ROOT = Path(__file__).parent / "data" / "roulette"
+ASSET_DIR = ASSET_ROOT / f"v{RENDER_VERSION}"
+# Renders share cached FreeType fonts, which aren't safe to use from two threads at once.
+_RENDER_LOCK = threading.Lock()
 RED_NUMBERS = {1,3,5,7,9,12,14,16,18,19,21,23,25,27,30,32,34,36}
 BET_ALIASES = {
     "red":"red", "black":"black", "odd":"odd", "even":"even", "low":"low", "1-18":"low",
@@ -67,14 +76,124 @@ def is_winner(bet_type: str, pocket: str) -> bool:
     }[bet_type]
 
 
+@lru_cache(maxsize=None)
+def _font(size: int):
+    try:
+        return ImageFont.truetype("DejaVuSans-Bold.ttf", size)
+    except OSError:
+        return ImageFont.load_default()
+
+
+def draw_wheel(offset: float) -> Image.Image:
+    size, center, outer_radius, inner_radius = 520, 260, 240, 112
+    image = Image.new("RGBA", (size, size), (20, 24, 29, 255))
+    draw = ImageDraw.Draw(image)
+    segment_angle = 360 / len(WHEEL_ORDER)
+    font, center_font = _font(16), _font(23)
+    for index, pocket in enumerate(WHEEL_ORDER):
+        start = -90 + (index - offset) * segment_angle
+        end = start + segment_angle
+        fill = {"red":(176,32,37,255), "black":(30,33,38,255), "green":(25,130,78,255)}[pocket_color(pocket)]
+        draw.pieslice((center-outer_radius, center-outer_radius, center+outer_radius, center+outer_radius), start=start, end=end, fill=fill, outline=(220,220,220,255), width=1)
+        angle = math.radians((start + end) / 2)
+        x, y = center + math.cos(angle)*196, center + math.sin(angle)*196
+        box = draw.textbbox((0,0), pocket, font=font)
+        draw.text((x-(box[2]-box[0])/2, y-(box[3]-box[1])/2), pocket, fill="white", font=font)
+    draw.ellipse((center-inner_radius, center-inner_radius, center+inner_radius, center+inner_radius), fill=(195,151,55,255), outline=(245,220,145,255), width=4)
+    draw.ellipse((center-82, center-82, center+82, center+82), fill=(49,55,62,255))
+    label = "KREW\nROULETTE"
+    box = draw.multiline_textbbox((0,0), label, font=center_font, align="center")
+    draw.multiline_text((center-(box[2]-box[0])/2, center-(box[3]-box[1])/2), label, font=center_font, fill="white", align="center")
+    draw.polygon([(center,10),(center-18,48),(center+18,48)], fill=(245,205,68,255), outline="white")
+    draw.ellipse((center-8,35,center+8,51), fill=(245,245,245,255))
+    return image
+
+
+def asset_path(kind: str, winning_index: int) -> Path:
+    return ASSET_DIR / (f"spin_{winning_index}.gif" if kind == "spin" else f"result_{winning_index}.png")
+
+
+def load_asset(kind: str, winning_index: int) -> bytes:
+    """Spin GIF or result PNG for a pocket, rendered and cached on first use.
+
+    Blocking; run it in an executor. There are only two images per pocket,
+    so after the first spin on each one the bytes come straight off disk.
+    """
+    path = asset_path(kind, winning_index)
+    if path.exists():
+        return path.read_bytes()
+
+    output = BytesIO()
+    with _RENDER_LOCK:
+        if kind == "spin":
+            frames = []
+            for frame_number in range(18):
+                progress = frame_number / 17
+                eased = 1 - (1 - progress) ** 3
+                offset = winning_index + 3.5 * (1 - eased) * len(WHEEL_ORDER)
+                frames.append(draw_wheel(offset))
+            frames[0].save(output, format="GIF", save_all=True, append_images=frames[1:], duration=130, loop=0, disposal=2)
+            for frame in frames:
+                frame.close()
+        else:
+            with draw_wheel(winning_index) as image:
+                image.save(output, format="PNG")
+
+    data = output.getvalue()
+    path.parent.mkdir(parents=True, exist_ok=True)
+    temp = path.with_name(f"{path.name}.{threading.get_ident()}.tmp")
+    temp.write_bytes(data)
+    temp.replace(path)
+    return data
+
+
+def _remove_stale_assets() -> None:
+    if not ASSET_ROOT.exists():
+        return
+    for child in ASSET_ROOT.iterdir():
+        if child.is_dir() and child != ASSET_DIR:
+            shutil.rmtree(child, ignore_errors=True)
+
+
 class Roulette(commands.Cog):
     """American roulette using Red's shared economy."""
 
     def __init__(self, bot):
         self.bot = bot
-        self.config = Config.get_conf(self, identifier=ROULETTE_CONFIG_ID, force_registration=True)
-        self.config.register_user(total_roulette_wins=0, total_roulette_losses=0, total_roulette_bet=0, biggest_roulette_win=0)
         self.active_players = set()
+        self._renders: Dict[Tuple[str, int], asyncio.Future] = {}
+        self._warm_task: Optional[asyncio.Task] = None
+
+    async def cog_load(self):
+        self._warm_task = asyncio.create_task(self._warm_assets())
+
+    async def cog_unload(self):
+        if self._warm_task is not None:
+            self._warm_task.cancel()
+
+    async def _asset(self, kind: str, winning_index: int) -> bytes:
+        """Cached wheel image bytes; concurrent requests for one image share a render."""
+        key = (kind, winning_index)
+        future = self._renders.get(key)
+        if future is None:
+            future = asyncio.get_running_loop().run_in_executor(None, load_asset, kind, winning_index)
+            self._renders[key] = future
+            future.add_done_callback(lambda _: self._renders.pop(key, None))
+        return await asyncio.shield(future)
+
+    async def _warm_assets(self) -> None:
+        """Render any missing wheel images in the background, one at a time."""
+        loop = asyncio.get_running_loop()
+        try:
+            await loop.run_in_executor(None, _remove_stale_assets)
+            for kind in ("spin", "result"):
+                for index in range(len(WHEEL_ORDER)):
+                    if not asset_path(kind, index).exists():
+                        await self._asset(kind, index)
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            logging.getLogger("red.crewcogs.casino.roulette").exception("Could not prerender roulette wheel images")
 
     @commands.command(aliases=["roul"])
     @commands.max_concurrency(1, per=commands.BucketType.user, wait=False)
@@ -89,7 +208,6 @@ class Roulette(commands.Cog):
             return await ctx.send(error)
 
         self.active_players.add(ctx.author.id)
-        animation_path = result_path = None
         withdrawn = False
         settled = False
         try:
@@ -98,9 +216,9 @@ class Roulette(commands.Cog):
             mark_played(ctx.guild.id, ctx.author.id, "roulette")
             winning_pocket = random.choice(WHEEL_ORDER)
             winning_index = WHEEL_ORDER.index(winning_pocket)
-            animation_path = self._make_spin_gif(winning_index)
+            animation = await self._asset("spin", winning_index)
             embed = discord.Embed(title="🎡 Ruthless Dealer • Krew Roulette", description=f"**{ctx.author.display_name}** bet **{bet:,}** on **{display_bet(parsed_bet)}**.\n\nRuthless Dealer is spinning the wheel...", color=discord.Color.gold())
-            file = discord.File(animation_path, filename="roulette_spin.gif")
+            file = discord.File(BytesIO(animation), filename="roulette_spin.gif")
             embed.set_image(url="attachment://roulette_spin.gif")
             message = await ctx.send(embed=embed, file=file)
             await asyncio.sleep(4)
@@ -112,15 +230,7 @@ class Roulette(commands.Cog):
             deposited = settlement.deposited
             settled = True
 
-            cfg = self.config.user(ctx.author)
-            await cfg.total_roulette_bet.set(await cfg.total_roulette_bet() + bet)
-            if won:
-                await cfg.total_roulette_wins.set(await cfg.total_roulette_wins() + 1)
-                if deposited > await cfg.biggest_roulette_win():
-                    await cfg.biggest_roulette_win.set(deposited)
-            else:
-                await cfg.total_roulette_losses.set(await cfg.total_roulette_losses() + 1)
-            result_path = self._make_result_image(winning_index)
+            result_image = await self._asset("result", winning_index)
             color_name = pocket_color(winning_pocket)
             emoji = {"red":"🔴", "black":"⚫", "green":"🟢"}[color_name]
             if won:
@@ -130,7 +240,7 @@ class Roulette(commands.Cog):
                 result_text = f"💸 **You lost.**\nLoss: **{bet:,}** CrewCoin"
                 embed_color = discord.Color.red()
             result_embed = discord.Embed(title="🎡 Krew Roulette Result • Ruthless Dealer", description=f"The ball landed on {emoji} **{winning_pocket} {color_name.title()}**.\n\nYour bet: **{display_bet(parsed_bet)}** for **{bet:,}** CrewCoin\n\n{result_text}", color=embed_color)
-            result_file = discord.File(result_path, filename="roulette_result.png")
+            result_file = discord.File(BytesIO(result_image), filename="roulette_result.png")
             result_embed.set_image(url="attachment://roulette_result.png")
             await message.edit(embed=result_embed, attachments=[result_file])
         except Exception:
@@ -140,15 +250,12 @@ class Roulette(commands.Cog):
                 "Roulette failed for user %s", ctx.author.id
             )
             await ctx.send(
-                "Krew Roulette settled, but Ruthless Dealer could not post the result or update legacy stats."
+                "Krew Roulette settled, but Ruthless Dealer could not post the result."
                 if settled
                 else "Krew Roulette hit an unexpected error. Ruthless Dealer refunded the unsettled wager."
             )
         finally:
             self.active_players.discard(ctx.author.id)
-            for path in (animation_path, result_path):
-                if path:
-                    Path(path).unlink(missing_ok=True)
 
     @commands.command()
     async def roulettebets(self, ctx):
@@ -157,67 +264,14 @@ class Roulette(commands.Cog):
 
     @commands.command()
     async def roulettestats(self, ctx):
-        data = await self.config.user(ctx.author).all()
-        games = data["total_roulette_wins"] + data["total_roulette_losses"]
-        rate = data["total_roulette_wins"] / games * 100 if games else 0
+        data = await game_stats(ctx.author.id, "roulette")
+        games = data["games"]
+        rate = data["wins"] / games * 100 if games else 0
         embed = discord.Embed(title=f"🎡 Ruthless Dealer • {ctx.author.display_name}'s Krew Roulette Stats", color=discord.Color.gold())
-        embed.add_field(name="Record", value=f"Wins: **{data['total_roulette_wins']:,}**\nLosses: **{data['total_roulette_losses']:,}**\nWin rate: **{rate:.1f}%**")
-        embed.add_field(name="Wagering", value=f"Total bet: **{data['total_roulette_bet']:,}**\nBiggest return: **{data['biggest_roulette_win']:,}**")
+        embed.add_field(name="Record", value=f"Wins: **{data['wins']:,}**\nLosses: **{data['losses']:,}**\nWin rate: **{rate:.1f}%**")
+        embed.add_field(name="Wagering", value=f"Total bet: **{data['wagered']:,}**\nBiggest return: **{data['biggest_payout']:,}**")
         await ctx.send(embed=embed)
 
-    def _make_spin_gif(self, winning_index: int) -> str:
-        frames = []
-        for frame_number in range(18):
-            progress = frame_number / 17
-            eased = 1 - (1 - progress) ** 3
-            offset = winning_index + 3.5 * (1 - eased) * len(WHEEL_ORDER)
-            frames.append(self._draw_wheel(offset))
-        temp = tempfile.NamedTemporaryFile(delete=False, suffix=".gif")
-        temp.close()
-        frames[0].save(temp.name, save_all=True, append_images=frames[1:], duration=130, loop=0, disposal=2)
-        for frame in frames:
-            frame.close()
-        return temp.name
-
-    def _make_result_image(self, winning_index: int) -> str:
-        image = self._draw_wheel(winning_index)
-        temp = tempfile.NamedTemporaryFile(delete=False, suffix=".png")
-        temp.close()
-        image.save(temp.name, "PNG")
-        image.close()
-        return temp.name
-
-    def _draw_wheel(self, offset: float) -> Image.Image:
-        size, center, outer_radius, inner_radius = 520, 260, 240, 112
-        image = Image.new("RGBA", (size, size), (20, 24, 29, 255))
-        draw = ImageDraw.Draw(image)
-        segment_angle = 360 / len(WHEEL_ORDER)
-        font, center_font = self._font(16), self._font(23)
-        for index, pocket in enumerate(WHEEL_ORDER):
-            start = -90 + (index - offset) * segment_angle
-            end = start + segment_angle
-            fill = {"red":(176,32,37,255), "black":(30,33,38,255), "green":(25,130,78,255)}[pocket_color(pocket)]
-            draw.pieslice((center-outer_radius, center-outer_radius, center+outer_radius, center+outer_radius), start=start, end=end, fill=fill, outline=(220,220,220,255), width=1)
-            angle = math.radians((start + end) / 2)
-            x, y = center + math.cos(angle)*196, center + math.sin(angle)*196
-            box = draw.textbbox((0,0), pocket, font=font)
-            draw.text((x-(box[2]-box[0])/2, y-(box[3]-box[1])/2), pocket, fill="white", font=font)
-        draw.ellipse((center-inner_radius, center-inner_radius, center+inner_radius, center+inner_radius), fill=(195,151,55,255), outline=(245,220,145,255), width=4)
-        draw.ellipse((center-82, center-82, center+82, center+82), fill=(49,55,62,255))
-        label = "KREW\nROULETTE"
-        box = draw.multiline_textbbox((0,0), label, font=center_font, align="center")
-        draw.multiline_text((center-(box[2]-box[0])/2, center-(box[3]-box[1])/2), label, font=center_font, fill="white", align="center")
-        draw.polygon([(center,10),(center-18,48),(center+18,48)], fill=(245,205,68,255), outline="white")
-        draw.ellipse((center-8,35,center+8,51), fill=(245,245,245,255))
-        return image
-
-    @staticmethod
-    def _font(size: int):
-        try:
-            return ImageFont.truetype("DejaVuSans-Bold.ttf", size)
-        except OSError:
-            return ImageFont.load_default()
-
 
 async def setup(bot):
     await bot.add_cog(Roulette(bot))
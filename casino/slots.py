@@ -3,11 +3,11 @@ import logging
 import random
 
 from discord import Embed
-from redbot.core import Config, bank, commands
+from redbot.core import bank, commands
 
 from .casino_core import mark_played, refund_wager, settle_game, validate_bet
+from .stats import game_stats
 
-SLOT_CONFIG_ID = 5557771234
 REEL = {"🍒": 25, "🍋": 20, "🍊": 18, "🍇": 14, "🔔": 10, "⭐": 7, "💎": 4, "7️⃣": 2}
 TRIPLE_PAYOUTS = {"🍒": 5, "🍋": 6, "🍊": 8, "🍇": 10, "🔔": 15, "⭐": 25, "💎": 50, "7️⃣": 100}
 PAIR_PAYOUT = 1.5
@@ -20,8 +20,6 @@ class Slots(commands.Cog):
 
     def __init__(self, bot):
         self.bot = bot
-        self.config = Config.get_conf(None, identifier=SLOT_CONFIG_ID, force_registration=True)
-        self.config.register_user(total_slot_wins=0, total_slot_losses=0, total_slot_bet=0, biggest_slot_win=0)
 
     @staticmethod
     def spin_reels():
@@ -67,8 +65,6 @@ class Slots(commands.Cog):
             settlement = await settle_game(ctx.author, "slots", bet, payout, result, channel=ctx.channel)
             settled = True
 
-            cfg = self.config.user(ctx.author)
-            await cfg.total_slot_bet.set(await cfg.total_slot_bet() + bet)
             if payout:
                 if kind == "triple" and reels[0] == "7️⃣":
                     outcome = f"🎰 **JACKPOT!** Returned **{settlement.deposited:,}** CrewCoin (net {settlement.deposited - bet:+,})."
@@ -78,12 +74,8 @@ class Slots(commands.Cog):
                     outcome = f"✨ A pair! Returned **{settlement.deposited:,}** CrewCoin (net {settlement.deposited - bet:+,})."
                 if settlement.capped:
                     outcome += " Payout limited by the bank balance cap."
-                await cfg.total_slot_wins.set(await cfg.total_slot_wins() + 1)
-                if settlement.deposited > await cfg.biggest_slot_win():
-                    await cfg.biggest_slot_win.set(settlement.deposited)
             else:
                 outcome = f"💸 No match. You lost **{bet:,}** CrewCoin."
-                await cfg.total_slot_losses.set(await cfg.total_slot_losses() + 1)
 
             embed.add_field(name="Outcome", value=outcome, inline=False)
             await message.edit(embed=embed)
@@ -94,15 +86,15 @@ class Slots(commands.Cog):
                 "Slots failed for user %s", ctx.author.id
             )
             await ctx.send(
-                "Ruthless Dealer’s slots settled, but the result message or legacy stats failed."
+                "Ruthless Dealer’s slots settled, but the result message failed."
                 if settled
                 else "Ruthless Dealer’s slots hit an unexpected error. The unsettled wager was refunded."
             )
 
     @commands.command()
     async def slotstats(self, ctx):
-        data = await self.config.user(ctx.author).all()
-        await ctx.send(f"Ruthless Dealer Slots — Wins: {data['total_slot_wins']}, Losses: {data['total_slot_losses']}, Bet total: {data['total_slot_bet']:,}, Biggest win: {data['biggest_slot_win']:,}")
+        data = await game_stats(ctx.author.id, "slots")
+        await ctx.send(f"Ruthless Dealer Slots — Wins: {data['wins']}, Losses: {data['losses']}, Bet total: {data['wagered']:,}, Biggest win: {data['biggest_payout']:,}")
 
     @commands.command()
     async def slotpayouts(self, ctx):
@@ -0,0 +1,114 @@
+from __future__ import annotations
+
+import logging
+from typing import Dict, Iterable, Optional
+
+from redbot.core import Config
+
+from .casino_core import CONFIG, LEDGER, USER_STAT_KEYS, new_game_stats
+
+LOG = logging.getLogger("red.crewcogs.casino.stats")
+
+# Config coordinates of the per-game counters each game kept before settle_game
+# fed the unified user store: (game, cog_name, identifier, field map). The map
+# names the legacy wager / win / loss / biggest-return keys. Legacy blackjack
+# counted push wagers in total_bet but kept no push count, so its migrated
+# "games" (wins + losses) can be short of the hands behind "wagered".
+LEGACY_SOURCES = (
+    ("slots", None, 5557771234, ("total_slot_bet", "total_slot_wins", "total_slot_losses", "biggest_slot_win")),
+    ("coinflip", None, 9876543210, ("total_cf_bet", "total_cf_wins", "total_cf_losses", None)),
+    ("blackjack", None, 1234567890, ("total_bet", "total_wins", "total_losses", None)),
+    ("roulette", "Roulette", 8642097531, ("total_roulette_bet", "total_roulette_wins", "total_roulette_losses", "biggest_roulette_win")),
+)
+
+
+async def migrate_legacy_stats() -> Optional[int]:
+    """Fold the legacy per-game counters into the unified user store once.
+
+    Each user's document records that it was migrated in the same journaled
+    write as the folded counters, so an interrupted run can simply be repeated.
+    Legacy counters never stored returned amounts, so only wagers, wins,
+    losses and biggest returns carry over. Returns the number of users
+    migrated, or None if it already ran.
+    """
+    if await CONFIG.legacy_migrated():
+        return None
+
+    folded: Dict[int, Dict[str, tuple]] = {}
+    for game, cog_name, identifier, (bet_key, win_key, loss_key, best_key) in LEGACY_SOURCES:
+        try:
+            rows = await Config.get_conf(None, identifier=identifier, cog_name=cog_name).all_users()
+        except Exception:
+            LOG.exception("Could not read legacy %s stats; migration will retry on next load", game)
+            return 0
+        for uid, row in rows.items():
+            counts = (
+                int(row.get(bet_key, 0) or 0),
+                int(row.get(win_key, 0) or 0),
+                int(row.get(loss_key, 0) or 0),
+                int(row.get(best_key, 0) or 0) if best_key else 0,
+            )
+            if any(counts):
+                folded.setdefault(int(uid), {})[game] = counts
+
+    migrated = 0
+    for uid, games in folded.items():
+        data = await LEDGER.user(uid)
+        if data["legacy_migrated"]:
+            continue
+        for game, (bet, wins, losses, best) in games.items():
+            game_data = data["games"].setdefault(game, new_game_stats())
+            game_data["wagered"] += bet
+            game_data["games"] += wins + losses
+            game_data["wins"] += wins
+            game_data["losses"] += losses
+            game_data["biggest_payout"] = max(game_data["biggest_payout"], best)
+            data["total_wagered"] += bet
+            data["total_games"] += wins + losses
+            data["wins"] += wins
+            data["losses"] += losses
+        data["legacy_migrated"] = True
+        LEDGER.mark("user", 0, uid, USER_STAT_KEYS)
+        migrated += 1
+
+    await LEDGER.flush()
+    await CONFIG.legacy_migrated.set(True)
+    LOG.info("Folded legacy casino stats for %s users", migrated)
+    return migrated
+
+
+async def game_stats(user_id: int, game: str) -> dict:
+    """One user's lifetime stats for one game, across every guild."""
+    data = await LEDGER.user_data(user_id)
+    return {**new_game_stats(), **data["games"].get(game, {})}
+
+
+async def user_totals() -> Dict[int, dict]:
+    """Lifetime casino totals for every user: ``{uid: {wagered, paid, games, wins}}``.
+
+    One Config table plus pending settlements, for cogs such as CrewStats
+    that used to sum each game's legacy counters. Daily Spin is free, so it
+    is already left out of the economy totals and is taken out of ``wins``.
+    """
+    return {
+        uid: {
+            "wagered": data.get("total_wagered", 0),
+            "paid": data.get("total_paid", 0),
+            "games": data.get("total_games", 0),
+            "wins": data.get("wins", 0) - data.get("games", {}).get("dailyspin", {}).get("wins", 0),
+        }
+        for uid, data in (await LEDGER.all_users()).items()
+    }
+
+
+async def game_totals(games: Iterable[str]) -> Dict[int, dict]:
+    """Lifetime ``{uid: {wagered, wins}}`` summed over just the given games."""
+    games = tuple(games)
+    out: Dict[int, dict] = {}
+    for uid, data in (await LEDGER.all_users()).items():
+        per_game = [data.get("games", {}).get(game, {}) for game in games]
+        out[uid] = {
+            "wagered": sum(g.get("wagered", 0) for g in per_game),
+            "wins": sum(g.get("wins", 0) for g in per_game),
+        }
+    return out
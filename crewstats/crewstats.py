@@ -40,9 +40,7 @@ log = logging.getLogger("red.crewstats")
 # Casino games were written with `Config.get_conf(None, identifier=...)`,
 # which resolves the cog_name to "NoneType".  We re-open the same namespace.
 CASINO_COGNAME = None  # -> type(None).__name__ == "NoneType"
-CF_ID = 9876543210   # coinflip:  total_cf_wins / total_cf_losses / total_cf_bet
-BJ_ID = 1234567890   # blackjack: total_wins / total_losses / total_bet
-SL_ID = 5557771234   # slots:     total_slot_wins / total_slot_losses / total_slot_bet
+CASINO_ID = 2468135790  # unified casino user store: total_wagered / wins (every game)
 HR_ID = 7654321098   # horserace: hr_wins / hr_losses / hr_bet / hr_earned
 
 # PokeBot: get_conf(self, ...) with class name "PokéBot" (accented e).
@@ -87,6 +85,10 @@ class CrewStats(commands.Cog):
             baselines={},         # { "user_id": {casino_bet, casino_wins, poke_caught, ...} }
         )
 
+        # Set once stored casino baselines were shifted onto the unified casino
+        # store (see _migrate_casino_baselines).
+        self.config.register_global(casino_baselines_migrated=False)
+
         # In-memory: unix ts of when each (guild, member) currently in voice joined.
         self._vc_since: dict[tuple[int, int], float] = {}
 
@@ -218,29 +220,84 @@ class CrewStats(commands.Cog):
     # ------------------------------------------------------------------ #
     # Reading external cog totals (bulk, defensive)
     # ------------------------------------------------------------------ #
-    async def _casino_totals(self) -> dict[int, dict]:
-        """{uid: {'bet': int, 'wins': int}} summed across all casino games."""
-        out: dict[int, dict] = {}
+    async def _unified_casino(self, games: tuple = ()) -> dict[int, dict]:
+        """{uid: {'bet', 'wins'}} from the Casino cog's unified user store.
 
-        async def add(conf_id, bet_key, win_key):
+        All games by default (Daily Spin wins excluded, it's free), or only
+        the named `games`. Goes through the Casino cog so unflushed
+        settlements count; reads its Config table when the cog isn't loaded.
+        """
+        casino = self.bot.get_cog("Casino")
+        if casino is not None and hasattr(casino, "stat_totals"):
             try:
-                data = await Config.get_conf(
-                    None, identifier=conf_id, cog_name=CASINO_COGNAME
-                ).all_users()
+                totals = await (casino.game_totals(*games) if games else casino.stat_totals())
+                return {int(uid): {"bet": int(d["wagered"]), "wins": int(d["wins"])} for uid, d in totals.items()}
             except Exception:
-                return
-            for uid, d in data.items():
-                uid = int(uid)
-                slot = out.setdefault(uid, {"bet": 0, "wins": 0})
-                slot["bet"] += int(d.get(bet_key, 0) or 0)
-                slot["wins"] += int(d.get(win_key, 0) or 0)
-
-        await add(CF_ID, "total_cf_bet", "total_cf_wins")
-        await add(BJ_ID, "total_bet", "total_wins")
-        await add(SL_ID, "total_slot_bet", "total_slot_wins")
-        await add(HR_ID, "hr_bet", "hr_wins")
+                log.exception("Casino totals failed; reading Config instead")
+        try:
+            data = await Config.get_conf(
+                None, identifier=CASINO_ID, cog_name=CASINO_COGNAME
+            ).all_users()
+        except Exception:
+            return {}
+        out: dict[int, dict] = {}
+        for uid, d in data.items():
+            per_game = d.get("games", {}) or {}
+            if games:
+                picked = [per_game.get(g, {}) for g in games]
+                bet = sum(int(g.get("wagered", 0) or 0) for g in picked)
+                wins = sum(int(g.get("wins", 0) or 0) for g in picked)
+            else:
+                bet = int(d.get("total_wagered", 0) or 0)
+                wins = int(d.get("wins", 0) or 0) - int(per_game.get("dailyspin", {}).get("wins", 0) or 0)
+            out[int(uid)] = {"bet": bet, "wins": wins}
+        return out
+
+    async def _casino_totals(self) -> dict[int, dict]:
+        """{uid: {'bet': int, 'wins': int}} summed across all casino games."""
+        out = await self._unified_casino()
+        try:
+            data = await Config.get_conf(
+                None, identifier=HR_ID, cog_name=CASINO_COGNAME
+            ).all_users()
+        except Exception:
+            return out
+        for uid, d in data.items():
+            slot = out.setdefault(int(uid), {"bet": 0, "wins": 0})
+            slot["bet"] += int(d.get("hr_bet", 0) or 0)
+            slot["wins"] += int(d.get("hr_wins", 0) or 0)
         return out
 
+    async def _migrate_casino_baselines(self) -> None:
+        """One-time shift of stored casino baselines onto the unified casino store.
+
+        The old per-game tables summed here never included roulette or
+        High/Low, and the unified store does (lifetime, via the casino's legacy
+        fold). Adding each member's lifetime roulette + High/Low totals to
+        their stored baseline keeps this week's deltas unchanged, without the
+        message/voice reset that ``weeklyset rebaseline`` does. Waits until the
+        casino has folded its legacy counters in.
+        """
+        if await self.config.casino_baselines_migrated():
+            return
+        casino_conf = Config.get_conf(None, identifier=CASINO_ID, cog_name=CASINO_COGNAME)
+        try:
+            if not await casino_conf.legacy_migrated():
+                return
+        except Exception:
+            return
+        shift = await self._unified_casino(("roulette", "highlow"))
+        for guild_id in await self.config.all_guilds():
+            async with self.config.guild_from_id(guild_id).baselines() as baselines:
+                for uid, base in baselines.items():
+                    extra = shift.get(int(uid))
+                    if not extra:
+                        continue
+                    base["casino_bet"] = int(base.get("casino_bet", 0)) + extra["bet"]
+                    base["casino_wins"] = int(base.get("casino_wins", 0)) + extra["wins"]
+        await self.config.casino_baselines_migrated.set(True)
+        log.info("Shifted casino baselines onto the unified casino store")
+
     async def _poke_totals(self, guild: discord.Guild) -> dict[int, dict]:
         """{uid: {'caught', 'wins', 'dex'}} lifetime totals from PokeBot."""
         out: dict[int, dict] = {}
@@ -521,6 +578,7 @@ class CrewStats(commands.Cog):
             self._seed_voice_timers()
         while True:
             try:
+                await self._migrate_casino_baselines()
                 for guild in list(self.bot.guilds):
                     await self._maybe_fire(guild)
             except asyncio.CancelledError:
@@ -0,0 +1,149 @@
+"""PvP battle resolution — synchronous, no Discord, no network.
+
+Moves are looked up before a turn is resolved and passed in as ``MoveData``;
+every roll goes through the ``rng`` argument, so a seeded ``random.Random``
+replays a battle exactly. Resolution returns ``TurnEvent`` records and the
+cog turns those into battle-log lines.
+"""
+from __future__ import annotations
+
+import math
+import random
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+
+from .pokeapi import TYPE_IDS, type_effectiveness_ids, type_ids
+
+CRIT_CHANCE = 0.0625
+CRIT_MULT   = 1.5
+STAB_MULT   = 1.5
+
+
+@dataclass(frozen=True)
+class MoveData:
+    name:     str
+    type:     str
+    power:    int
+    accuracy: int
+    type_id:  int = -1
+
+    @classmethod
+    def from_doc(cls, doc: dict) -> "MoveData":
+        """Build from a (slimmed) PokéAPI move document."""
+        return cls(
+            name=doc["name"],
+            type=doc["type"]["name"],
+            power=doc.get("power") or 0,
+            accuracy=doc.get("accuracy") or 100,
+            type_id=TYPE_IDS.get(doc["type"]["name"], -1),
+        )
+
+
+@dataclass(frozen=True)
+class TurnEvent:
+    """One thing that happened in a turn.
+
+    kind is one of ``failed`` (move data unavailable), ``miss``, ``used``,
+    ``no_damage``, ``hit`` and ``fainted``. ``side`` is the acting side
+    (``"player1"`` / ``"player2"``) — for ``fainted`` it is the side that fainted.
+    """
+    kind:          str
+    side:          str
+    move:          str = ""
+    damage:        int = 0
+    critical:      bool = False
+    effectiveness: float = 1.0
+    hp:            int = 0
+    max_hp:        int = 0
+
+
+@dataclass(frozen=True)
+class TurnResult:
+    events: List[TurnEvent]
+    winner: Optional[str]   # side key of the winner, or None if nobody fainted
+
+
+def _other(side: str) -> str:
+    return "player2" if side == "player1" else "player1"
+
+
+def calc_damage(attacker: dict, defender: dict, move: MoveData, rng: random.Random) -> Tuple[int, bool, float]:
+    """Damage, crit flag and type multiplier for a hit that connects."""
+    atk = attacker["stats"].get("attack") or attacker["stats"].get("special-attack") or 50
+    dfs = defender["stats"].get("defense") or defender["stats"].get("special-defense") or 50
+    lvl = attacker["level"]
+
+    type_eff  = type_effectiveness_ids(move.type_id, defender.get("typeIds") or type_ids(defender["types"]))
+    stab      = STAB_MULT if move.type in attacker["types"] else 1.0
+    rand_mult = 0.85 + rng.random() * 0.15
+    critical  = rng.random() < CRIT_CHANCE
+
+    damage = max(1, math.floor(
+        (((2 * lvl / 5 + 2) * move.power * atk / dfs) / 50 + 2)
+        * stab * type_eff * rand_mult * (CRIT_MULT if critical else 1.0)
+    ))
+    return damage, critical, type_eff
+
+
+def resolve_move(
+    side: str,
+    attacker: dict,
+    defender: dict,
+    move_name: str,
+    move: Optional[MoveData],
+    rng: random.Random,
+) -> Tuple[List[TurnEvent], bool]:
+    """Apply one move. Mutates the defender's HP; returns (events, defender_fainted)."""
+    if move is None:
+        return [TurnEvent("failed", side, move_name)], False
+    if rng.random() * 100 > move.accuracy:
+        return [TurnEvent("miss", side, move_name)], False
+
+    events = [TurnEvent("used", side, move_name)]
+    if move.power == 0:
+        events.append(TurnEvent("no_damage", side, move_name))
+        return events, False
+
+    damage, critical, type_eff = calc_damage(attacker, defender, move, rng)
+    stats = defender["stats"]
+    stats["hp"] = max(0, stats["hp"] - damage)
+    events.append(TurnEvent(
+        "hit", side, move_name,
+        damage=damage, critical=critical, effectiveness=type_eff,
+        hp=stats["hp"], max_hp=stats["maxHp"],
+    ))
+    fainted = stats["hp"] <= 0
+    if fainted:
+        events.append(TurnEvent("fainted", _other(side)))
+    return events, fainted
+
+
+def turn_order(p1: dict, p2: dict) -> Tuple[str, str]:
+    """Faster Pokémon acts first; ties go to player1."""
+    if p1["stats"].get("speed", 50) >= p2["stats"].get("speed", 50):
+        return "player1", "player2"
+    return "player2", "player1"
+
+
+def resolve_turn(
+    mons: Dict[str, dict],
+    chosen: Dict[str, str],
+    moves: Dict[str, Optional[MoveData]],
+    rng: random.Random,
+) -> TurnResult:
+    """Resolve a full turn.
+
+    ``mons`` and ``chosen`` are keyed by side; ``moves`` maps each chosen move
+    name to its data (None if it couldn't be loaded). HP changes are applied
+    to the Pokémon dicts in ``mons``.
+    """
+    events: List[TurnEvent] = []
+    for side in turn_order(mons["player1"], mons["player2"]):
+        move_name = chosen[side]
+        evs, fainted = resolve_move(
+            side, mons[side], mons[_other(side)], move_name, moves.get(move_name), rng,
+        )
+        events.extend(evs)
+        if fainted:
+            return TurnResult(events, side)
+    return TurnResult(events, None)
@@ -0,0 +1,80 @@
+"""Per-guild trainer leaderboard kept as sorted indexes.
+
+Each category holds a list of ``(-value, member_id)`` tuples kept sorted with
+bisect, so the top of the board is a slice and a trainer's rank is a binary
+search. Entries are replaced whenever a trainer doc is saved, so the board is
+never rebuilt from a full member scan after the first use.
+"""
+from __future__ import annotations
+
+import bisect
+from typing import Dict, List, Optional, Tuple
+
+CATEGORIES = ("wins", "caught", "shinies", "dex")
+
+
+def trainer_aggregates(player: dict) -> Dict[str, int]:
+    """The leaderboard numbers for one trainer doc (pure)."""
+    mons = player.get("pokemon", [])
+    return {
+        "wins":    player.get("wins", 0),
+        "caught":  len(mons),
+        "shinies": sum(1 for m in mons if m.get("shiny")),
+        "dex":     len(player.get("caughtDex", [])),
+    }
+
+
+class GuildBoard:
+    """Sorted per-category index of every registered trainer in one guild."""
+
+    def __init__(self) -> None:
+        self._values: Dict[int, Dict[str, int]] = {}                # member_id -> aggregates
+        self._index:  Dict[str, List[Tuple[int, int]]] = {c: [] for c in CATEGORIES}
+
+    def __len__(self) -> int:
+        return len(self._values)
+
+    def __contains__(self, member_id: int) -> bool:
+        return member_id in self._values
+
+    def members(self) -> List[int]:
+        return list(self._values)
+
+    def update(self, member_id: int, player: dict) -> None:
+        """Insert or refresh a trainer's entries from their current doc."""
+        new = trainer_aggregates(player)
+        old = self._values.get(member_id)
+        if old == new:
+            return
+        for cat in CATEGORIES:
+            idx = self._index[cat]
+            if old is not None:
+                pos = bisect.bisect_left(idx, (-old[cat], member_id))
+                if pos < len(idx) and idx[pos] == (-old[cat], member_id):
+                    del idx[pos]
+            bisect.insort(idx, (-new[cat], member_id))
+        self._values[member_id] = new
+
+    def remove(self, member_id: int) -> None:
+        old = self._values.pop(member_id, None)
+        if old is None:
+            return
+        for cat in CATEGORIES:
+            idx = self._index[cat]
+            pos = bisect.bisect_left(idx, (-old[cat], member_id))
+            if pos < len(idx) and idx[pos] == (-old[cat], member_id):
+                del idx[pos]
+
+    def value(self, category: str, member_id: int) -> int:
+        return self._values.get(member_id, {}).get(category, 0)
+
+    def top(self, category: str, n: int) -> List[Tuple[int, int]]:
+        """Best `n` trainers as ``(member_id, value)``, highest first."""
+        return [(mid, -neg) for neg, mid in self._index[category][:n]]
+
+    def rank(self, category: str, member_id: int) -> Optional[int]:
+        """0-based position of a trainer on the board, or None if unranked."""
+        vals = self._values.get(member_id)
+        if vals is None:
+            return None
+        return bisect.bisect_left(self._index[category], (-vals[category], member_id))
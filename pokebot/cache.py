@@ -0,0 +1,87 @@
+"""Bounded in-process LRU with single-flight loading.
+
+Sits in front of the species/move store so a busy raid or battle channel
+parses each document once, and concurrent callers asking for the same key
+share a single in-flight lookup instead of each hitting disk or PokéAPI.
+"""
+from __future__ import annotations
+
+import asyncio
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Hashable, Iterable
+
+
+class AsyncLRU:
+    """LRU of parsed objects keyed by any hashable; values must be treated read-only."""
+
+    def __init__(self, maxsize: int) -> None:
+        self.maxsize   = maxsize
+        self._data: "OrderedDict[Hashable, Any]" = OrderedDict()
+        self._inflight: Dict[Hashable, asyncio.Task] = {}
+        self.hits      = 0
+        self.misses    = 0
+        self.coalesced = 0   # callers that joined someone else's in-flight load
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def get(self, key: Hashable) -> Any:
+        """Return a cached value (refreshing its recency) or None."""
+        if key in self._data:
+            self._data.move_to_end(key)
+            return self._data[key]
+        return None
+
+    def put(self, keys: Iterable[Hashable], value: Any) -> None:
+        """Cache one value under several aliases (e.g. dex id and API name)."""
+        for key in keys:
+            self._data[key] = value
+            self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+    def clear(self) -> None:
+        self._data.clear()
+
+    async def get_or_load(
+        self,
+        key: Hashable,
+        loader: Callable[[], Awaitable[Any]],
+        aliases: Callable[[Any], Iterable[Hashable]] = lambda v: (),
+    ) -> Any:
+        """Return the cached value for `key`, loading it at most once concurrently.
+
+        The load runs as its own task so one caller being cancelled doesn't
+        cancel it for the others waiting on the same key.
+        """
+        if key in self._data:
+            self.hits += 1
+            self._data.move_to_end(key)
+            return self._data[key]
+
+        task = self._inflight.get(key)
+        if task is not None:
+            self.coalesced += 1
+        else:
+            self.misses += 1
+            task = asyncio.ensure_future(loader())
+            self._inflight[key] = task
+
+            def _done(t: asyncio.Task) -> None:
+                self._inflight.pop(key, None)
+                if t.cancelled():
+                    return
+                if t.exception() is None:
+                    value = t.result()
+                    self.put((key, *aliases(value)), value)
+
+            task.add_done_callback(_done)
+        return await asyncio.shield(task)
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "size":      len(self._data),
+            "hits":      self.hits,
+            "misses":    self.misses,
+            "coalesced": self.coalesced,
+        }
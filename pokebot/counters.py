@@ -0,0 +1,69 @@
+"""Buffered per-guild encounter counters.
+
+Spawns, flees, catches and raid results bump in-memory deltas; the cog's
+flush loop folds them into the guild's ``encounter_stats`` (and a rolling
+per-day history) in one write per guild, so events never read-modify-write
+Config themselves and concurrent events can't lose increments.
+"""
+from __future__ import annotations
+
+import time
+from collections import Counter
+from typing import Dict, Optional, Tuple
+
+HISTORY_DAYS = 30   # daily buckets kept in encounter_history
+
+
+def day_key(ts: Optional[float] = None) -> str:
+    """UTC date bucket for a timestamp, e.g. ``"2024-05-01"``."""
+    return time.strftime("%Y-%m-%d", time.gmtime(time.time() if ts is None else ts))
+
+
+def merge_counts(base: dict, deltas: Dict[str, int]) -> dict:
+    """Add `deltas` into a counts dict in place and return it (pure)."""
+    for name, n in deltas.items():
+        base[name] = base.get(name, 0) + n
+    return base
+
+
+def trim_history(history: dict, keep: int = HISTORY_DAYS) -> dict:
+    """Drop all but the newest `keep` day buckets (keys sort chronologically)."""
+    for day in sorted(history)[:-keep]:
+        del history[day]
+    return history
+
+
+class EncounterCounters:
+    """Pending encounter deltas per guild, plus the same deltas bucketed by day."""
+
+    def __init__(self) -> None:
+        self._totals: Dict[int, Counter] = {}
+        self._daily:  Dict[int, Dict[str, Counter]] = {}
+
+    def bump(self, guild_id: int, **deltas: int) -> None:
+        totals = self._totals.setdefault(guild_id, Counter())
+        daily  = self._daily.setdefault(guild_id, {}).setdefault(day_key(), Counter())
+        for name, n in deltas.items():
+            if n:
+                totals[name] += n
+                daily[name]  += n
+
+    def pending(self, guild_id: int) -> Tuple[Counter, Dict[str, Counter]]:
+        """Unflushed deltas for one guild (read-only view)."""
+        return self._totals.get(guild_id, Counter()), self._daily.get(guild_id, {})
+
+    def drain(self) -> Dict[int, Tuple[Counter, Dict[str, Counter]]]:
+        """Hand over every guild's pending deltas and start fresh."""
+        out = {
+            gid: (self._totals.get(gid, Counter()), self._daily.get(gid, {}))
+            for gid in set(self._totals) | set(self._daily)
+        }
+        self._totals, self._daily = {}, {}
+        return out
+
+    def restore(self, guild_id: int, totals: Counter, daily: Dict[str, Counter]) -> None:
+        """Put back deltas whose flush failed so the next pass retries them."""
+        self._totals.setdefault(guild_id, Counter()).update(totals)
+        mine = self._daily.setdefault(guild_id, {})
+        for day, counts in daily.items():
+            mine.setdefault(day, Counter()).update(counts)
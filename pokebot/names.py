@@ -0,0 +1,134 @@
+"""In-memory species name index.
+
+Names are normalised to bare lowercase alphanumerics ("Mr. Mime", "mr-mime"
+and "mrmime" are one key) and looked up in order: dex number, exact name,
+unique prefix, then trigram candidates ranked by edit distance. A close
+single typo resolves directly. Anything else comes back with suggestions,
+so callers only go to the network when the index is incomplete.
+"""
+from __future__ import annotations
+
+import bisect
+import re
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Set, Tuple
+
+_STRIP = re.compile(r"[^a-z0-9]")
+
+MAX_SUGGESTIONS = 5
+
+
+def normalize(name: str) -> str:
+    return _STRIP.sub("", name.lower().replace("♀", "f").replace("♂", "m"))
+
+
+def _trigrams(key: str) -> Set[str]:
+    padded = f"  {key} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+def edit_distance(a: str, b: str, limit: int) -> int:
+    """Levenshtein distance, giving up (returning limit + 1) once it exceeds `limit`."""
+    if abs(len(a) - len(b)) > limit:
+        return limit + 1
+    prev = list(range(len(b) + 1))
+    for i, ca in enumerate(a, 1):
+        cur = [i]
+        for j, cb in enumerate(b, 1):
+            cur.append(min(prev[j] + 1, cur[j - 1] + 1, prev[j - 1] + (ca != cb)))
+        if min(cur) > limit:
+            return limit + 1
+        prev = cur
+    return prev[-1]
+
+
+@dataclass(frozen=True)
+class NameMatch:
+    id:          Optional[int]   # resolved species id, None when ambiguous / unknown
+    name:        Optional[str]
+    suggestions: Tuple[str, ...] = ()
+
+
+class NameIndex:
+    def __init__(self) -> None:
+        self._ids:   Dict[str, int] = {}         # normalised key -> species id
+        self._names: Dict[str, str] = {}         # normalised key -> PokéAPI name
+        self._grams: Dict[str, Set[str]] = {}    # trigram -> keys containing it
+        self._by_id: Dict[int, str] = {}         # species id -> PokéAPI name
+        self._sorted: Optional[List[str]] = None
+
+    def __len__(self) -> int:
+        return len(self._by_id)
+
+    def __contains__(self, species_id: int) -> bool:
+        return species_id in self._by_id
+
+    def add(self, species_id: int, name: str) -> None:
+        key = normalize(name)
+        if not key or self._ids.get(key) == species_id:
+            return
+        self._ids[key]   = species_id
+        self._names[key] = name
+        self._by_id.setdefault(species_id, name)
+        for g in _trigrams(key):
+            self._grams.setdefault(g, set()).add(key)
+        self._sorted = None
+
+    def _prefixed(self, prefix: str) -> List[str]:
+        if self._sorted is None:
+            self._sorted = sorted(self._ids)
+        lo = bisect.bisect_left(self._sorted, prefix)
+        out = []
+        for key in self._sorted[lo:]:
+            if not key.startswith(prefix):
+                break
+            out.append(key)
+        return out
+
+    def has_base(self, query: str) -> bool:
+        """True if a known name is a prefix of `query` (e.g. a form like "charizard-mega-x")."""
+        key = normalize(query)
+        return any(key[:n] in self._ids for n in range(3, len(key)))
+
+    def _fuzzy(self, key: str) -> List[Tuple[int, str]]:
+        """(distance, key) pairs for names sharing trigrams with `key`, closest first."""
+        shared: Dict[str, int] = {}
+        for g in _trigrams(key):
+            for cand in self._grams.get(g, ()):
+                shared[cand] = shared.get(cand, 0) + 1
+        limit = max(2, len(key) // 3)
+        ranked = []
+        # Only the best-overlapping candidates get the (costlier) edit-distance check
+        for cand, _ in sorted(shared.items(), key=lambda kv: -kv[1])[:50]:
+            d = edit_distance(key, cand, limit)
+            if d <= limit:
+                ranked.append((d, cand))
+        ranked.sort()
+        return ranked
+
+    def resolve(self, query: str, max_id: Optional[int] = None) -> NameMatch:
+        q = query.strip().lower()
+        if q.isdigit():
+            sid = int(q)
+            if sid >= 1 and (max_id is None or sid <= max_id):
+                return NameMatch(sid, self._by_id.get(sid))
+            return NameMatch(None, None)
+
+        key = normalize(q)
+        if not key:
+            return NameMatch(None, None)
+        if key in self._ids:
+            return NameMatch(self._ids[key], self._names[key])
+
+        prefixed = self._prefixed(key)
+        if len({self._ids[k] for k in prefixed}) == 1:
+            return NameMatch(self._ids[prefixed[0]], self._names[prefixed[0]])
+        if prefixed:
+            prefixed.sort(key=len)
+            return NameMatch(None, None, tuple(self._names[k] for k in prefixed[:MAX_SUGGESTIONS]))
+
+        ranked = self._fuzzy(key)
+        if ranked and ranked[0][0] <= 1 and len(key) >= 4 and (len(ranked) == 1 or ranked[1][0] > 1):
+            best = ranked[0][1]
+            return NameMatch(self._ids[best], self._names[best])
+        return NameMatch(None, None, tuple(self._names[k] for _, k in ranked[:MAX_SUGGESTIONS]))
@@ -1,16 +1,25 @@
-"""PokéAPI helpers – async, with file-based caching."""
+"""PokéAPI helpers – async, backed by the packed local store."""
 from __future__ import annotations
 
 import asyncio
-import json
+import bisect
 import math
 import os
 import random
+import time
 import uuid
 from pathlib import Path
 from typing import Any, Dict, List, Optional
 
 import aiohttp
+import numpy as np
+
+from .cache import AsyncLRU
+from .names import NameIndex, NameMatch
+from .store import (
+    PokeStore, build_learnset, id_from_url, slim_move, slim_pokemon, summarize_species,
+    walk_evolution_chain,
+)
 
 MAX_POKEMON = 1025
 
@@ -76,13 +85,44 @@ TYPE_CHART: Dict[str, Dict[str, float]] = {
     "fairy":    {"fire": 0.5, "fighting": 2, "poison": 0.5, "dragon": 2, "dark": 2, "steel": 0.5},
 }
 
-CACHE_DIR: Optional[Path] = None
+# Compiled once at import: TYPE_MATRIX[attack_id, defend_id] is the multiplier.
+# Ids follow PokéAPI's type order (minus one); -1 marks an unknown / absent type.
+TYPE_NAMES = (
+    "normal", "fighting", "flying", "poison", "ground", "rock", "bug", "ghost", "steel",
+    "fire", "water", "grass", "electric", "psychic", "ice", "dragon", "dark", "fairy",
+)
+TYPE_IDS: Dict[str, int] = {name: i for i, name in enumerate(TYPE_NAMES)}
+TYPE_MATRIX = np.ones((len(TYPE_NAMES), len(TYPE_NAMES)), dtype=np.float64)
+for _atk, _row in TYPE_CHART.items():
+    for _def, _mult in _row.items():
+        TYPE_MATRIX[TYPE_IDS[_atk], TYPE_IDS[_def]] = _mult
+TYPE_MATRIX.setflags(write=False)
+del _atk, _row, _def, _mult
+
+
+def type_ids(types: List[str]) -> List[int]:
+    return [TYPE_IDS.get(t, -1) for t in types]
+
+
+STORE: Optional[PokeStore] = None
 
+API_BASE = "https://pokeapi.co/api/v2"
+IMPORT_CONCURRENCY = 8
+IMPORT_BATCH = 100
 
-def set_cache_dir(path: Path) -> None:
-    global CACHE_DIR
-    CACHE_DIR = path
-    CACHE_DIR.mkdir(parents=True, exist_ok=True)
+
+def open_store(path: Path) -> PokeStore:
+    global STORE
+    if STORE is None:
+        STORE = PokeStore(path)
+    return STORE
+
+
+def close_store() -> None:
+    global STORE
+    if STORE is not None:
+        STORE.close()
+        STORE = None
 
 
 async def _get(session: aiohttp.ClientSession, url: str) -> Any:
@@ -91,27 +131,211 @@ async def _get(session: aiohttp.ClientSession, url: str) -> Any:
         return await resp.json()
 
 
-async def fetch_pokemon(session: aiohttp.ClientSession, id_or_name) -> Dict:
-    slug = resolve_pokemon_id(id_or_name)
-    if CACHE_DIR:
-        cache_file = CACHE_DIR / f"{slug}.json"
-        if cache_file.exists():
-            return json.loads(cache_file.read_text())
-    data = await _get(session, f"https://pokeapi.co/api/v2/pokemon/{slug}")
-    if CACHE_DIR:
-        cache_file.write_text(json.dumps(data))
+SPECIES_CACHE = AsyncLRU(maxsize=256)
+MOVE_CACHE    = AsyncLRU(maxsize=1024)
+
+# dex id -> {"name", "types", "sprite", "shinySprite"}; what stored instances derive from.
+SPECIES_TABLE: Dict[int, dict] = {}
+SPECIES_NAMES = NameIndex()   # fuzzy name -> dex id, over the same species
+
+
+async def load_species_table() -> int:
+    """Pull every stored species summary into memory. Returns the table size."""
+    if STORE:
+        SPECIES_TABLE.update(await STORE.aspecies_summaries())
+    for species_id, summary in SPECIES_TABLE.items():
+        if species_id <= MAX_POKEMON:
+            SPECIES_NAMES.add(species_id, summary["name"])
+    return len(SPECIES_TABLE)
+
+
+def _register_species(doc: dict) -> dict:
+    SPECIES_TABLE[doc["id"]] = summary = summarize_species(doc)
+    if doc["id"] <= MAX_POKEMON:
+        SPECIES_NAMES.add(doc["id"], summary["name"])
+    return doc
+
+
+def species_names_complete() -> bool:
+    """True once every dex number has a local name (after `importdata`)."""
+    return len(SPECIES_NAMES) >= MAX_POKEMON
+
+
+def resolve_species_name(query: str) -> NameMatch:
+    """Match a user-typed name or dex number against the local species names."""
+    return SPECIES_NAMES.resolve(query, max_id=MAX_POKEMON)
+
+
+# species id -> [[target_id, name, min_level, trigger], ...]; [] when fully evolved.
+EVOLUTIONS: Dict[int, List[list]] = {}
+CHAIN_CACHE = AsyncLRU(maxsize=64)   # only used for single-flight on-demand chain loads
+
+
+async def load_evolution_graph() -> int:
+    """Pull the stored evolution graph into memory. Returns the number of species covered."""
+    if STORE:
+        EVOLUTIONS.update(await STORE.aevolutions())
+    return len(EVOLUTIONS)
+
+
+async def _load_chain(session: aiohttp.ClientSession, species_id: int) -> Dict[int, List[list]]:
+    species = await _get(session, f"{API_BASE}/pokemon-species/{species_id}")
+    graph   = walk_evolution_chain(await _get(session, species["evolution_chain"]["url"]))
+    EVOLUTIONS.update(graph)
+    if STORE:
+        await STORE.aput_evolutions(graph)
+    return graph
+
+
+async def evolution_targets(session: aiohttp.ClientSession, pokemon: dict) -> List[list]:
+    """Evolution targets for a Pokémon instance.
+
+    A dictionary lookup once the graph is imported; species missing from it
+    (forms, or before `import_all`) load their chain once and are stored.
+    """
+    targets = EVOLUTIONS.get(pokemon["id"])
+    if targets is not None:
+        return targets
+    raw = await fetch_pokemon(session, pokemon["id"])
+    species_id = id_from_url(raw["species"]["url"])
+    if species_id not in EVOLUTIONS:
+        await CHAIN_CACHE.get_or_load(species_id, lambda: _load_chain(session, species_id))
+    return EVOLUTIONS.get(species_id, [])
+
+
+async def _load_pokemon(session: aiohttp.ClientSession, slug: str) -> Dict:
+    if STORE:
+        doc = await STORE.aget_species(slug)
+        if doc is not None:
+            if "learnset" not in doc:
+                # Stored before learnsets existed — index it once and write it back.
+                doc = slim_pokemon(doc)
+                await STORE.aput_species([doc])
+            return _register_species(doc)
+    data = slim_pokemon(await _get(session, f"{API_BASE}/pokemon/{slug}"))
+    if STORE:
+        await STORE.aput_species([data])
+    return _register_species(data)
+
+
+async def _load_move(session: aiohttp.ClientSession, move_name: str) -> Dict:
+    if STORE:
+        doc = await STORE.aget_move(move_name)
+        if doc is not None:
+            return doc
+    data = slim_move(await _get(session, f"{API_BASE}/move/{move_name}"))
+    if STORE:
+        await STORE.aput_moves([data])
     return data
 
 
+async def fetch_pokemon(session: aiohttp.ClientSession, id_or_name) -> Dict:
+    """Species document by dex id or API name. Shared and cached — do not mutate."""
+    slug = str(resolve_pokemon_id(id_or_name)).lower()
+    return await SPECIES_CACHE.get_or_load(
+        slug,
+        lambda: _load_pokemon(session, slug),
+        aliases=lambda d: (str(d["id"]), d["name"]),
+    )
+
+
 async def fetch_move_data(session: aiohttp.ClientSession, move_name: str) -> Dict:
-    if CACHE_DIR:
-        cache_file = CACHE_DIR / f"move_{move_name}.json"
-        if cache_file.exists():
-            return json.loads(cache_file.read_text())
-    data = await _get(session, f"https://pokeapi.co/api/v2/move/{move_name}")
-    if CACHE_DIR:
-        cache_file.write_text(json.dumps(data))
-    return data
+    """Move document by API name. Shared and cached — do not mutate."""
+    return await MOVE_CACHE.get_or_load(move_name, lambda: _load_move(session, move_name))
+
+
+def cache_stats() -> Dict[str, Dict[str, int]]:
+    return {"species": SPECIES_CACHE.stats(), "moves": MOVE_CACHE.stats()}
+
+
+async def import_all(
+    session: aiohttp.ClientSession,
+    legacy_dir: Optional[Path] = None,
+    progress=None,
+) -> Dict[str, int]:
+    """Fill the store with every species and move so lookups never hit the network.
+
+    Already-stored documents are skipped, so an interrupted import can simply be
+    re-run. `progress` is an optional async callable(done, total) for UI updates.
+    Returns counts of documents fetched / failed.
+    """
+    if STORE is None:
+        raise RuntimeError("store is not open")
+    loop = asyncio.get_running_loop()
+    if legacy_dir is not None:
+        await loop.run_in_executor(None, STORE.fold_legacy_cache, legacy_dir)
+
+    have_ids   = await loop.run_in_executor(None, STORE.species_ids)
+    have_moves = await loop.run_in_executor(None, STORE.move_names)
+    move_index = await _get(session, f"{API_BASE}/move?limit=5000")
+    species_todo = [resolve_pokemon_id(i) for i in range(1, MAX_POKEMON + 1) if i not in have_ids]
+    moves_todo   = [m["name"] for m in move_index.get("results", []) if m["name"] not in have_moves]
+
+    total  = len(species_todo) + len(moves_todo)
+    done   = 0
+    failed = 0
+    stored = {"pokemon": 0, "move": 0}
+    sem    = asyncio.Semaphore(IMPORT_CONCURRENCY)
+    pending: Dict[str, List[dict]] = {"pokemon": [], "move": []}
+    write_lock = asyncio.Lock()
+
+    async def _flush(kind: str) -> None:
+        # Swap the batch out before awaiting so fetches keep filling a fresh one
+        async with write_lock:
+            docs, pending[kind] = pending[kind], []
+            if not docs:
+                return
+            if kind == "pokemon":
+                await STORE.aput_species(docs)
+                for doc in docs:
+                    _register_species(doc)
+            else:
+                await STORE.aput_moves(docs)
+            stored[kind] += len(docs)
+
+    async def _one(kind: str, slug: str) -> None:
+        nonlocal done, failed
+        async with sem:
+            try:
+                raw = await _get(session, f"{API_BASE}/{kind}/{slug}")
+                pending[kind].append(slim_pokemon(raw) if kind == "pokemon" else slim_move(raw))
+            except Exception:
+                failed += 1
+            done += 1
+        # Write as we go so an interrupted import keeps what it already fetched
+        if len(pending[kind]) >= IMPORT_BATCH:
+            await _flush(kind)
+        if progress and done % 100 == 0:
+            await progress(done, total)
+
+    await asyncio.gather(
+        *(_one("pokemon", s) for s in species_todo),
+        *(_one("move", m) for m in moves_todo),
+    )
+    await _flush("pokemon")
+    await _flush("move")
+
+    # Evolution graph — chains aren't keyed by species, so refetch them all
+    # unless every species is already covered.
+    chains = 0
+    if any(i not in EVOLUTIONS for i in range(1, MAX_POKEMON + 1)):
+        chain_index = await _get(session, f"{API_BASE}/evolution-chain?limit=2000")
+        graph: Dict[int, List[list]] = {}
+
+        async def _chain(url: str) -> None:
+            nonlocal chains, failed
+            async with sem:
+                try:
+                    graph.update(walk_evolution_chain(await _get(session, url)))
+                    chains += 1
+                except Exception:
+                    failed += 1
+
+        await asyncio.gather(*(_chain(c["url"]) for c in chain_index.get("results", [])))
+        EVOLUTIONS.update(graph)
+        await STORE.aput_evolutions(graph)
+    await loop.run_in_executor(None, STORE.set_meta, "imported_at", str(int(time.time())))
+    return {"species": stored["pokemon"], "moves": stored["move"], "chains": chains, "failed": failed}
 
 
 def get_random_pokemon_id() -> int:
@@ -155,16 +379,9 @@ async def build_pokemon_instance(
     shiny = force_shiny or (allow_shiny and is_shiny())
     types = [t["type"]["name"] for t in raw["types"]]
 
-    learnable = [
-        m["move"]["name"]
-        for m in raw["moves"]
-        if any(
-            d["move_learn_method"]["name"] == "level-up" and d["level_learned_at"] <= lvl
-            for d in m["version_group_details"]
-        )
-    ]
-    pool = learnable if learnable else [m["move"]["name"] for m in raw["moves"]]
-    pool = list(pool)
+    learnset  = build_learnset(raw)
+    learnable = learnset["moves"][:bisect.bisect_right(learnset["levels"], lvl)]
+    pool = list(learnable) if learnable else [m["move"]["name"] for m in raw["moves"]]
     random.shuffle(pool)
     selected_moves = pool[:4]
 
@@ -191,6 +408,7 @@ async def build_pokemon_instance(
         "name": raw["name"],
         "displayName": display_name,
         "types": types,
+        "typeIds": type_ids(types),
         "level": lvl,
         "xp": 0,
         "xpToNext": lvl * lvl * 10,
@@ -200,18 +418,40 @@ async def build_pokemon_instance(
         "moves": selected_moves,
         "stats": stats,
         "spriteUrl": sprite_url,
-        "caughtAt": __import__("time").time(),
+        "caughtAt": time.time(),
         "nickname": None,
     }
 
 
 def calculate_type_effectiveness(attack_type: str, defender_types: List[str]) -> float:
+    return type_effectiveness_ids(TYPE_IDS.get(attack_type, -1), type_ids(defender_types))
+
+
+def type_effectiveness_ids(attack_id: int, defender_ids: List[int]) -> float:
+    """Single-hit multiplier from integer type ids."""
+    if attack_id < 0:
+        return 1.0
     multiplier = 1.0
-    chart = TYPE_CHART.get(attack_type, {})
-    for def_type in defender_types:
-        if def_type in chart:
-            multiplier *= chart[def_type]
-    return multiplier
+    row = TYPE_MATRIX[attack_id]
+    for d in defender_ids:
+        if d >= 0:
+            multiplier *= row[d]
+    return float(multiplier)
+
+
+def batch_type_effectiveness(attack_ids: np.ndarray, defender_ids: np.ndarray) -> np.ndarray:
+    """Multipliers for many attacks at once, as one gather.
+
+    `attack_ids` has shape (n,); `defender_ids` is (n, k) — or (k,) for a single
+    shared defender such as a raid boss — padded with -1 for missing types.
+    """
+    attack_ids   = np.asarray(attack_ids, dtype=np.intp)
+    defender_ids = np.asarray(defender_ids, dtype=np.intp)
+    if defender_ids.ndim == 1:
+        defender_ids = np.broadcast_to(defender_ids, (attack_ids.shape[0], defender_ids.shape[0]))
+    valid = (attack_ids[:, None] >= 0) & (defender_ids >= 0)
+    gathered = TYPE_MATRIX[np.clip(attack_ids, 0, None)[:, None], np.clip(defender_ids, 0, None)]
+    return np.where(valid, gathered, 1.0).prod(axis=1)
 
 
 def effectiveness_label(mult: float) -> str:
@@ -264,24 +504,110 @@ def ensure_uids(player: dict) -> bool:
     return changed
 
 
-def uid_index(player: dict, uid: str) -> int:
-    """Collection index of the Pokémon with this uid, or -1."""
-    for i, m in enumerate(player.get("pokemon", [])):
-        if m.get("uid") == uid:
+class PlayerCollection:
+    """uid -> index map over a player's ``pokemon`` list.
+
+    Built on first lookup and kept in step by add / remove_at / replace_at, so
+    repeated lookups in one command (or across commands, when the wrapper is
+    cached with the player doc) don't rescan the list. A lookup that finds
+    the map out of date (the list was changed directly) rebuilds it.
+
+    ``queries`` holds the collection's query index (see ``query.py``); it is
+    dropped whenever the collection changes.
+    """
+
+    def __init__(self, player: dict) -> None:
+        self.player = player
+        self._index: Optional[Dict[str, int]] = None
+        self.queries = None
+
+    @property
+    def mons(self) -> List[dict]:
+        return self.player.setdefault("pokemon", [])
+
+    def __len__(self) -> int:
+        return len(self.mons)
+
+    def _rebuild(self) -> Dict[str, int]:
+        self._index = {m.get("uid"): i for i, m in enumerate(self.mons)}
+        return self._index
+
+    def invalidate(self) -> None:
+        self._index  = None
+        self.queries = None
+
+    def index_of(self, uid: str) -> int:
+        """Collection index of the Pokémon with this uid, or -1."""
+        index = self._index if self._index is not None else self._rebuild()
+        mons  = self.mons
+        i = index.get(uid)
+        if i is not None and i < len(mons) and mons[i].get("uid") == uid:
             return i
-    return -1
+        # A miss or a moved entry may just mean the map is stale
+        i = self._rebuild().get(uid)
+        return -1 if i is None else i
+
+    def get(self, uid: str) -> Optional[dict]:
+        i = self.index_of(uid)
+        return self.mons[i] if i >= 0 else None
+
+    def uids(self) -> set:
+        index = self._index if self._index is not None else self._rebuild()
+        if len(index) != len(self.mons):
+            index = self._rebuild()
+        return set(index)
+
+    def add(self, mon: dict) -> int:
+        mons = self.mons
+        mons.append(mon)
+        self.queries = None
+        if self._index is not None:
+            self._index[mon.get("uid")] = len(mons) - 1
+        return len(mons) - 1
+
+    def remove_at(self, idx: int) -> dict:
+        mon = self.mons.pop(idx)
+        self.queries = None
+        if self._index is not None:
+            self._index.pop(mon.get("uid"), None)
+            for uid, i in self._index.items():
+                if i > idx:
+                    self._index[uid] = i - 1
+        return mon
+
+    def replace_at(self, idx: int, mon: dict) -> dict:
+        old = self.mons[idx]
+        self.mons[idx] = mon
+        self.queries = None
+        if self._index is not None:
+            self._index.pop(old.get("uid"), None)
+            self._index[mon.get("uid")] = idx
+        return old
+
+    def party(self) -> List[dict]:
+        """The party uids resolved to live Pokémon dicts, in party order (stale uids skipped)."""
+        out = []
+        for u in self.player.get("party", []):
+            mon = self.get(u)
+            if mon is not None:
+                out.append(mon)
+        return out
+
+
+def uid_index(player: dict, uid: str, col: Optional[PlayerCollection] = None) -> int:
+    """Collection index of the Pokémon with this uid, or -1."""
+    return (col or PlayerCollection(player)).index_of(uid)
 
 
-def party_mons(player: dict) -> List[dict]:
+def party_mons(player: dict, col: Optional[PlayerCollection] = None) -> List[dict]:
     """Resolve the player's party uids to live Pokémon dicts, in party order.
 
     Stale uids (released/traded away) are silently skipped.
     """
-    by_uid = {m.get("uid"): m for m in player.get("pokemon", [])}
-    return [by_uid[u] for u in player.get("party", []) if u in by_uid]
+    return (col or PlayerCollection(player)).party()
 
 
-def ensure_party(player: dict) -> bool:
+def ensure_party(player: dict, col: Optional[PlayerCollection] = None) -> bool:
     """Keep the party list valid and in sync with the lead Pokémon.
 
     Invariants enforced:
@@ -300,7 +626,7 @@ def ensure_party(player: dict) -> bool:
             changed = True
         return changed
 
-    uid_set = {m["uid"] for m in mons}
+    uid_set = (col or PlayerCollection(player)).uids()
     # Drop stale uids + dedupe while preserving order
     seen: set = set()
     party: List[str] = []
@@ -341,6 +667,68 @@ def ensure_party(player: dict) -> bool:
     return changed
 
 
+# Fields of a stored instance that follow from its species id + shiny flag.
+DERIVED_FIELDS = ("name", "displayName", "types", "typeIds", "rarity", "spriteUrl", "shinySpriteUrl")
+
+
+def derived_fields(species_id: int, shiny: bool) -> Optional[dict]:
+    """What an instance of this species would carry for DERIVED_FIELDS, or None if unknown."""
+    sp = SPECIES_TABLE.get(species_id)
+    if sp is None:
+        return None
+    return {
+        "name":           sp["name"],
+        "displayName":    sp["name"].capitalize(),
+        "types":          list(sp["types"]),
+        "typeIds":        type_ids(sp["types"]),
+        "rarity":         pokemon_rarity(species_id),
+        "spriteUrl":      sp["shinySprite"] if shiny else sp["sprite"],
+        "shinySpriteUrl": sp["shinySprite"],
+    }
+
+
+def compact_pokemon(mon: dict) -> dict:
+    """Copy of `mon` without the fields that expand_pokemon can rebuild.
+
+    A field is only dropped when it matches what the species table would
+    derive, so compaction never loses information (e.g. a sprite URL from an
+    older API layout is kept as-is).
+    """
+    derived = derived_fields(mon.get("id"), mon.get("shiny", False))
+    if derived is None:
+        return mon
+    return {k: v for k, v in mon.items() if not (k in derived and derived[k] == v)}
+
+
+def expand_pokemon(mon: dict) -> bool:
+    """Fill in any missing derived fields in place.
+
+    Returns False if fields are missing and the species isn't in the table yet.
+    """
+    if all(k in mon for k in DERIVED_FIELDS):
+        return True
+    derived = derived_fields(mon.get("id"), mon.get("shiny", False))
+    if derived is None:
+        return False
+    for k, v in derived.items():
+        mon.setdefault(k, v)
+    return True
+
+
+def compact_player(player: dict) -> dict:
+    """Shallow copy of a trainer doc with every Pokémon compacted, for persisting."""
+    out = dict(player)
+    out["pokemon"] = [compact_pokemon(m) for m in player.get("pokemon", [])]
+    return out
+
+
+def needs_compaction(player: dict) -> bool:
+    """True if the stored doc still carries derivable fields (pre-compaction data)."""
+    return any(
+        len(compact_pokemon(m)) != len(m) for m in player.get("pokemon", [])
+    )
+
+
 # ──────────────────────────────────────────────────────────────────────────────
 # Raid balance helpers  (pure)
 # ──────────────────────────────────────────────────────────────────────────────
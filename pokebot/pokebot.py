@@ -26,18 +26,22 @@ from __future__ import annotations
 
 import asyncio
 import copy
+import json
 import logging
 import math
 import random
 import time
 import uuid
+from collections import deque
 from datetime import datetime, timezone, timedelta
 import zoneinfo
 from pathlib import Path
-from typing import Dict, List, Optional, Tuple
+from types import MappingProxyType
+from typing import Deque, Dict, List, Mapping, Optional, Set, Tuple
 
 import aiohttp
 import discord
+import numpy as np
 from redbot.core import Config, bank, commands, checks
 from redbot.core.bot import Red
 from redbot.core.errors import BalanceTooHigh
@@ -47,12 +51,24 @@ from .embeds import (
     success_embed, type_tag,
 )
 from .pokeapi import (
-    MAX_POKEMON, build_pokemon_instance, calculate_type_effectiveness,
+    MAX_POKEMON, build_pokemon_instance,
     catch_rate, effectiveness_label, fetch_move_data, fetch_pokemon,
-    get_random_pokemon_id, resolve_pokemon_id, set_cache_dir, pokemon_rarity,
-    new_uid, ensure_uids, ensure_party, party_mons, uid_index,
-    estimate_hit, boss_counter_damage,
+    get_random_pokemon_id, resolve_pokemon_id, pokemon_rarity,
+    new_uid, ensure_uids, ensure_party, party_mons, uid_index, PlayerCollection,
+    estimate_hit, boss_counter_damage, type_ids,
+    open_store, close_store, import_all, cache_stats, load_species_table,
+    load_evolution_graph, evolution_targets, resolve_species_name, species_names_complete,
+    compact_player, expand_pokemon, needs_compaction,
 )
+from . import pokeapi
+from .battle import MoveData, TurnEvent, resolve_turn
+from .board import GuildBoard
+from .query import QueryError, parse_query, run_query, select_slot
+from .raid import pack_attackers, resolve_volley
+from .counters import EncounterCounters, day_key, merge_counts, trim_history
+from .scheduler import Scheduler
+from .snapshot import pack_snapshot, read_snapshot, unpack_snapshot, write_snapshot
+from .sessions import SessionRegistry
 
 # ──────────────────────────────────────────────────────────────────────────────
 # Constants
@@ -62,6 +78,12 @@ log = logging.getLogger("red.pokebot")
 
 FLEE_TIMEOUT   = 4 * 60 * 60   # 4 hours — how long before an uncaught spawn flees
 BATTLE_TIMEOUT = 3 * 60        # 3 minutes — auto-forfeit if a player goes AFK in battle
+SPAWN_BUFFER_SIZE = 3          # pre-rolled wild Pokémon kept ready per guild
+PLAYER_FLUSH_INTERVAL = 30     # seconds between write-behind flushes of dirty trainers
+PLAYER_IDLE_EVICT     = 30 * 60  # drop clean cached trainers untouched this long
+SCHEDULE_CHECKPOINT   = 60     # seconds between writes of the session snapshot to disk
+# Guild settings the timers and listeners read; cached per guild, dropped by pokeset.
+SETTINGS_KEYS = ("spawn_channel_id", "spawn_interval", "flee_timeout", "max_pokemon")
 
 STARTERS = [
     # Gen 1
@@ -231,6 +253,28 @@ async def _currency_name(guild: discord.Guild) -> str:
     return await bank.get_currency_name(guild)
 
 
+def _dex_entries(player: dict) -> List[Tuple[int, str]]:
+    """(dex id, display name) for every caught species, in dex order."""
+    caught_ids = set(player.get("caughtDex", []))
+    seen: Dict[int, str] = {}
+    for pk in player["pokemon"]:
+        if pk["id"] in caught_ids and pk["id"] not in seen:
+            seen[pk["id"]] = pk["displayName"]
+    return [(pid, seen.get(pid, f"#{pid}")) for pid in sorted(caught_ids)]
+
+
+def _memo_by_version(version, compute):
+    """Wrap `compute()` so it only reruns when `version()` changes."""
+    state: Dict[str, object] = {}
+
+    def get():
+        v = version()
+        if "value" not in state or state["version"] != v:
+            state["version"], state["value"] = v, compute()
+        return state["value"]
+    return get
+
+
 # ──────────────────────────────────────────────────────────────────────────────
 # Paginated UI View
 # ──────────────────────────────────────────────────────────────────────────────
@@ -250,6 +294,14 @@ class PaginatedView(discord.ui.View):
         Only this Discord user can interact with the buttons.
     timeout : float
         Seconds of inactivity before the view stops listening (buttons go grey).
+    version : callable() -> hashable, optional
+        Cheap key for the data behind the pages. Built pages are memoized and
+        reused until this changes; without it, pages are built once per view.
+    first_embed : discord.Embed, optional
+        The embed already sent for `initial_page`, seeded into the cache.
+
+    After each page turn the neighbouring pages are built in the background,
+    so the next click is usually served from the cache.
     """
 
     def __init__(
@@ -259,16 +311,52 @@ class PaginatedView(discord.ui.View):
         initial_page: int = 1,
         author_id: int = 0,
         timeout: float = 120.0,
+        *,
+        version=None,        # Optional[Callable[[], Hashable]]
+        first_embed: Optional[discord.Embed] = None,
     ) -> None:
         super().__init__(timeout=timeout)
         self.build_page  = build_page
         self.total_pages = total_pages
         self.page        = initial_page
         self.author_id   = author_id
+        self.message: Optional[discord.Message] = None
+        self._version    = version
+        self._pages: Dict[int, Tuple[object, discord.Embed]] = {}   # page -> (version, embed)
+        self._prefetch_task: Optional[asyncio.Task] = None
         self._update_buttons()
+        if first_embed is not None:
+            self._pages[initial_page] = (self._current_version(), first_embed)
+            self._schedule_prefetch()
 
     # ── helpers ───────────────────────────────────────────────────────────────
 
+    def _current_version(self) -> object:
+        return self._version() if self._version is not None else None
+
+    async def _render(self, page: int) -> discord.Embed:
+        version = self._current_version()
+        hit = self._pages.get(page)
+        if hit is not None and hit[0] == version:
+            return hit[1]
+        embed = await self.build_page(page)
+        self._pages[page] = (version, embed)
+        return embed
+
+    async def _prefetch(self, pages: List[int]) -> None:
+        for pg in pages:
+            try:
+                await self._render(pg)
+            except Exception:
+                # Prefetch is best-effort; a real click retries and surfaces the error
+                log.debug(f"[PokéBot] page {pg} prefetch failed", exc_info=True)
+
+    def _schedule_prefetch(self) -> None:
+        if self._prefetch_task is not None and not self._prefetch_task.done():
+            self._prefetch_task.cancel()
+        near = [pg for pg in (self.page + 1, self.page - 1) if 1 <= pg <= self.total_pages]
+        self._prefetch_task = asyncio.create_task(self._prefetch(near))
+
     def _update_buttons(self) -> None:
         self.btn_first.disabled    = self.page <= 1
         self.btn_prev.disabled     = self.page <= 1
@@ -284,11 +372,15 @@ class PaginatedView(discord.ui.View):
             return
         self.page = max(1, min(new_page, self.total_pages))
         self._update_buttons()
-        embed = await self.build_page(self.page)
+        embed = await self._render(self.page)
         await interaction.response.edit_message(embed=embed, view=self)
+        self._schedule_prefetch()
 
     async def on_timeout(self) -> None:
         """Disable all buttons when the view times out."""
+        if self._prefetch_task is not None:
+            self._prefetch_task.cancel()
+        self._pages.clear()
         for item in self.children:
             item.disabled = True  # type: ignore[attr-defined]
         # message ref may not exist if the view was never attached
@@ -393,17 +485,40 @@ class PokéBot(commands.Cog):
     def __init__(self, bot: Red) -> None:
         self.bot = bot
 
-        # In-memory state
-        self._battles:      Dict[str, dict]          = {}  # battle_id  -> battle
-        self._challenges:   Dict[int, dict]           = {}  # challenged_user_id -> challenge
+        # In-memory state. Battles, challenges, trades and raids live in the session
+        # registry (indexed by user); the attributes below are read-only views of
+        # its dicts, so every change goes through the registry and keeps its index.
+        self._sessions      = SessionRegistry()
+        self._battles:      Mapping[str, dict]       = MappingProxyType(self._sessions.battles)     # battle_id  -> battle
+        self._challenges:   Mapping[int, dict]        = MappingProxyType(self._sessions.challenges)  # challenged_user_id -> challenge
         self._spawn_cache:  Dict[int, dict]           = {}  # channel_id -> spawn
-        self._spawn_tasks:  Dict[int, asyncio.Task]   = {}  # guild_id   -> loop task
-        self._flee_tasks:   Dict[int, asyncio.Task]   = {}  # channel_id -> flee timer task
         self._pending_respawn: Dict[int, discord.TextChannel] = {}  # guild_id -> channel waiting for activity
+        self._restored_respawns: Dict[int, int] = {}  # guild_id -> channel_id, from the snapshot until ready
         self._msg_counts:   Dict[int, int]            = {}  # channel_id -> message count
-        self._trades:       Dict[int, dict]           = {}  # target_user_id -> pending trade offer
-        self._raids:        Dict[int, dict]           = {}  # guild_id   -> active raid
+        self._trades:       Mapping[int, dict]        = MappingProxyType(self._sessions.trades)      # target_user_id -> pending trade offer
+        self._raids:        Mapping[int, dict]        = MappingProxyType(self._sessions.raids)       # guild_id   -> active raid
         self._raid_tasks:   Dict[int, asyncio.Task]   = {}  # guild_id   -> raid loop task
+        self._spawn_buffers: Dict[int, Deque[dict]]   = {}  # guild_id   -> pre-rolled wild Pokémon
+        self._spawn_refills: Dict[int, asyncio.Task]  = {}  # guild_id   -> buffer refill task
+
+        # Write-behind trainer cache — commands mutate the live doc and mark it
+        # dirty; _flush_players writes dirty docs back to Config in batches.
+        self._players:       Dict[Tuple[int, int], dict]  = {}  # (guild_id, member_id) -> player doc
+        self._player_seen:   Dict[Tuple[int, int], float] = {}  # (guild_id, member_id) -> last access
+        self._dirty_players: Set[Tuple[int, int]]         = set()
+        self._unexpanded:    Set[Tuple[int, int]]         = set()  # cached docs still missing species fields
+        self._flush_task:    Optional[asyncio.Task]       = None
+        self._collections:   Dict[Tuple[int, int], PlayerCollection] = {}  # uid index per cached doc
+        self._player_rev:    Dict[Tuple[int, int], int] = {}  # bumped on every save; page-cache version key
+        self._boards:        Dict[int, GuildBoard]        = {}  # guild_id -> leaderboard index
+
+        # One scheduler owns every spawn / flee / respawn / battle-timeout deadline
+        self._scheduler      = Scheduler()
+        self._scheduler_task: Optional[asyncio.Task]      = None
+        self._settings:      Dict[int, dict]              = {}  # guild_id -> SETTINGS_KEYS snapshot
+        self._encounters     = EncounterCounters()             # buffered encounter_stats deltas
+        self._battle_rng     = random.Random()                 # every PvP roll; seed it to replay battles
+        self._raid_rng       = np.random.default_rng()         # raid volley rolls
 
         self.config = Config.get_conf(self, identifier=0x504F4B45424F54, force_registration=True)
 
@@ -424,6 +539,7 @@ class PokéBot(commands.Cog):
                 "mythical_spawns": 0, "wild_catches": 0, "shiny_catches": 0,
                 "fled": 0, "raid_wins": 0, "raid_catches": 0,
             },
+            "encounter_history": {},   # "YYYY-MM-DD" (UTC) -> same counters, last 30 days
         }
         # NOTE: credits field removed — balance lives in Red's bank now.
         default_member = {
@@ -450,8 +566,12 @@ class PokéBot(commands.Cog):
         self.config.register_guild(**default_guild)
         self.config.register_member(**default_member)
 
-        cache_path = Path(__file__).parent / "data" / "pokemon_cache"
-        set_cache_dir(cache_path)
+        data_dir = Path(__file__).parent / "data"
+        self._legacy_cache_dir = data_dir / "pokemon_cache"
+        self._snapshot_path    = data_dir / "sessions.json"
+        self._schedule_path    = data_dir / "schedule.json"   # pre-snapshot layout, read once then removed
+        open_store(data_dir / "pokedata.sqlite3")
+        self._import_task: Optional[asyncio.Task] = None
 
         self._session: Optional[aiohttp.ClientSession] = None
 
@@ -459,33 +579,203 @@ class PokéBot(commands.Cog):
 
     async def cog_load(self) -> None:
         self._session = aiohttp.ClientSession()
+        await load_species_table()
+        await load_evolution_graph()
+        self._flush_task = self.bot.loop.create_task(self._player_flush_loop())
+        await self._restore_snapshot()
+        self._scheduler_task = self.bot.loop.create_task(self._scheduler_loop())
 
     async def cog_unload(self) -> None:
-        for task in self._spawn_tasks.values():
-            task.cancel()
-        for task in self._flee_tasks.values():
-            task.cancel()
+        if self._scheduler_task:
+            self._scheduler_task.cancel()
+        await self._save_snapshot()
         for task in self._raid_tasks.values():
             task.cancel()
+        for task in self._spawn_refills.values():
+            task.cancel()
+        if self._import_task and not self._import_task.done():
+            self._import_task.cancel()
+        if self._flush_task:
+            self._flush_task.cancel()
+        await self._flush_players()
+        await self._flush_encounters()
         if self._session:
             await self._session.close()
+        close_store()
 
     # ── Player helpers ────────────────────────────────────────────────────────
 
     async def _get_player(self, member: discord.Member) -> Optional[dict]:
-        data = await self.config.member(member).all()
-        if data["registeredAt"] is None:
-            return None
-        # One-time, self-healing migration: give every Pokémon a stable uid and
-        # keep the party list valid. Persists only when something actually changes.
-        changed = ensure_uids(data)
-        changed = ensure_party(data) or changed
-        if changed:
-            await self._save_player(member, data)
+        """Return the member's live player doc, loading it into the cache on first use.
+
+        The returned dict is shared: mutate it, then call _save_player to mark
+        it dirty. Nothing is written to Config until the next flush.
+        """
+        key  = (member.guild.id, member.id)
+        data = self._players.get(key)
+        if data is None:
+            loaded = await self.config.member(member).all()
+            if loaded["registeredAt"] is None:
+                return None
+            # Stored Pokémon only carry per-instance fields; rebuild the
+            # species-derived ones (name, types, sprites...) once, here.
+            stale = needs_compaction(loaded)
+            complete = await self._expand_collection(loaded)
+            # Another command may have loaded this trainer while we awaited
+            data = self._players.get(key)
+            if data is None:
+                data = self._players[key] = loaded
+                # One-time, self-healing migration: give every Pokémon a stable uid
+                # and keep the party list valid. Persisted on the next flush.
+                changed = ensure_uids(data)
+                changed = ensure_party(data) or changed
+                if changed or stale:
+                    self._dirty_players.add(key)
+                if complete:
+                    self._unexpanded.discard(key)
+                else:
+                    self._unexpanded.add(key)
+        elif key in self._unexpanded and await self._expand_collection(data):
+            # A species fetch failed on load; this access filled the gaps
+            self._unexpanded.discard(key)
+            col = self._collections.get(key)
+            if col is not None:
+                col.queries = None
+            self._player_rev[key] = self._player_rev.get(key, 0) + 1
+        self._player_seen[key] = time.monotonic()
         return data
 
+    async def _expand_collection(self, player: dict) -> bool:
+        """Fill derived fields on every Pokémon, fetching any species not yet in the table.
+
+        Returns False if a species could not be fetched and some Pokémon are
+        still missing their derived fields.
+        """
+        missing = {m.get("id") for m in player.get("pokemon", []) if not expand_pokemon(m)}
+        if not missing:
+            return True
+        results = await asyncio.gather(
+            *(fetch_pokemon(self._session, resolve_pokemon_id(species_id)) for species_id in missing),
+            return_exceptions=True,
+        )
+        for species_id, result in zip(missing, results):
+            if isinstance(result, Exception):
+                log.warning(f"[PokéBot] could not load species #{species_id} to expand a stored Pokémon")
+        complete = True
+        for m in player.get("pokemon", []):
+            complete = expand_pokemon(m) and complete
+        return complete
+
     async def _save_player(self, member: discord.Member, data: dict) -> None:
-        await self.config.member(member).set(data)
+        key = (member.guild.id, member.id)
+        self._players[key] = data
+        self._player_seen[key] = time.monotonic()
+        self._dirty_players.add(key)
+        self._player_rev[key] = self._player_rev.get(key, 0) + 1
+        col = self._collections.get(key)
+        if col is not None:
+            col.queries = None   # levels / nicknames may have changed in place
+        board = self._boards.get(member.guild.id)
+        if board is not None:
+            board.update(member.id, data)
+
+    def _player_version(self, member: discord.Member):
+        """Cheap version key for a trainer's doc — changes whenever it is saved."""
+        key = (member.guild.id, member.id)
+        return lambda: self._player_rev.get(key, 0)
+
+    def _collection(self, member: discord.Member, player: dict) -> PlayerCollection:
+        """The uid-indexed wrapper for a trainer's collection, cached with their doc."""
+        key = (member.guild.id, member.id)
+        col = self._collections.get(key)
+        if col is None or col.player is not player:
+            col = self._collections[key] = PlayerCollection(player)
+        return col
+
+    async def _get_board(self, guild: discord.Guild) -> GuildBoard:
+        """The guild's leaderboard index, built from one bulk Config read on first use."""
+        board = self._boards.get(guild.id)
+        if board is not None:
+            return board
+        stored = await self.config.all_members(guild)
+        board = self._boards.get(guild.id)
+        if board is not None:
+            return board
+        board = GuildBoard()
+        for member_id, data in stored.items():
+            if data.get("registeredAt") is None or guild.get_member(member_id) is None:
+                continue
+            # A cached doc may be newer than what was last flushed
+            board.update(member_id, self._players.get((guild.id, member_id), data))
+        for (gid, member_id), data in self._players.items():
+            if gid == guild.id and member_id not in board:
+                board.update(member_id, data)
+        self._boards[guild.id] = board
+        return board
+
+    async def _invalidate_player(self, guild_id: int, member_id: int) -> None:
+        """Flush (if dirty) and drop a cached trainer so the next read hits Config."""
+        key = (guild_id, member_id)
+        if key in self._dirty_players:
+            await self._flush_players([key])
+        self._players.pop(key, None)
+        self._player_seen.pop(key, None)
+        self._collections.pop(key, None)
+        self._player_rev[key] = self._player_rev.get(key, 0) + 1
+
+    async def _flush_players(self, keys: Optional[List[Tuple[int, int]]] = None) -> None:
+        """Write dirty trainers back to Config. Failed writes stay dirty for the next pass."""
+        if keys is None:
+            keys, self._dirty_players = list(self._dirty_players), set()
+        else:
+            self._dirty_players.difference_update(keys)
+        for key in keys:
+            data = self._players.get(key)
+            if data is None:
+                continue
+            try:
+                await self.config.member_from_ids(*key).set(compact_player(data))
+            except Exception:
+                log.exception(f"[PokéBot] failed to flush player {key}")
+                self._dirty_players.add(key)
+
+    async def _flush_encounters(self) -> None:
+        """Fold buffered encounter deltas into each guild's stats and daily history."""
+        for guild_id, (totals, daily) in self._encounters.drain().items():
+            group = self.config.guild_from_id(guild_id)
+            try:
+                async with group.encounter_stats() as stats:
+                    merge_counts(stats, totals)
+            except Exception:
+                log.exception(f"[PokéBot] failed to flush encounter stats for guild {guild_id}")
+                self._encounters.restore(guild_id, totals, daily)
+                continue
+            # Totals are committed now; a history failure must only re-queue the history
+            try:
+                async with group.encounter_history() as history:
+                    for day, counts in daily.items():
+                        merge_counts(history.setdefault(day, {}), counts)
+                    trim_history(history)
+            except Exception:
+                log.exception(f"[PokéBot] failed to flush encounter history for guild {guild_id}")
+                self._encounters.restore(guild_id, {}, daily)
+
+    async def _player_flush_loop(self) -> None:
+        while True:
+            await asyncio.sleep(PLAYER_FLUSH_INTERVAL)
+            try:
+                await self._flush_players()
+                await self._flush_encounters()
+                cutoff = time.monotonic() - PLAYER_IDLE_EVICT
+                for key, seen in list(self._player_seen.items()):
+                    if seen < cutoff and key not in self._dirty_players:
+                        self._players.pop(key, None)
+                        self._player_seen.pop(key, None)
+                        self._collections.pop(key, None)
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                log.exception("[PokéBot] player flush loop error")
 
     async def _get_shop_prices(self, guild: discord.Guild) -> dict:
         """Return the guild's current shop prices, falling back to defaults."""
@@ -530,10 +820,7 @@ class PokéBot(commands.Cog):
     # ── Battle helpers ────────────────────────────────────────────────────────
 
     def _get_battle_by_user(self, user_id: int) -> Optional[Tuple[str, dict]]:
-        for bid, battle in self._battles.items():
-            if battle["player1"]["id"] == user_id or battle["player2"]["id"] == user_id:
-                return bid, battle
-        return None
+        return self._sessions.battle_for(user_id)
 
     # ── XP helpers ───────────────────────────────────────────────────────────
 
@@ -587,55 +874,51 @@ class PokéBot(commands.Cog):
             )
         return messages
 
-    async def _fetch_evolution_target(self, pokemon: dict) -> Optional[dict]:
-        """Return {name, id, min_level} of the next evolution, or None if fully evolved / no data."""
-        try:
-            raw      = await fetch_pokemon(self._session, pokemon["name"])
-            species_url = raw["species"]["url"]
-            async with self._session.get(species_url, timeout=aiohttp.ClientTimeout(total=10)) as r:
-                r.raise_for_status()
-                species = await r.json()
-
-            chain_url = species["evolution_chain"]["url"]
-            # Check file cache first
-            cache_key = None
-            if hasattr(self, '_evo_cache'):
-                cache_key = chain_url
-                if chain_url in self._evo_cache:
-                    chain_data = self._evo_cache[chain_url]
-                else:
-                    async with self._session.get(chain_url, timeout=aiohttp.ClientTimeout(total=10)) as r:
-                        r.raise_for_status()
-                        chain_data = await r.json()
-                    self._evo_cache[chain_url] = chain_data
-            else:
-                self._evo_cache: Dict[str, dict] = {}
-                async with self._session.get(chain_url, timeout=aiohttp.ClientTimeout(total=10)) as r:
-                    r.raise_for_status()
-                    chain_data = await r.json()
-                self._evo_cache[chain_url] = chain_data
-
-            # Walk the chain looking for our Pokémon, then return its next evolution
-            def _find_next(node: dict, target_name: str) -> Optional[dict]:
-                if node["species"]["name"] == target_name:
-                    if node["evolves_to"]:
-                        nxt   = node["evolves_to"][0]
-                        deets = nxt["evolution_details"][0] if nxt["evolution_details"] else {}
-                        return {
-                            "name":      nxt["species"]["name"],
-                            "min_level": deets.get("min_level"),   # None for item/trade evos
-                        }
-                    return None  # Already fully evolved
-                for child in node["evolves_to"]:
-                    result = _find_next(child, target_name)
-                    if result is not None:
-                        return result
-                return None
+    @staticmethod
+    def _species_lookup(query: str) -> Tuple[Optional[str], Tuple[str, ...]]:
+        """Map a typed name / dex number to a PokéAPI slug via the local name index.
+
+        Returns (slug, suggestions). The slug is None when the name can't be a
+        species — only possible to say once every species name is local; until
+        then an unmatched name is passed through to PokéAPI as typed.
+        """
+        q     = query.lower().strip()
+        match = resolve_species_name(q)
+        if match.id is not None:
+            return resolve_pokemon_id(match.id), ()
+        # Form names ("charizard-mega-x") and form ids aren't indexed; let PokéAPI answer those
+        if q.isdigit() or not species_names_complete() or pokeapi.SPECIES_NAMES.has_base(q):
+            return q.replace(" ", "-"), match.suggestions
+        return None, match.suggestions
 
-            return _find_next(chain_data["chain"], pokemon["name"])
+    @staticmethod
+    def _not_found_text(query: str, suggestions: Tuple[str, ...]) -> str:
+        text = f"Couldn't find a Pokémon called **{query}**."
+        if suggestions:
+            return text + " Did you mean " + ", ".join(f"**{n.capitalize()}**" for n in suggestions) + "?"
+        return text + " Check the spelling!"
+
+    async def _fetch_evolution_target(self, pokemon: dict, into: Optional[int] = None) -> Optional[dict]:
+        """Return {name, id, min_level, trigger, options} of the next evolution, or None if fully evolved / no data.
+
+        `into` picks a branch by species id (e.g. which Eeveelution); otherwise the first
+        target is used. `options` lists every target's name. Returns None if `into` isn't one.
+        """
+        try:
+            targets = await evolution_targets(self._session, pokemon)
         except Exception as exc:
-            log.warning(f"[PokéBot] evolution fetch failed for {pokemon['name']}: {exc}")
+            log.warning(f"[PokéBot] evolution lookup failed for {pokemon['name']}: {exc}")
+            return None
+        if not targets:
+            return None  # Already fully evolved
+        chosen = next((t for t in targets if t[0] == into), None) if into is not None else targets[0]
+        if chosen is None:
             return None
+        target_id, name, min_level, trigger = chosen
+        return {
+            "id": target_id, "name": name, "min_level": min_level, "trigger": trigger,
+            "options": [t[1] for t in targets],
+        }
 
     def _evolution_eligible(self, pokemon: dict, evo_target: dict) -> bool:
         """True if the Pokémon meets the level threshold to evolve."""
@@ -702,62 +985,35 @@ class PokéBot(commands.Cog):
         embed.set_footer(text="Use `move <move_name>` to attack!")
         return embed
 
-    async def _resolve_move(
-        self, attacker: dict, defender: dict, move_name: str
-    ) -> Tuple[List[str], bool]:
-        log = []
-        try:
-            move_data = await fetch_move_data(self._session, move_name)
-        except Exception:
-            log.append(f"⚠️ {attacker['pokemon']['displayName']} tried {move_name} but it failed!")
-            return log, False
-
-        power     = move_data.get("power") or 0
-        move_type = move_data["type"]["name"]
-        accuracy  = move_data.get("accuracy") or 100
-
-        if random.random() * 100 > accuracy:
-            log.append(f"💨 {attacker['pokemon']['displayName']} used **{move_name.replace('-', ' ')}** but missed!")
-            return log, False
-
-        log.append(f"🎯 {attacker['pokemon']['displayName']} used **{move_name.replace('-', ' ')}**!")
-
-        if power == 0:
-            log.append(f"_{move_name.replace('-', ' ')} had no damage effect._")
-            return log, False
-
-        atk  = attacker["pokemon"]["stats"].get("attack") or attacker["pokemon"]["stats"].get("special-attack") or 50
-        dfs  = defender["pokemon"]["stats"].get("defense") or defender["pokemon"]["stats"].get("special-defense") or 50
-        lvl  = attacker["pokemon"]["level"]
-
-        type_eff  = calculate_type_effectiveness(move_type, defender["pokemon"]["types"])
-        stab      = 1.5 if move_type in attacker["pokemon"]["types"] else 1.0
-        rand_mult = 0.85 + random.random() * 0.15
-        critical  = 1.5 if random.random() < 0.0625 else 1.0
-
-        damage = max(1, math.floor(
-            (((2 * lvl / 5 + 2) * power * atk / dfs) / 50 + 2)
-            * stab * type_eff * rand_mult * critical
-        ))
-
-        defender["pokemon"]["stats"]["hp"] = max(0, defender["pokemon"]["stats"]["hp"] - damage)
-
-        if critical > 1:
-            log.append("⚡ A critical hit!")
-        eff_txt = effectiveness_label(type_eff)
-        if eff_txt:
-            log.append(eff_txt)
-        log.append(
-            f"💥 Dealt **{damage}** damage! "
-            f"({defender['pokemon']['displayName']} HP: "
-            f"{defender['pokemon']['stats']['hp']}/{defender['pokemon']['stats']['maxHp']})"
-        )
-
-        battle_over = defender["pokemon"]["stats"]["hp"] <= 0
-        if battle_over:
-            log.append(f"💀 {defender['pokemon']['displayName']} fainted!")
-
-        return log, battle_over
+    def _render_turn_events(self, battle: dict, events: List[TurnEvent]) -> List[str]:
+        """Battle-log lines for the engine's turn events."""
+        lines = []
+        for ev in events:
+            mon  = battle[ev.side]["pokemon"]
+            name = mon["displayName"]
+            move = ev.move.replace("-", " ")
+            if ev.kind == "failed":
+                lines.append(f"⚠️ {name} tried {ev.move} but it failed!")
+            elif ev.kind == "miss":
+                lines.append(f"💨 {name} used **{move}** but missed!")
+            elif ev.kind == "used":
+                lines.append(f"🎯 {name} used **{move}**!")
+            elif ev.kind == "no_damage":
+                lines.append(f"_{move} had no damage effect._")
+            elif ev.kind == "hit":
+                if ev.critical:
+                    lines.append("⚡ A critical hit!")
+                eff_txt = effectiveness_label(ev.effectiveness)
+                if eff_txt:
+                    lines.append(eff_txt)
+                target = battle["player2" if ev.side == "player1" else "player1"]["pokemon"]
+                lines.append(
+                    f"💥 Dealt **{ev.damage}** damage! "
+                    f"({target['displayName']} HP: {ev.hp}/{ev.max_hp})"
+                )
+            elif ev.kind == "fainted":
+                lines.append(f"💀 {name} fainted!")
+        return lines
 
     async def _process_turn(self, battle_id: str) -> Optional[Tuple[dict, List[str], Optional[dict]]]:
         battle = self._battles.get(battle_id)
@@ -767,27 +1023,22 @@ class PokéBot(commands.Cog):
         if not p1.get("moveUsed") or not p2.get("moveUsed"):
             return None
 
-        turn_log = [f"**— Turn {battle['turn']} —**"]
-
-        spd1 = p1["pokemon"]["stats"].get("speed", 50)
-        spd2 = p2["pokemon"]["stats"].get("speed", 50)
-        if spd1 >= spd2:
-            first, second = (p1, p2, p1["moveUsed"]), (p2, p1, p2["moveUsed"])
-        else:
-            first, second = (p2, p1, p2["moveUsed"]), (p1, p2, p1["moveUsed"])
+        # Resolve move data up front; the engine itself never awaits
+        chosen = {"player1": p1["moveUsed"], "player2": p2["moveUsed"]}
+        moves: Dict[str, Optional[MoveData]] = {}
+        for move_name in set(chosen.values()):
+            try:
+                moves[move_name] = MoveData.from_doc(await fetch_move_data(self._session, move_name))
+            except Exception:
+                moves[move_name] = None
 
-        log1, over1 = await self._resolve_move(first[0], first[1], first[2])
-        turn_log.extend(log1)
-        winner = None
-        if over1:
-            winner = first[0]
+        result = resolve_turn(
+            {"player1": p1["pokemon"], "player2": p2["pokemon"]}, chosen, moves, self._battle_rng,
+        )
+        turn_log = [f"**— Turn {battle['turn']} —**"] + self._render_turn_events(battle, result.events)
+        winner = battle[result.winner] if result.winner else None
+        if winner:
             battle["status"] = "finished"
-        else:
-            log2, over2 = await self._resolve_move(second[0], second[1], second[2])
-            turn_log.extend(log2)
-            if over2:
-                winner = second[0]
-                battle["status"] = "finished"
 
         battle["turn"] += 1
         now = time.time()
@@ -807,7 +1058,7 @@ class PokéBot(commands.Cog):
         channel: Optional[discord.TextChannel] = None,
     ) -> List[str]:
         """Conclude a battle. Returns list of level-up announcement strings."""
-        battle   = self._battles.pop(battle_id, None)
+        battle   = self._sessions.end_battle(battle_id)
         lvl_msgs: List[str] = []
 
         winner_member = guild.get_member(winner_id)
@@ -907,26 +1158,21 @@ class PokéBot(commands.Cog):
     # ── Spawn & Flee System ───────────────────────────────────────────────────
 
     async def _spawn_wild(self, channel: discord.TextChannel) -> None:
-        """Spawn a wild Pokémon in the channel and start a flee timer."""
+        """Spawn a wild Pokémon in the channel and schedule its flee."""
         if channel.id in self._spawn_cache:
             return
 
-        pokemon_id = get_random_pokemon_id()
-        try:
-            pokemon = await build_pokemon_instance(self._session, pokemon_id)
-        except Exception as exc:
-            log.warning(f"[PokéBot] Failed to fetch Pokémon ID {pokemon_id}: {exc}")
+        pokemon = await self._next_wild_pokemon(channel.guild)
+        if pokemon is None:
             return
 
-        stats = await self.config.guild(channel.guild).encounter_stats()
-        stats["wild_spawns"] = stats.get("wild_spawns", 0) + 1
-        if pokemon.get("shiny"):
-            stats["shiny_spawns"] = stats.get("shiny_spawns", 0) + 1
-        if pokemon.get("rarity") == "legendary":
-            stats["legendary_spawns"] = stats.get("legendary_spawns", 0) + 1
-        elif pokemon.get("rarity") == "mythical":
-            stats["mythical_spawns"] = stats.get("mythical_spawns", 0) + 1
-        await self.config.guild(channel.guild).encounter_stats.set(stats)
+        self._encounters.bump(
+            channel.guild.id,
+            wild_spawns=1,
+            shiny_spawns=int(bool(pokemon.get("shiny"))),
+            legendary_spawns=int(pokemon.get("rarity") == "legendary"),
+            mythical_spawns=int(pokemon.get("rarity") == "mythical"),
+        )
 
         spawn_id = str(uuid.uuid4())
         self._spawn_cache[channel.id] = {
@@ -948,7 +1194,7 @@ class PokéBot(commands.Cog):
         )
         if pokemon.get("spriteUrl"):
             embed.set_image(url=pokemon["spriteUrl"])
-        flee_timeout = await self.config.guild(channel.guild).flee_timeout()
+        flee_timeout = (await self._guild_settings(channel.guild.id))["flee_timeout"]
         rarity = pokemon.get("rarity", "common")
         if rarity in ("legendary", "mythical"):
             embed.description += f"\n\n🌟 **{rarity.upper()} ENCOUNTER!**"
@@ -956,23 +1202,59 @@ class PokéBot(commands.Cog):
         embed.set_footer(text=f"Use `catch <ball>` to catch it! It will flee in about {flee_minutes} minutes if ignored.")
         await channel.send(embed=embed)
 
-        # Cancel any existing flee timer for this channel then start a fresh one
-        self._cancel_flee_task(channel.id)
-        self._flee_tasks[channel.id] = self.bot.loop.create_task(
-            self._flee_timer(channel, pokemon, spawn_id, flee_timeout)
+        # Replaces any flee still pending for this channel
+        self._scheduler.schedule(
+            "flee", channel.id, time.time() + flee_timeout,
+            {"guildId": channel.guild.id, "spawnId": spawn_id},
         )
 
-    async def _flee_timer(self, channel: discord.TextChannel, pokemon: dict, spawn_id: str, flee_timeout: int = FLEE_TIMEOUT) -> None:
-        """Wait flee_timeout seconds; if the Pokémon is still uncaught, it flees and a new one spawns shortly after."""
-        await asyncio.sleep(flee_timeout)
+    async def _next_wild_pokemon(self, guild: discord.Guild) -> Optional[dict]:
+        """Pop a pre-rolled wild Pokémon for this guild and kick off a refill.
+
+        Only a cold buffer (first spawn after load, or PokéAPI down for a while)
+        falls back to building one inline.
+        """
+        buf = self._spawn_buffers.get(guild.id)
+        if buf:
+            pokemon = buf.popleft()
+        else:
+            pokemon_id = get_random_pokemon_id()
+            try:
+                pokemon = await build_pokemon_instance(self._session, pokemon_id)
+            except Exception as exc:
+                log.warning(f"[PokéBot] Failed to fetch Pokémon ID {pokemon_id}: {exc}")
+                pokemon = None
+        self._ensure_spawn_refill(guild.id)
+        return pokemon
+
+    def _ensure_spawn_refill(self, guild_id: int) -> None:
+        task = self._spawn_refills.get(guild_id)
+        if task is None or task.done():
+            self._spawn_refills[guild_id] = self.bot.loop.create_task(self._refill_spawn_buffer(guild_id))
+
+    async def _refill_spawn_buffer(self, guild_id: int) -> None:
+        """Top the guild's spawn buffer back up to SPAWN_BUFFER_SIZE, then exit."""
+        buf = self._spawn_buffers.setdefault(guild_id, deque())
+        failures = 0
+        while len(buf) < SPAWN_BUFFER_SIZE and failures < 3:
+            pokemon_id = get_random_pokemon_id()
+            try:
+                buf.append(await build_pokemon_instance(self._session, pokemon_id))
+            except asyncio.CancelledError:
+                raise
+            except Exception as exc:
+                failures += 1
+                log.warning(f"[PokéBot] Failed to pre-roll Pokémon ID {pokemon_id}: {exc}")
+                await asyncio.sleep(5)
 
+    async def _flee(self, channel: discord.TextChannel, spawn_id: str) -> None:
+        """The flee deadline passed; if this spawn is still uncaught it flees and a new one spawns on the next activity."""
         # Only flee if this exact spawn (by unique ID) is still in the cache
         cached = self._spawn_cache.get(channel.id)
         if cached and cached.get("spawnId") == spawn_id:
+            pokemon = cached["pokemon"]
             self._spawn_cache.pop(channel.id, None)
-            stats = await self.config.guild(channel.guild).encounter_stats()
-            stats["fled"] = stats.get("fled", 0) + 1
-            await self.config.guild(channel.guild).encounter_stats.set(stats)
+            self._encounters.bump(channel.guild.id, fled=1)
             try:
                 embed = discord.Embed(
                     description=(
@@ -990,72 +1272,209 @@ class PokéBot(commands.Cog):
             # Mark this guild as waiting for activity before respawning
             self._pending_respawn[channel.guild.id] = channel
 
-    def _cancel_flee_task(self, channel_id: int) -> None:
-        task = self._flee_tasks.pop(channel_id, None)
-        if task and not task.done():
-            task.cancel()
+    def _cancel_flee(self, channel_id: int) -> None:
+        self._scheduler.cancel("flee", channel_id)
 
-    async def _delayed_respawn(self, channel: discord.TextChannel) -> None:
-        """Wait a short random delay then spawn a new Pokémon after a flee."""
-        await asyncio.sleep(random.randint(10, 60))
-        await self._spawn_wild(channel)
+    def _schedule_respawn(self, channel: discord.TextChannel) -> None:
+        """Spawn a new Pokémon after a short random delay (post-catch / post-flee)."""
+        self._scheduler.schedule(
+            "respawn", channel.id, time.time() + random.randint(10, 60), {"guildId": channel.guild.id},
+        )
 
-    async def _spawn_loop(self, guild: discord.Guild) -> None:
-        log = logging.getLogger("red.pokebot")
-        await self.bot.wait_until_ready()
-        while True:
-            try:
-                interval   = await self.config.guild(guild).spawn_interval()
-                channel_id = await self.config.guild(guild).spawn_channel_id()
-                jitter     = random.randint(-60, 60)
-                await asyncio.sleep(max(60, (interval or 300) + jitter))
-                if channel_id:
-                    channel = guild.get_channel(channel_id)
-                    if channel:
-                        await self._spawn_wild(channel)
-            except asyncio.CancelledError:
+    async def _ensure_spawn_scheduled(self, guild: discord.Guild) -> None:
+        """Make sure a guild with a spawn channel has its next timed spawn queued."""
+        if ("spawn", guild.id) in self._scheduler:
+            return
+        settings = await self._guild_settings(guild.id)
+        if not settings["spawn_channel_id"]:
+            return
+        self._schedule_next_spawn(guild.id, settings)
+
+    def _schedule_next_spawn(self, guild_id: int, settings: dict) -> None:
+        jitter = random.randint(-60, 60)
+        delay  = max(60, (settings["spawn_interval"] or 300) + jitter)
+        self._scheduler.schedule("spawn", guild_id, time.time() + delay)
+        # Pre-roll while we wait so the spawn itself posts instantly
+        self._ensure_spawn_refill(guild_id)
+
+    async def _timed_spawn(self, guild: discord.Guild) -> None:
+        settings = None
+        try:
+            settings = await self._guild_settings(guild.id)
+            channel_id = settings["spawn_channel_id"]
+            if not channel_id:
                 return
-            except Exception as exc:
-                log.exception(f"[PokéBot] spawn loop error in {guild.name}: {exc}")
-                await asyncio.sleep(60)
+            channel = guild.get_channel(channel_id)
+            if channel:
+                await self._spawn_wild(channel)
+        finally:
+            # Always queue the next one so a failed spawn (or settings read) can't
+            # stop the cycle; only a guild with no spawn channel drops out.
+            if settings is None:
+                self._schedule_next_spawn(guild.id, {"spawn_interval": None})
+            elif settings["spawn_channel_id"]:
+                self._schedule_next_spawn(guild.id, settings)
+
+    # ── Scheduler ─────────────────────────────────────────────────────────────
+
+    async def _prime_spawns(self) -> None:
+        """Warm every guild's settings snapshot from one bulk read and queue their spawns."""
+        for guild_id, stored in (await self.config.all_guilds()).items():
+            self._settings.setdefault(guild_id, {k: stored[k] for k in SETTINGS_KEYS})
+        for guild in self.bot.guilds:
+            await self._ensure_spawn_scheduled(guild)
 
-    def _ensure_spawn_task(self, guild: discord.Guild) -> None:
-        task = self._spawn_tasks.get(guild.id)
-        if task is None or task.done():
-            if task is not None and task.done() and not task.cancelled():
-                # Log if the task died unexpectedly rather than being cancelled
-                exc = task.exception() if not task.cancelled() else None
-                if exc:
-                    logging.getLogger("red.pokebot").error(
-                        f"[PokéBot] spawn task for {guild.name} died: {exc} — restarting"
-                    )
-            self._spawn_tasks[guild.id] = self.bot.loop.create_task(self._spawn_loop(guild))
+    async def _scheduler_loop(self) -> None:
+        await self.bot.wait_until_ready()
+        # on_ready won't fire again after a reload, so queue spawns here too
+        await self._prime_spawns()
+        await self._resume_sessions()
+        if ("checkpoint", 0) not in self._scheduler:
+            self._scheduler.schedule("checkpoint", 0, time.time() + SCHEDULE_CHECKPOINT)
+        await self._scheduler.run(self._dispatch_scheduled)
+
+    async def _dispatch_scheduled(self, entry: dict) -> None:
+        kind, key, payload = entry["kind"], entry["key"], entry["payload"]
+        if kind == "spawn":
+            guild = self.bot.get_guild(key)
+            if guild:
+                await self._timed_spawn(guild)
+        elif kind == "flee":
+            channel = self.bot.get_channel(key)
+            if channel:
+                await self._flee(channel, payload["spawnId"])
+            else:
+                self._spawn_cache.pop(key, None)
+        elif kind == "respawn":
+            channel = self.bot.get_channel(key)
+            if channel:
+                await self._spawn_wild(channel)
+        elif kind == "battle_timeout":
+            await self._check_battle_timeout(key)
+        elif kind == "checkpoint":
+            await self._save_snapshot()
+            self._scheduler.schedule("checkpoint", 0, time.time() + SCHEDULE_CHECKPOINT)
+
+    async def _save_snapshot(self) -> None:
+        """Write pending deadlines and live sessions to disk for a warm restart."""
+        doc = pack_snapshot(
+            schedule=[e for e in self._scheduler.entries() if e["kind"] != "checkpoint"],
+            spawns=self._spawn_cache,
+            battles=self._battles,
+            raids=self._raids,
+            pending_respawn={gid: ch.id for gid, ch in self._pending_respawn.items()},
+            spawn_buffers={gid: list(buf) for gid, buf in self._spawn_buffers.items()},
+        )
+        try:
+            # Serialised here: the packed doc still shares nested state with live
+            # sessions, which the loop may change while the executor runs.
+            text = json.dumps(doc, separators=(",", ":"))
+            await self.bot.loop.run_in_executor(None, write_snapshot, self._snapshot_path, text)
+        except Exception:
+            log.exception("[PokéBot] failed to save the session snapshot")
+
+    async def _restore_snapshot(self) -> None:
+        """Reload the last snapshot: deadlines are re-armed and sessions put back.
+
+        Raids and respawns need live guild/channel objects, so they are picked
+        up by _resume_sessions once the bot is ready.
+        """
+        path = self._snapshot_path if self._snapshot_path.exists() else self._schedule_path
+        try:
+            raw = await self.bot.loop.run_in_executor(None, read_snapshot, path)
+        except Exception:
+            log.exception("[PokéBot] could not read the session snapshot")
+            return
+        if raw is None:
+            return
+        snap = unpack_snapshot(raw)
+        if path == self._schedule_path:
+            path.unlink(missing_ok=True)
+
+        for channel_id, spawn in snap["spawns"].items():
+            self._spawn_cache.setdefault(channel_id, spawn)
+        for entry in snap["schedule"]:
+            self._scheduler.schedule(entry["kind"], entry["key"], entry["when"], entry.get("payload") or {})
+        now = time.time()
+        for battle_id, battle in snap["battles"].items():
+            if battle_id in self._battles:
+                continue
+            # Downtime isn't AFK time: both players get a fresh move timer
+            battle["player1"]["lastMoveAt"] = now
+            battle["player2"]["lastMoveAt"] = now
+            self._sessions.start_battle(battle_id, battle)
+            self._scheduler.schedule(
+                "battle_timeout", battle_id, now + BATTLE_TIMEOUT,
+                {"guildId": battle["guildId"], "channelId": battle["channelId"]},
+            )
+        for guild_id, raid in snap["raids"].items():
+            if guild_id not in self._raids:
+                self._sessions.start_raid(guild_id, raid)
+        for guild_id, buf in snap["spawnBuffers"].items():
+            self._spawn_buffers.setdefault(guild_id, deque()).extend(buf[:SPAWN_BUFFER_SIZE])
+        self._restored_respawns.update(snap["pendingRespawn"])
+
+    async def _resume_sessions(self) -> None:
+        """Restart restored raids and re-attach respawn channels (needs the bot ready)."""
+        for guild_id, channel_id in list(self._restored_respawns.items()):
+            channel = self.bot.get_channel(channel_id)
+            if channel is not None:
+                self._pending_respawn.setdefault(guild_id, channel)
+        self._restored_respawns.clear()
+        for guild_id, raid in list(self._raids.items()):
+            if guild_id in self._raid_tasks and not self._raid_tasks[guild_id].done():
+                continue
+            guild   = self.bot.get_guild(guild_id)
+            channel = guild.get_channel(raid["channel_id"]) if guild else None
+            if channel is None:
+                self._sessions.end_raid(guild_id)
+                continue
+            self._raid_tasks[guild_id] = self.bot.loop.create_task(self._run_raid(guild, channel))
+
+    # ── Guild settings snapshot ───────────────────────────────────────────────
+
+    async def _guild_settings(self, guild_id: int) -> dict:
+        """Cached SETTINGS_KEYS for a guild; pokeset commands drop the cached copy."""
+        settings = self._settings.get(guild_id)
+        if settings is None:
+            stored   = await self.config.guild_from_id(guild_id).all()
+            settings = self._settings[guild_id] = {k: stored[k] for k in SETTINGS_KEYS}
+        return settings
+
+    def _invalidate_settings(self, guild_id: int) -> None:
+        self._settings.pop(guild_id, None)
 
     # ── Listeners ─────────────────────────────────────────────────────────────
 
     @commands.Cog.listener()
     async def on_guild_join(self, guild: discord.Guild) -> None:
-        self._ensure_spawn_task(guild)
+        await self._ensure_spawn_scheduled(guild)
 
     @commands.Cog.listener()
     async def on_ready(self) -> None:
-        for guild in self.bot.guilds:
-            self._ensure_spawn_task(guild)
+        await self._prime_spawns()
+
+    @commands.Cog.listener()
+    async def on_member_remove(self, member: discord.Member) -> None:
+        await self._invalidate_player(member.guild.id, member.id)
+        board = self._boards.get(member.guild.id)
+        if board is not None:
+            board.remove(member.id)
 
     @commands.Cog.listener()
     async def on_message(self, message: discord.Message) -> None:
         if message.author.bot or not message.guild:
             return
-        spawn_channel_id = await self.config.guild(message.guild).spawn_channel_id()
+        # Hot path: a dict lookup once the guild's settings snapshot is warm
+        settings = self._settings.get(message.guild.id) or await self._guild_settings(message.guild.id)
+        spawn_channel_id = settings["spawn_channel_id"]
         if not spawn_channel_id:
             return
-        # Watchdog — restart the spawn loop if it has silently died
-        self._ensure_spawn_task(message.guild)
 
         # Any message anywhere in the server triggers a pending post-flee respawn
         if message.guild.id in self._pending_respawn:
             channel = self._pending_respawn.pop(message.guild.id)
-            self.bot.loop.create_task(self._delayed_respawn(channel))
+            self._schedule_respawn(channel)
 
         # Message-count trigger only watches the spawn channel
         if message.channel.id != spawn_channel_id:
@@ -1082,7 +1501,8 @@ class PokéBot(commands.Cog):
     async def pokeset_spawnchannel(self, ctx: commands.Context, channel: discord.TextChannel) -> None:
         """Set the channel where wild Pokémon will spawn."""
         await self.config.guild(ctx.guild).spawn_channel_id.set(channel.id)
-        self._ensure_spawn_task(ctx.guild)
+        self._invalidate_settings(ctx.guild.id)
+        await self._ensure_spawn_scheduled(ctx.guild)
         await ctx.send(embed=success_embed(f"Spawn channel set to {channel.mention}!"))
 
     @pokeset.command(name="spawninterval")
@@ -1090,6 +1510,10 @@ class PokéBot(commands.Cog):
         """Set the automatic spawn interval in seconds (minimum 60)."""
         seconds = max(60, seconds)
         await self.config.guild(ctx.guild).spawn_interval.set(seconds)
+        self._invalidate_settings(ctx.guild.id)
+        # Re-queue the next timed spawn on the new interval
+        self._scheduler.cancel("spawn", ctx.guild.id)
+        await self._ensure_spawn_scheduled(ctx.guild)
         await ctx.send(embed=success_embed(f"Spawn interval set to {seconds}s."))
 
     @pokeset.command(name="fleetimeout")
@@ -1098,6 +1522,7 @@ class PokéBot(commands.Cog):
         minutes = max(5, minutes)
         seconds = minutes * 60
         await self.config.guild(ctx.guild).flee_timeout.set(seconds)
+        self._invalidate_settings(ctx.guild.id)
         await ctx.send(embed=success_embed(f"Flee timeout set to **{minutes} minutes**."))
 
     @pokeset.command(name="maxpokemon")
@@ -1105,6 +1530,7 @@ class PokéBot(commands.Cog):
         """Set the max Pokémon a trainer can hold (minimum 10, maximum 2000)."""
         limit = max(10, min(limit, 2000))
         await self.config.guild(ctx.guild).max_pokemon.set(limit)
+        self._invalidate_settings(ctx.guild.id)
         await ctx.send(embed=success_embed(f"Trainer collection limit set to **{limit} Pokémon**."))
 
     @pokeset.command(name="setprice")
@@ -1218,6 +1644,68 @@ class PokéBot(commands.Cog):
             embed.set_footer(text="Use `pokeset settmprice <slug> <price>` to change · `pokeset resettmprices` to reset all")
             await ctx.send(embed=embed)
 
+    @pokeset.command(name="importdata")
+    @commands.is_owner()
+    async def pokeset_importdata(self, ctx: commands.Context) -> None:
+        """(Owner) Download every species, move and evolution chain into the local store.
+
+        Run once after installing; spawns, battles and raids then never wait on
+        PokéAPI. Safe to re-run — already-stored entries are skipped."""
+        if self._import_task and not self._import_task.done():
+            await ctx.send(embed=error_embed("An import is already running."))
+            return
+        msg = await ctx.send(embed=discord.Embed(
+            color=COLORS["yellow"],
+            description="⏳ Importing Pokémon data from PokéAPI... this takes a few minutes.",
+        ))
+
+        async def _progress(done: int, total: int) -> None:
+            try:
+                await msg.edit(embed=discord.Embed(
+                    color=COLORS["yellow"],
+                    description=f"⏳ Importing Pokémon data... **{done}/{total}**",
+                ))
+            except discord.HTTPException:
+                pass
+
+        self._import_task = self.bot.loop.create_task(
+            import_all(self._session, self._legacy_cache_dir, _progress)
+        )
+        try:
+            result = await self._import_task
+        except Exception as exc:
+            log.exception("[PokéBot] data import failed")
+            await ctx.send(embed=error_embed(f"Import failed: {exc}"))
+            return
+        counts = await pokeapi.STORE.acounts()
+        await ctx.send(embed=success_embed(
+            f"Import complete! Fetched **{result['species']}** species, **{result['moves']}** moves"
+            f" and **{result['chains']}** evolution chains"
+            + (f" ({result['failed']} failed — re-run to retry)" if result["failed"] else "")
+            + f".\nStore now holds **{counts['species']}** species · **{counts['moves']}** moves"
+            + f" · **{counts['evolutions']}** evolution entries."
+        ))
+
+    @pokeset.command(name="datastatus")
+    async def pokeset_datastatus(self, ctx: commands.Context) -> None:
+        """Show how much Pokémon data is stored locally."""
+        counts = await pokeapi.STORE.acounts()
+        embed = discord.Embed(title="🗄️ PokéBot Data Store", color=COLORS["blue"])
+        embed.add_field(name="Species", value=f"{counts['species']}/{MAX_POKEMON}", inline=True)
+        embed.add_field(name="Moves",   value=str(counts["moves"]), inline=True)
+        embed.add_field(name="Evolutions", value=f"{counts['evolutions']}/{MAX_POKEMON}", inline=True)
+        for label, st in cache_stats().items():
+            lookups = st["hits"] + st["misses"] + st["coalesced"]
+            rate    = f"{(st['hits'] + st['coalesced']) / lookups * 100:.1f}%" if lookups else "—"
+            embed.add_field(
+                name=f"{label.capitalize()} cache",
+                value=f"{st['size']} cached · {rate} hit rate\n{st['hits']} hits · {st['misses']} misses · {st['coalesced']} shared",
+                inline=False,
+            )
+        if counts["species"] < MAX_POKEMON:
+            embed.set_footer(text="Missing entries are fetched on demand — run `pokeset importdata` to fill the store.")
+        await ctx.send(embed=embed)
+
     @commands.command(name="pokespawn")
     @checks.admin_or_permissions(manage_guild=True)
     async def pokespawn(self, ctx: commands.Context) -> None:
@@ -1230,7 +1718,7 @@ class PokéBot(commands.Cog):
         if not channel:
             await ctx.send(embed=error_embed("Spawn channel not found — it may have been deleted. Use `pokeset spawnchannel` to set a new one."))
             return
-        self._cancel_flee_task(channel.id)
+        self._cancel_flee(channel.id)
         self._spawn_cache.pop(channel.id, None)
         await self._spawn_wild(channel)
         if channel != ctx.channel:
@@ -1394,8 +1882,25 @@ class PokéBot(commands.Cog):
     # ── Pokemon list ──────────────────────────────────────────────────────────
 
     @commands.command(name="pokemon")
-    async def pokemon_list(self, ctx: commands.Context, page: int = 1, user: Optional[discord.Member] = None) -> None:
-        """View your Pokémon collection. Usage: `pokemon [page] [@user]`"""
+    async def pokemon_list(
+        self,
+        ctx: commands.Context,
+        page: Optional[int] = None,
+        user: Optional[discord.Member] = None,
+        *,
+        query: str = "",
+    ) -> None:
+        """View your Pokémon collection. Usage: `pokemon [page] [@user] [filters]`
+
+        Filters: `shiny`, `type:fire`, `name:pikachu`, `rarity:legendary`,
+        `lvl:20-40`, `evo` (ready to evolve) and `sort:level|caught|iv`
+        (`sort:-level` for ascending). e.g. `pokemon shiny type:water sort:level`
+        """
+        try:
+            q = parse_query(query)
+        except QueryError as e:
+            await ctx.send(embed=error_embed(str(e)))
+            return
         target = user or ctx.author
         player = await self._get_player(target)
         if not player:
@@ -1408,23 +1913,35 @@ class PokéBot(commands.Cog):
             return
 
         per_page = 6
-        total    = len(player["pokemon"])
-        pages    = max(1, math.ceil(total / per_page))
+        version  = self._player_version(target)
+        # Slots shown, in display order; a filtered view keeps each Pokémon's real slot number
+        shown    = _memo_by_version(version, lambda: (
+            list(range(len(player["pokemon"]))) if q.is_empty
+            else run_query(self._collection(target, player), q)
+        ))
+        if not shown():
+            await ctx.send(embed=error_embed(f"No Pokémon match `{query}`."))
+            return
+        pages    = max(1, math.ceil(len(shown()) / per_page))
 
         def build_embed(pg: int) -> discord.Embed:
+            slots  = shown()
+            total  = len(player["pokemon"])
+            title  = (
+                f"{target.display_name}'s Pokémon ({total} total)" if q.is_empty
+                else f"{target.display_name}'s Pokémon ({len(slots)} of {total} · {query})"
+            )
             pg     = max(1, min(pg, pages))
             offset = (pg - 1) * per_page
-            chunk  = player["pokemon"][offset: offset + per_page]
-            embed  = discord.Embed(
-                title=f"{target.display_name}'s Pokémon ({total} total)",
-                color=COLORS["blue"],
-            )
+            chunk  = [i for i in slots[offset: offset + per_page] if i < total]
+            embed  = discord.Embed(title=title, color=COLORS["blue"])
             embed.set_footer(
                 text=f"Page {pg}/{pages} · Active: #{player['activePokemonIndex'] + 1}"
             )
-            for i, p in enumerate(chunk):
-                idx     = offset + i + 1
-                active  = " ⬅ Active" if idx - 1 == player["activePokemonIndex"] else ""
+            for slot in chunk:
+                p       = player["pokemon"][slot]
+                idx     = slot + 1
+                active  = " ⬅ Active" if slot == player["activePokemonIndex"] else ""
                 shiny   = " ✨" if p.get("shiny") else ""
                 nick    = f' "{p["nickname"]}"' if p.get("nickname") else ""
                 xp_cur  = p.get("xp", 0)
@@ -1442,7 +1959,7 @@ class PokéBot(commands.Cog):
                 )
             return embed
 
-        page  = max(1, min(page, pages))
+        page  = max(1, min(page or 1, pages))
         embed = build_embed(page)
 
         if pages == 1:
@@ -1452,7 +1969,7 @@ class PokéBot(commands.Cog):
         async def async_build(pg: int) -> discord.Embed:
             return build_embed(pg)
 
-        view = PaginatedView(async_build, pages, page, ctx.author.id)
+        view = PaginatedView(async_build, pages, page, ctx.author.id, version=version, first_embed=embed)
         view.message = await ctx.send(embed=embed, view=view)
 
     # ── Active ────────────────────────────────────────────────────────────────
@@ -1483,7 +2000,7 @@ class PokéBot(commands.Cog):
             ))
             return
         player["activePokemonIndex"] = idx
-        ensure_party(player)  # lead becomes party[0] (added to the party if absent)
+        ensure_party(player, self._collection(ctx.author, player))  # lead becomes party[0] (added to the party if absent)
         await self._save_player(ctx.author, player)
         embed = pokemon_embed(poke, f"✅ Switched to {poke['displayName']}!", show_xp=True)
         await ctx.send(embed=embed)
@@ -1509,7 +2026,7 @@ class PokéBot(commands.Cog):
             await ctx.send(embed=error_embed(msg))
             return
 
-        mons = party_mons(player)
+        mons = party_mons(player, self._collection(target, player))
         lines = []
         for i, p in enumerate(mons):
             lead   = " 👑 **Lead**" if i == 0 else ""
@@ -1557,7 +2074,7 @@ class PokéBot(commands.Cog):
             ))
             return
         party.append(mon["uid"])
-        ensure_party(player)
+        ensure_party(player, self._collection(ctx.author, player))
         await self._save_player(ctx.author, player)
         await ctx.send(embed=success_embed(
             f"Added **{mon['displayName']}** to your party! ({len(player['party'])}/6)"
@@ -1570,7 +2087,7 @@ class PokéBot(commands.Cog):
         if not player:
             await ctx.send(embed=error_embed("Start your journey with `start`!"))
             return
-        mons = party_mons(player)
+        mons = party_mons(player, self._collection(ctx.author, player))
         pos = position - 1
         if pos < 0 or pos >= len(mons):
             await ctx.send(embed=error_embed(f"Invalid position. Your party has {len(mons)} Pokémon."))
@@ -1586,7 +2103,7 @@ class PokéBot(commands.Cog):
             return
         removed = mons[pos]
         player["party"].remove(removed["uid"])
-        ensure_party(player)
+        ensure_party(player, self._collection(ctx.author, player))
         await self._save_player(ctx.author, player)
         await ctx.send(embed=success_embed(
             f"Removed **{removed['displayName']}** from your party. ({len(player['party'])}/6)"
@@ -1601,7 +2118,7 @@ class PokéBot(commands.Cog):
         if not player:
             await ctx.send(embed=error_embed("Start your journey with `start`!"))
             return
-        mons = party_mons(player)
+        mons = party_mons(player, self._collection(ctx.author, player))
         a, b = position - 1, new_position - 1
         if a < 0 or a >= len(mons) or b < 0 or b >= len(mons):
             await ctx.send(embed=error_embed(f"Positions must be between 1 and {len(mons)}."))
@@ -1611,10 +2128,11 @@ class PokéBot(commands.Cog):
         party.insert(b, uid)
         # If position 1 changed, the lead changed — sync activePokemonIndex to match
         new_lead_uid = party[0]
-        player["activePokemonIndex"] = uid_index(player, new_lead_uid)
-        ensure_party(player)
+        col = self._collection(ctx.author, player)
+        player["activePokemonIndex"] = uid_index(player, new_lead_uid, col)
+        ensure_party(player, col)
         await self._save_player(ctx.author, player)
-        new_mons = party_mons(player)
+        new_mons = party_mons(player, col)
         order = " → ".join(f"{p['displayName']}" for p in new_mons)
         await ctx.send(embed=success_embed(f"Party reordered!\n**Lineup:** {order}"))
 
@@ -1629,7 +2147,7 @@ class PokéBot(commands.Cog):
         if not (0 <= lead_idx < len(player["pokemon"])):
             lead_idx = 0
         player["party"] = [player["pokemon"][lead_idx]["uid"]]
-        ensure_party(player)
+        ensure_party(player, self._collection(ctx.author, player))
         await self._save_player(ctx.author, player)
         await ctx.send(embed=success_embed("Party cleared — only your lead Pokémon remains."))
 
@@ -1656,8 +2174,10 @@ class PokéBot(commands.Cog):
     # ── Evolve ────────────────────────────────────────────────────────────────
 
     @commands.command(name="evolve")
-    async def evolve(self, ctx: commands.Context, slot: int = 0) -> None:
-        """Evolve a Pokémon when it's ready. Usage: `evolve [slot]` (defaults to active)."""
+    async def evolve(self, ctx: commands.Context, slot: Optional[int] = None, *, into: str = "") -> None:
+        """Evolve a Pokémon when it's ready. Usage: `evolve [slot] [into]` (defaults to active).
+
+        For branching evolutions, name the form you want, e.g. `evolve 3 vaporeon`."""
         player = await self._get_player(ctx.author)
         if not player:
             await ctx.send(embed=error_embed("Start your journey with `start`!"))
@@ -1666,7 +2186,7 @@ class PokéBot(commands.Cog):
             await ctx.send(embed=error_embed("You can't evolve Pokémon during a battle!"))
             return
 
-        idx = (slot - 1) if slot > 0 else player["activePokemonIndex"]
+        idx = (slot - 1) if slot else player["activePokemonIndex"]
         if idx < 0 or idx >= len(player["pokemon"]):
             await ctx.send(embed=error_embed(
                 f"Invalid slot. You have {len(player['pokemon'])} Pokémon (slots 1–{len(player['pokemon'])})."
@@ -1675,9 +2195,25 @@ class PokéBot(commands.Cog):
 
         poke = player["pokemon"][idx]
 
+        into_id = None
+        if into.strip():
+            match = resolve_species_name(into)
+            if match.id is None:
+                await ctx.send(embed=error_embed(self._not_found_text(into, match.suggestions)))
+                return
+            into_id = match.id
+
         async with ctx.typing():
-            evo = await self._fetch_evolution_target(poke)
+            evo = await self._fetch_evolution_target(poke, into_id)
 
+        if evo is None and into_id is not None:
+            first = await self._fetch_evolution_target(poke)
+            options = ", ".join(f"**{n.capitalize()}**" for n in first["options"]) if first else ""
+            await ctx.send(embed=error_embed(
+                f"**{poke['displayName']}** can't evolve into **{into.strip().capitalize()}**."
+                + (f" Options: {options}." if options else "")
+            ))
+            return
         if evo is None:
             await ctx.send(embed=error_embed(
                 f"**{poke['displayName']}** is fully evolved — there's nowhere left to go!"
@@ -1699,6 +2235,9 @@ class PokéBot(commands.Cog):
             f"• Nickname **{poke['nickname']}** will be kept\n"
             if poke.get("nickname") else ""
         )
+        others = [n.capitalize() for n in evo["options"] if n != evo["name"]]
+        if others:
+            nick_line += f"• Can also become {', '.join(others)} — `evolve {idx + 1} <name>`\n"
         confirm_embed = discord.Embed(
             title=f"✨ Evolve {poke['displayName']} → {evo_name}?",
             description=(
@@ -1737,7 +2276,7 @@ class PokéBot(commands.Cog):
         # ── Perform the evolution ─────────────────────────────────────────────
         async with ctx.typing():
             try:
-                new_raw = await fetch_pokemon(self._session, evo["name"])
+                new_raw = await fetch_pokemon(self._session, evo["id"])
             except Exception:
                 await ctx.send(embed=error_embed(
                     f"Couldn't fetch data for **{evo_name}** right now. Try again in a moment!"
@@ -1774,8 +2313,11 @@ class PokéBot(commands.Cog):
         poke["displayName"] = new_raw["name"].capitalize()
         poke["id"]          = new_raw["id"]
         poke["types"]       = new_types
+        poke["typeIds"]     = type_ids(new_types)
         poke["stats"]       = new_stats
         poke["spriteUrl"]   = new_sprite
+        poke["shinySpriteUrl"] = new_raw["sprites"].get("front_shiny") or new_raw["sprites"]["front_default"]
+        poke["rarity"]      = pokemon_rarity(new_raw["id"])
         poke["evoNotified"] = False   # reset so next-stage evo can notify
 
         # Register evolved form in dex
@@ -1864,13 +2406,16 @@ class PokéBot(commands.Cog):
             tokens = tokens[1:]
         lookup = " ".join(tokens).strip() or q  # fall back to raw query if only "shiny" given
 
+        slug, suggestions = self._species_lookup(lookup)
+        if slug is None:
+            await ctx.send(embed=error_embed(self._not_found_text(lookup, suggestions)))
+            return
+
         async with ctx.typing():
             try:
-                raw = await fetch_pokemon(self._session, lookup.lower().strip())
+                raw = await fetch_pokemon(self._session, slug)
             except Exception:
-                await ctx.send(embed=error_embed(
-                    f"Couldn't find a Pokémon called **{lookup}**. Check the spelling!"
-                ))
+                await ctx.send(embed=error_embed(self._not_found_text(lookup, suggestions)))
                 return
 
         sprites   = raw["sprites"]
@@ -1931,7 +2476,7 @@ class PokéBot(commands.Cog):
             return
 
         # Check collection cap before consuming the ball
-        max_pokemon = await self.config.guild(ctx.guild).max_pokemon()
+        max_pokemon = (await self._guild_settings(ctx.guild.id))["max_pokemon"]
         if len(player["pokemon"]) >= max_pokemon:
             await ctx.send(embed=error_embed(
                 f"Your collection is full! (**{len(player['pokemon'])}/{max_pokemon}** Pokémon)\n"
@@ -2016,21 +2561,19 @@ class PokéBot(commands.Cog):
         lvl_msgs = self._check_level_up(active_poke)
 
         if caught:
-            stats = await self.config.guild(ctx.guild).encounter_stats()
-            stats["wild_catches"] = stats.get("wild_catches", 0) + 1
-            if pokemon.get("shiny"):
-                stats["shiny_catches"] = stats.get("shiny_catches", 0) + 1
-            await self.config.guild(ctx.guild).encounter_stats.set(stats)
-            # Pokémon caught — cancel flee timer and remove from spawn cache
-            self._cancel_flee_task(ctx.channel.id)
+            self._encounters.bump(
+                ctx.guild.id, wild_catches=1, shiny_catches=int(bool(pokemon.get("shiny"))),
+            )
+            # Pokémon caught — cancel its flee and remove from spawn cache
+            self._cancel_flee(ctx.channel.id)
             self._spawn_cache.pop(ctx.channel.id, None)
             # Schedule a fresh spawn after a short delay so the channel never goes dead
-            self.bot.loop.create_task(self._delayed_respawn(ctx.channel))
+            self._schedule_respawn(ctx.channel)
 
             base_credits   = 500 if pokemon.get("shiny") else (100 if pokemon["level"] >= 30 else 50)
             credits_earned = base_credits * berry_effect["credit_mult"]
             is_new_dex     = self._update_dex(player, pokemon)
-            player["pokemon"].append({**pokemon, "caughtAt": time.time()})
+            self._collection(ctx.author, player).add({**pokemon, "caughtAt": time.time()})
             await self._save_player(ctx.author, player)
             await _deposit(ctx.author, credits_earned)
 
@@ -2092,8 +2635,11 @@ class PokéBot(commands.Cog):
     # ── Release ───────────────────────────────────────────────────────────────
 
     @commands.command(name="release")
-    async def release(self, ctx: commands.Context, slot: int) -> None:
-        """Release a Pokémon from your collection for a reward. Usage: `release <slot>`"""
+    async def release(self, ctx: commands.Context, *, slot: str) -> None:
+        """Release a Pokémon from your collection for a reward. Usage: `release <slot|filters>`
+
+        Filters (see `pokemon`) must match exactly one Pokémon, e.g. `release name:rattata lvl:3`.
+        """
         player = await self._get_player(ctx.author)
         if not player:
             await ctx.send(embed=error_embed("Start your journey with `start`!"))
@@ -2102,12 +2648,11 @@ class PokéBot(commands.Cog):
             await ctx.send(embed=error_embed("You can't release Pokémon during a battle!"))
             return
 
-        idx = slot - 1
-        if idx < 0 or idx >= len(player["pokemon"]):
-            await ctx.send(embed=error_embed(
-                f"Invalid slot. You have {len(player['pokemon'])} Pokémon "
-                f"(slots 1\u2013{len(player['pokemon'])})."
-            ))
+        col = self._collection(ctx.author, player)
+        try:
+            idx = select_slot(col, slot)
+        except QueryError as e:
+            await ctx.send(embed=error_embed(str(e)))
             return
         if len(player["pokemon"]) <= 1:
             await ctx.send(embed=error_embed("You can't release your last Pokémon!"))
@@ -2171,14 +2716,18 @@ class PokéBot(commands.Cog):
             ))
             return
 
-        # Apply rewards and remove the Pokémon
-        player["pokemon"].pop(idx)
+        # Apply rewards and remove the Pokémon — re-resolved by uid, the list may have moved during the prompt
+        idx = col.index_of(poke.get("uid"))
+        if idx < 0 or len(player["pokemon"]) <= 1:
+            await ctx.send(embed=error_embed("That Pokémon is no longer in your collection."))
+            return
+        col.remove_at(idx)
 
         # Fix active index if it now points past the end or at the released slot
         active = player["activePokemonIndex"]
         if active >= len(player["pokemon"]) or active == idx:
             player["activePokemonIndex"] = 0
-        ensure_party(player)  # drop the released Pokémon's uid from the party
+        ensure_party(player, col)  # drop the released Pokémon's uid from the party
 
         items = player.setdefault("items", {"pokeball": 0, "greatball": 0, "ultraball": 0, "healing": {}})
         items[ball_reward] = items.get(ball_reward, 0) + ball_qty
@@ -2308,7 +2857,7 @@ class PokéBot(commands.Cog):
             return build_shop_embed(pg)
 
         embed = build_shop_embed(1)
-        view  = PaginatedView(async_shop_build, total_pages, 1, ctx.author.id)
+        view  = PaginatedView(async_shop_build, total_pages, 1, ctx.author.id, first_embed=embed)
         view.message = await ctx.send(embed=embed, view=view)
 
     # ── Buy ───────────────────────────────────────────────────────────────────
@@ -2454,12 +3003,12 @@ class PokéBot(commands.Cog):
             await ctx.send(embed=error_embed(f"{opponent.display_name} is already in a battle!"))
             return
 
-        self._challenges[opponent.id] = {
+        self._sessions.add_challenge(opponent.id, {
             "challengerId":   ctx.author.id,
             "challengerName": ctx.author.display_name,
             "channelId":      ctx.channel.id,
             "expires":        time.time() + 60,
-        }
+        })
 
         challenger_poke = player["pokemon"][player["activePokemonIndex"]]
         opp_poke        = opp_data["pokemon"][opp_data["activePokemonIndex"]]
@@ -2497,11 +3046,11 @@ class PokéBot(commands.Cog):
         try:
             msg = await self.bot.wait_for("message", check=check, timeout=60.0)
         except asyncio.TimeoutError:
-            self._challenges.pop(opponent.id, None)
+            self._sessions.pop_challenge(opponent.id)
             await ctx.send(embed=error_embed(f"{opponent.display_name} didn't respond in time. Challenge expired."))
             return
 
-        challenge = self._challenges.pop(opponent.id, None)
+        challenge = self._sessions.pop_challenge(opponent.id)
         if not challenge or time.time() > challenge["expires"]:
             await ctx.send(embed=error_embed("Challenge expired."))
             return
@@ -2528,10 +3077,13 @@ class PokéBot(commands.Cog):
             "guildId":   ctx.guild.id,
             "channelId": ctx.channel.id,
         }
-        self._battles[battle_id] = battle
+        self._sessions.start_battle(battle_id, battle)
 
-        # Start the AFK timeout watcher
-        self.bot.loop.create_task(self._battle_timeout_watcher(ctx.guild, battle_id, ctx.channel))
+        # Queue the AFK check
+        self._scheduler.schedule(
+            "battle_timeout", battle_id, time.time() + BATTLE_TIMEOUT,
+            {"guildId": ctx.guild.id, "channelId": ctx.channel.id},
+        )
 
         embed  = self._build_battle_embed(battle, ["The battle begins! Both trainers, use `move <move_name>` to fight!"])
         moves1 = " · ".join(m.replace("-", " ").capitalize() for m in p1_pokemon["moves"])
@@ -2544,43 +3096,49 @@ class PokéBot(commands.Cog):
             embed=embed,
         )
 
-    async def _battle_timeout_watcher(
-        self, guild: discord.Guild, battle_id: str, channel: discord.TextChannel
-    ) -> None:
-        """Periodically check if a battle has gone AFK and auto-forfeit if so."""
-        while True:
-            await asyncio.sleep(60)  # Check every minute
-            battle = self._battles.get(battle_id)
-            if not battle or battle["status"] != "active":
-                return
+    async def _check_battle_timeout(self, battle_id: str) -> None:
+        """Auto-forfeit a battle whose waiting player went AFK, else re-queue the next check."""
+        battle = self._battles.get(battle_id)
+        if not battle or battle["status"] != "active":
+            return
+        guild   = self.bot.get_guild(battle["guildId"])
+        channel = guild.get_channel(battle["channelId"]) if guild else None
+        if channel is None:
+            return
+
+        now  = time.time()
+        p1   = battle["player1"]
+        p2   = battle["player2"]
+        # Check whichever player has been idle longest
+        afk  = None
+        other = None
+        if not p1["moveUsed"] and (now - p1["lastMoveAt"]) >= BATTLE_TIMEOUT:
+            afk, other = p1, p2
+        elif not p2["moveUsed"] and (now - p2["lastMoveAt"]) >= BATTLE_TIMEOUT:
+            afk, other = p2, p1
+
+        if not afk:
+            waiting = [p["lastMoveAt"] + BATTLE_TIMEOUT for p in (p1, p2) if not p["moveUsed"]]
+            self._scheduler.schedule(
+                "battle_timeout", battle_id, min(waiting) if waiting else now + 60,
+                {"guildId": guild.id, "channelId": channel.id},
+            )
+            return
 
-            now  = time.time()
-            p1   = battle["player1"]
-            p2   = battle["player2"]
-            # Check whichever player has been idle longest
-            afk  = None
-            other = None
-            if not p1["moveUsed"] and (now - p1["lastMoveAt"]) >= BATTLE_TIMEOUT:
-                afk, other = p1, p2
-            elif not p2["moveUsed"] and (now - p2["lastMoveAt"]) >= BATTLE_TIMEOUT:
-                afk, other = p2, p1
-
-            if afk:
-                battle["status"] = "finished"
-                await self._end_battle(guild, battle_id, other["id"], afk["id"], channel)
-                try:
-                    embed = discord.Embed(
-                        title="⏰ Battle Timeout!",
-                        description=(
-                            f"**{afk['username']}** took too long to respond and forfeited!\n"
-                            f"**{other['username']}** wins by default and receives 100 {await _currency_name(guild)}."
-                        ),
-                        color=COLORS["orange"],
-                    )
-                    await channel.send(embed=embed)
-                except discord.HTTPException:
-                    pass
-                return
+        battle["status"] = "finished"
+        await self._end_battle(guild, battle_id, other["id"], afk["id"], channel)
+        try:
+            embed = discord.Embed(
+                title="⏰ Battle Timeout!",
+                description=(
+                    f"**{afk['username']}** took too long to respond and forfeited!\n"
+                    f"**{other['username']}** wins by default and receives 100 {await _currency_name(guild)}."
+                ),
+                color=COLORS["orange"],
+            )
+            await channel.send(embed=embed)
+        except discord.HTTPException:
+            pass
 
     # ── Move ──────────────────────────────────────────────────────────────────
 
@@ -2634,7 +3192,7 @@ class PokéBot(commands.Cog):
                     "Something went wrong processing this turn. "
                     "The battle has been cancelled — please start a new one."
                 ))
-                self._battles.pop(battle_id, None)
+                self._sessions.end_battle(battle_id)
                 return
 
             updated_battle, turn_log, winner = turn_result
@@ -2678,30 +3236,26 @@ class PokéBot(commands.Cog):
             await ctx.send(embed=error_embed(msg))
             return
 
-        caught_ids   = set(player.get("caughtDex", []))
-        total_caught = len(caught_ids)
-        completion   = (total_caught / MAX_POKEMON) * 100
-
-        if not caught_ids:
+        if not player.get("caughtDex"):
             await ctx.send(embed=discord.Embed(
                 color=COLORS["orange"],
                 description="📭 No Pokémon in your Pokédex yet!\nHead out and start catching to fill it up.",
             ))
             return
 
-        seen: Dict[int, str] = {}
-        for pk in player["pokemon"]:
-            if pk["id"] in caught_ids and pk["id"] not in seen:
-                seen[pk["id"]] = pk["displayName"]
-
-        all_entries = [(pid, seen.get(pid, f"#{pid}")) for pid in sorted(caught_ids)]
+        version     = self._player_version(target)
+        dex_entries = _memo_by_version(version, lambda: _dex_entries(player))
         per_page    = 30
-        total_pages = max(1, math.ceil(total_caught / per_page))
-        remaining   = MAX_POKEMON - total_caught
-        rank_label, rank_color = _dex_rank(total_caught)
-        prog_bar  = _dex_progress_bar(total_caught, MAX_POKEMON, length=20)
+        total_pages = max(1, math.ceil(len(dex_entries()) / per_page))
 
         def build_dex_embed(pg: int) -> discord.Embed:
+            all_entries  = dex_entries()
+            total_caught = len(all_entries)
+            completion   = (total_caught / MAX_POKEMON) * 100
+            remaining    = MAX_POKEMON - total_caught
+            rank_label, rank_color = _dex_rank(total_caught)
+            prog_bar = _dex_progress_bar(total_caught, MAX_POKEMON, length=20)
+
             pg     = max(1, min(pg, total_pages))
             offset = (pg - 1) * per_page
             chunk  = all_entries[offset:offset + per_page]
@@ -2744,7 +3298,9 @@ class PokéBot(commands.Cog):
             await ctx.send(embed=embed)
             return
 
-        view = PaginatedView(async_dex_build, total_pages, page, ctx.author.id)
+        view = PaginatedView(
+            async_dex_build, total_pages, page, ctx.author.id, version=version, first_embed=embed,
+        )
         view.message = await ctx.send(embed=embed, view=view)
 
     @commands.command(name="dexpage", aliases=["dp"])
@@ -2756,29 +3312,26 @@ class PokéBot(commands.Cog):
             await ctx.send(embed=error_embed("That trainer hasn't started yet!"))
             return
 
-        caught_ids   = set(player.get("caughtDex", []))
-        total_caught = len(caught_ids)
-        if not caught_ids:
+        if not player.get("caughtDex"):
             await ctx.send(embed=discord.Embed(
                 color=COLORS["orange"],
                 description="📭 No Pokémon in your Pokédex yet — go catch some!",
             ))
             return
 
-        seen: Dict[int, str] = {}
-        for pk in player["pokemon"]:
-            if pk["id"] in caught_ids:
-                seen[pk["id"]] = pk["displayName"]
-
-        all_entries = [(pid, seen.get(pid, f"#{pid}")) for pid in sorted(caught_ids)]
+        version     = self._player_version(target)
+        dex_entries = _memo_by_version(version, lambda: _dex_entries(player))
         per_page    = 30
-        total_pages = max(1, math.ceil(total_caught / per_page))
-        remaining   = MAX_POKEMON - total_caught
-        completion  = (total_caught / MAX_POKEMON) * 100
-        rank_label, rank_color = _dex_rank(total_caught)
-        prog_bar = _dex_progress_bar(total_caught, MAX_POKEMON, length=20)
+        total_pages = max(1, math.ceil(len(dex_entries()) / per_page))
 
         def build_dp_embed(pg: int) -> discord.Embed:
+            all_entries  = dex_entries()
+            total_caught = len(all_entries)
+            remaining    = MAX_POKEMON - total_caught
+            completion   = (total_caught / MAX_POKEMON) * 100
+            rank_label, rank_color = _dex_rank(total_caught)
+            prog_bar = _dex_progress_bar(total_caught, MAX_POKEMON, length=20)
+
             pg     = max(1, min(pg, total_pages))
             offset = (pg - 1) * per_page
             chunk  = all_entries[offset:offset + per_page]
@@ -2808,72 +3361,61 @@ class PokéBot(commands.Cog):
             await ctx.send(embed=embed)
             return
 
-        view = PaginatedView(async_dp_build, total_pages, page, ctx.author.id)
+        view = PaginatedView(
+            async_dp_build, total_pages, page, ctx.author.id, version=version, first_embed=embed,
+        )
         view.message = await ctx.send(embed=embed, view=view)
 
         # ── Leaderboard ───────────────────────────────────────────────────────────
 
     @commands.command(name="pokeboard", aliases=["pb"])
     async def leaderboard(self, ctx: commands.Context, category: str = "wins") -> None:
-        """View the server leaderboard. Categories: wins, caught, shinies, balance"""
+        """View the server leaderboard. Categories: wins, caught, shinies, dex, balance"""
         category = category.lower()
         # Swap "credits" alias to "balance" for clarity with bank integration
         if category == "credits":
             category = "balance"
-        valid = {"wins", "caught", "shinies", "balance"}
+        valid = {"wins", "caught", "shinies", "dex", "balance"}
         if category not in valid:
             await ctx.send(embed=error_embed(f"Valid categories: {', '.join(valid)}"))
             return
 
-        entries = []
-        for member in ctx.guild.members:
-            if member.bot:
-                continue
-            p = await self._get_player(member)
-            if p:
-                entries.append((member, p))
-
+        board    = await self._get_board(ctx.guild)
         currency = await _currency_name(ctx.guild)
 
-        # For balance we need an async lookup; build the map first
-        balance_map: Dict[int, int] = {}
-        if category == "balance":
-            for member, _ in entries:
-                balance_map[member.id] = await _get_balance(member)
-
-        # Per-category config: (sort_key, title, value_formatter)
+        # Per-category config: (title, value_formatter)
         BOARD_CONFIG = {
-            "wins":    (
-                lambda x: x[1].get("wins", 0),
-                "🏆 Battle Leaderboard",
-                lambda m, p: f"{p.get('wins', 0)} wins",
-            ),
-            "caught":  (
-                lambda x: len(x[1]["pokemon"]),
-                "📦 Most Pokémon Caught",
-                lambda m, p: f"{len(p['pokemon'])} Pokémon",
-            ),
-            "shinies": (
-                lambda x: sum(1 for pk in x[1]["pokemon"] if pk.get("shiny")),
-                "✨ Shiny Hunters",
-                lambda m, p: f"{sum(1 for pk in p['pokemon'] if pk.get('shiny'))} shinies",
-            ),
-            "balance": (
-                lambda x: balance_map.get(x[0].id, 0),
-                "💰 Richest Trainers",
-                lambda m, p: f"{balance_map.get(m.id, 0)} {currency}",
-            ),
+            "wins":    ("🏆 Battle Leaderboard",   lambda v: f"{v} wins"),
+            "caught":  ("📦 Most Pokémon Caught",  lambda v: f"{v} Pokémon"),
+            "shinies": ("✨ Shiny Hunters",         lambda v: f"{v} shinies"),
+            "dex":     ("📖 Pokédex Completion",    lambda v: f"{v}/{MAX_POKEMON} species"),
+            "balance": ("💰 Richest Trainers",      lambda v: f"{v} {currency}"),
         }
+        title, get_val = BOARD_CONFIG[category]
 
-        sort_key, title, get_val = BOARD_CONFIG[category]
-        entries.sort(key=sort_key, reverse=True)
+        if category == "balance":
+            # Balances live in Red's bank, so only this category needs a per-trainer read
+            ranked: List[Tuple[int, int]] = []
+            for member_id in board.members():
+                member = ctx.guild.get_member(member_id)
+                if member:
+                    ranked.append((member_id, await _get_balance(member)))
+            ranked.sort(key=lambda x: x[1], reverse=True)
+            top = ranked[:10]
+            caller_rank = next((i for i, (mid, _) in enumerate(ranked) if mid == ctx.author.id), None)
+            caller_val  = ranked[caller_rank][1] if caller_rank is not None else 0
+        else:
+            top         = board.top(category, 10)
+            caller_rank = board.rank(category, ctx.author.id)
+            caller_val  = board.value(category, ctx.author.id)
 
         medals = ["🥇", "🥈", "🥉"]
-        top10  = entries[:10]
-        lines  = [
-            f"{medals[i] if i < 3 else f'**{i+1}.**'} **{m.display_name}** — {get_val(m, p)}"
-            for i, (m, p) in enumerate(top10)
-        ] or ["_No trainers yet! Be the first with `start`._"]
+        lines  = []
+        for i, (member_id, value) in enumerate(top):
+            member = ctx.guild.get_member(member_id)
+            name   = member.display_name if member else f"User {member_id}"
+            lines.append(f"{medals[i] if i < 3 else f'**{i+1}.**'} **{name}** — {get_val(value)}")
+        lines = lines or ["_No trainers yet! Be the first with `start`._"]
 
         embed = discord.Embed(
             title=title,
@@ -2882,10 +3424,8 @@ class PokéBot(commands.Cog):
         )
         embed.timestamp = datetime.now(tz=timezone.utc)
 
-        caller_rank = next((i for i, (m, _) in enumerate(entries) if m == ctx.author), -1)
-        if caller_rank >= 10:
-            _, caller_p = entries[caller_rank]
-            embed.set_footer(text=f"Your rank: #{caller_rank + 1} — {get_val(ctx.author, caller_p)}")
+        if caller_rank is not None and caller_rank >= 10:
+            embed.set_footer(text=f"Your rank: #{caller_rank + 1} — {get_val(caller_val)}")
 
         await ctx.send(embed=embed)
 
@@ -2894,7 +3434,13 @@ class PokéBot(commands.Cog):
     @commands.command(name="pokestats")
     async def pokestats(self, ctx: commands.Context) -> None:
         """Show server-wide encounter and rarity statistics."""
-        st = await self.config.guild(ctx.guild).encounter_stats()
+        st      = await self.config.guild(ctx.guild).encounter_stats()
+        history = await self.config.guild(ctx.guild).encounter_history()
+        # Include deltas still waiting for the next flush
+        pending, pending_daily = self._encounters.pending(ctx.guild.id)
+        merge_counts(st, pending)
+        for day, counts in pending_daily.items():
+            merge_counts(history.setdefault(day, {}), counts)
         spawns = st.get("wild_spawns", 0)
         shiny = st.get("shiny_spawns", 0)
         rate = f"1 in {spawns / shiny:.1f}" if shiny else "No recorded shinies yet"
@@ -2907,6 +3453,26 @@ class PokéBot(commands.Cog):
         embed.add_field(name="Mythical spawns", value=f"{st.get('mythical_spawns', 0):,}", inline=True)
         embed.add_field(name="Raid wins", value=f"{st.get('raid_wins', 0):,}", inline=True)
         embed.add_field(name="Raid catches", value=f"{st.get('raid_catches', 0):,}", inline=True)
+
+        today = history.get(day_key(), {})
+        week  = [history.get(day_key(time.time() - d * 86400), {}) for d in range(7)]
+        tracked = max(1, sum(1 for b in week if b))
+        embed.add_field(
+            name="Today",
+            value=(
+                f"{today.get('wild_spawns', 0):,} spawns · "
+                f"{today.get('wild_catches', 0):,} catches · {today.get('fled', 0):,} fled"
+            ),
+            inline=False,
+        )
+        embed.add_field(
+            name="Daily average (last 7 days)",
+            value=(
+                f"{sum(b.get('wild_spawns', 0) for b in week) / tracked:.1f} spawns · "
+                f"{sum(b.get('wild_catches', 0) for b in week) / tracked:.1f} catches"
+            ),
+            inline=False,
+        )
         embed.set_footer(text="Statistics begin when this updated cog is installed.")
         await ctx.send(embed=embed)
 
@@ -3029,7 +3595,7 @@ class PokéBot(commands.Cog):
                 )
                 embed.add_field(
                     name="🏆 Leaderboard",
-                    value=f"`{prefix}pokeboard [wins|caught|shinies|balance]` — Server rankings",
+                    value=f"`{prefix}pokeboard [wins|caught|shinies|dex|balance]` — Server rankings",
                     inline=False,
                 )
             elif pg == 4:
@@ -3077,6 +3643,7 @@ class PokéBot(commands.Cog):
                         f"`{prefix}pokeset showprices` — View current prices",
                         f"`{prefix}pokeset resetprices` — Reset prices to defaults",
                         f"`{prefix}pokespawn` — Force a spawn now",
+                        f"`{prefix}pokeset importdata` — *(Owner)* Download all Pokémon data locally",
                     ]),
                     inline=False,
                 )
@@ -3100,7 +3667,7 @@ class PokéBot(commands.Cog):
             return make_page(pg)
 
         embed = make_page(1)
-        view  = PaginatedView(async_help_build, 5, 1, ctx.author.id)
+        view  = PaginatedView(async_help_build, 5, 1, ctx.author.id, first_embed=embed)
         view.message = await ctx.send(embed=embed, view=view)
 
 
@@ -3116,8 +3683,8 @@ class PokéBot(commands.Cog):
 
         currency  = await _currency_name(ctx.guild)
         balance   = await _get_balance(ctx.author)
-        owned_tms = player.get("items", {}).get("tms", [])
         tm_prices = await self._get_tm_prices(ctx.guild)
+        version   = self._player_version(ctx.author)
 
         all_tms     = list(TM_LIST.items())
         per_page    = 8
@@ -3127,6 +3694,7 @@ class PokéBot(commands.Cog):
             pg     = max(1, min(pg, total_pages))
             offset = (pg - 1) * per_page
             chunk  = all_tms[offset:offset + per_page]
+            owned_tms = player.get("items", {}).get("tms", [])
             embed  = discord.Embed(
                 title="💿 TM Shop",
                 description=(
@@ -3157,7 +3725,9 @@ class PokéBot(commands.Cog):
             await ctx.send(embed=embed)
             return
 
-        view = PaginatedView(async_tms_build, total_pages, page, ctx.author.id)
+        view = PaginatedView(
+            async_tms_build, total_pages, page, ctx.author.id, version=version, first_embed=embed,
+        )
         view.message = await ctx.send(embed=embed, view=view)
 
     @commands.command(name="buytm")
@@ -3267,7 +3837,7 @@ class PokéBot(commands.Cog):
 
         move_idx = move_slot - 1
         poke     = player["pokemon"][poke_idx]
-        moves    = poke.get("moves", [])
+        moves    = list(poke.get("moves", []))   # copy — the cached doc is live
 
         if move_idx < 0 or move_idx >= 4:
             await ctx.send(embed=error_embed("Move slot must be 1–4."))
@@ -3496,9 +4066,10 @@ class PokéBot(commands.Cog):
     # ── Trade ─────────────────────────────────────────────────────────────────
 
     @commands.command(name="trade")
-    async def trade(self, ctx: commands.Context, target: discord.Member, your_slot: int, their_slot: int) -> None:
+    async def trade(self, ctx: commands.Context, target: discord.Member, your_slot: str, their_slot: str) -> None:
         """Offer a Pokémon trade. Usage: `trade @user <your_slot> <their_slot>`
-        Both trainers must confirm. The trade swaps the Pokémon in those slots."""
+        Both trainers must confirm. The trade swaps the Pokémon in those slots.
+        A slot can also be a quoted filter matching one Pokémon, e.g. `trade @user "name:eevee shiny" 3`."""
         if target == ctx.author:
             await ctx.send(embed=error_embed("You can't trade with yourself!"))
             return
@@ -3518,15 +4089,20 @@ class PokéBot(commands.Cog):
         if self._get_battle_by_user(ctx.author.id) or self._get_battle_by_user(target.id):
             await ctx.send(embed=error_embed("Can't trade while either trainer is in a battle!"))
             return
+        if self._sessions.trade_for(ctx.author.id) or self._sessions.trade_for(target.id):
+            await ctx.send(embed=error_embed("One of you already has a trade offer pending — finish or decline it first!"))
+            return
 
         # Validate slots
-        your_idx  = your_slot - 1
-        their_idx = their_slot - 1
-        if your_idx < 0 or your_idx >= len(player["pokemon"]):
-            await ctx.send(embed=error_embed(f"You don't have a Pokémon in slot {your_slot}. You have {len(player['pokemon'])}."))
+        try:
+            your_idx = select_slot(self._collection(ctx.author, player), your_slot)
+        except QueryError as e:
+            await ctx.send(embed=error_embed(f"Your side: {e}"))
             return
-        if their_idx < 0 or their_idx >= len(target_data["pokemon"]):
-            await ctx.send(embed=error_embed(f"{target.display_name} doesn't have a Pokémon in slot {their_slot}. They have {len(target_data['pokemon'])}."))
+        try:
+            their_idx = select_slot(self._collection(target, target_data), their_slot)
+        except QueryError as e:
+            await ctx.send(embed=error_embed(f"{target.display_name}'s side: {e}"))
             return
         if len(player["pokemon"]) <= 1:
             await ctx.send(embed=error_embed("You can't trade your last Pokémon!"))
@@ -3540,7 +4116,7 @@ class PokéBot(commands.Cog):
 
         # Can't offer the active Pokémon if it would leave 0 usable ones (edge case handled below)
         # Stash the offer
-        self._trades[target.id] = {
+        self._sessions.add_trade(target.id, {
             "offerer_id":   ctx.author.id,
             "offerer_name": ctx.author.display_name,
             "target_id":    target.id,
@@ -3548,7 +4124,7 @@ class PokéBot(commands.Cog):
             "your_idx":     your_idx,
             "their_idx":    their_idx,
             "expires":      time.time() + 120,
-        }
+        })
 
         shiny_y = " ✨" if your_poke.get("shiny") else ""
         shiny_t = " ✨" if their_poke.get("shiny") else ""
@@ -3562,7 +4138,7 @@ class PokéBot(commands.Cog):
                 f"📤 **{ctx.author.display_name}** offers:\n"
                 f"→ **{your_poke['displayName']}{shiny_y}{nick_y}** Lv.{your_poke['level']} "
                 f"| {' / '.join(t.capitalize() for t in your_poke['types'])}\n\n"
-                f"📥 **{target.display_name}**'s Pokémon in slot {their_slot}:\n"
+                f"📥 **{target.display_name}**'s Pokémon in slot {their_idx + 1}:\n"
                 f"→ **{their_poke['displayName']}{shiny_t}{nick_t}** Lv.{their_poke['level']} "
                 f"| {' / '.join(t.capitalize() for t in their_poke['types'])}\n\n"
                 f"{target.mention} — type `accepttrade` to accept or `declinetrade` to decline!\n"
@@ -3586,11 +4162,11 @@ class PokéBot(commands.Cog):
         try:
             msg = await self.bot.wait_for("message", check=check, timeout=120.0)
         except asyncio.TimeoutError:
-            self._trades.pop(target.id, None)
+            self._sessions.pop_trade(target.id)
             await ctx.send(embed=error_embed(f"{target.display_name} didn't respond. Trade expired."))
             return
 
-        trade = self._trades.pop(target.id, None)
+        trade = self._sessions.pop_trade(target.id)
         if not trade or time.time() > trade["expires"]:
             await ctx.send(embed=error_embed("Trade expired."))
             return
@@ -3619,8 +4195,10 @@ class PokéBot(commands.Cog):
         # Swap the Pokémon
         poke_y = copy.deepcopy(player["pokemon"][yi])
         poke_t = copy.deepcopy(target_data["pokemon"][ti])
-        player["pokemon"][yi]      = poke_t
-        target_data["pokemon"][ti] = poke_y
+        your_col  = self._collection(ctx.author, player)
+        their_col = self._collection(target, target_data)
+        your_col.replace_at(yi, poke_t)
+        their_col.replace_at(ti, poke_y)
 
         # Fix active indices if they pointed at the traded slot
         if player["activePokemonIndex"] == yi:
@@ -3633,8 +4211,8 @@ class PokéBot(commands.Cog):
         self._update_dex(target_data, poke_y)
 
         # Keep both parties valid (the traded-away uid leaves each party)
-        ensure_party(player)
-        ensure_party(target_data)
+        ensure_party(player, your_col)
+        ensure_party(target_data, their_col)
 
         await self._save_player(ctx.author, player)
         await self._save_player(target, target_data)
@@ -3855,58 +4433,61 @@ class PokéBot(commands.Cog):
         if not raid:
             return
 
-        # ── Join window ───────────────────────────────────────────────────────
-        await asyncio.sleep(120)
-        raid = self._raids.get(guild.id)
-        if not raid:
-            return   # cancelled
+        boss     = raid["boss"]
+        stars, _ = self._raid_star_tier(boss["level"])
+        if raid["turn"] == 0:
+            # ── Join window ───────────────────────────────────────────────────
+            # A raid restored from the snapshot only waits out what's left of its window
+            await asyncio.sleep(max(0.0, raid["started_at"] + 120 - time.time()))
+            raid = self._raids.get(guild.id)
+            if not raid:
+                return   # cancelled
 
-        if not raid["participants"]:
-            self._raids.pop(guild.id, None)
-            try:
-                await channel.send(embed=discord.Embed(
-                    color=COLORS["gray"],
-                    description=f"🏃 Nobody joined the raid in time — **{raid['boss']['displayName']}** fled!",
-                ))
-            except discord.HTTPException:
-                pass
-            return
+            if not raid["participants"]:
+                self._sessions.end_raid(guild.id)
+                try:
+                    await channel.send(embed=discord.Embed(
+                        color=COLORS["gray"],
+                        description=f"🏃 Nobody joined the raid in time — **{raid['boss']['displayName']}** fled!",
+                    ))
+                except discord.HTTPException:
+                    pass
+                return
 
-        boss       = raid["boss"]
-        stars, _   = self._raid_star_tier(boss["level"])
-        n_trainers = len(raid["participants"])
+            n_trainers = len(raid["participants"])
 
-        # ── Size boss HP to the team's actual output ──────────────────────────
-        # Each trainer's lead does roughly estimate_hit() per turn; summing the
-        # leads gives expected team DPS. Boss HP = team DPS × target turns, so the
-        # fight always lasts about RAID_TARGET_TURNS no matter the players' level.
-        boss_def  = raid["boss_defense"]
-        team_dps  = sum(
-            estimate_hit(p["bench"][0], boss_def)
-            for p in raid["participants"] if p.get("bench")
-        )
-        team_dps  = max(team_dps, 1)
-        boss_hp_max = max(
-            math.floor(team_dps * self.RAID_TARGET_TURNS[stars]),
-            self.RAID_MIN_BOSS_HP,
-        )
-        raid["boss_hp"]     = boss_hp_max
-        raid["boss_hp_max"] = boss_hp_max
+            # ── Size boss HP to the team's actual output ──────────────────────
+            # Each trainer's lead does roughly estimate_hit() per turn; summing the
+            # leads gives expected team DPS. Boss HP = team DPS × target turns, so the
+            # fight always lasts about RAID_TARGET_TURNS no matter the players' level.
+            boss_def  = raid["boss_defense"]
+            team_dps  = sum(
+                estimate_hit(p["bench"][0], boss_def)
+                for p in raid["participants"] if p.get("bench")
+            )
+            team_dps  = max(team_dps, 1)
+            boss_hp_max = max(
+                math.floor(team_dps * self.RAID_TARGET_TURNS[stars]),
+                self.RAID_MIN_BOSS_HP,
+            )
+            raid["boss_hp"]     = boss_hp_max
+            raid["boss_hp_max"] = boss_hp_max
 
-        total_party = sum(len(p["bench"]) for p in raid["participants"])
-        await channel.send(embed=discord.Embed(
-            color=COLORS["red"],
-            description=(
-                f"⚔️ **The raid battle begins!** {n_trainers} trainer(s) "
-                f"({total_party} Pokémon) vs **{boss['displayName']}** (Lv.{boss['level']})!\n\n"
-                f"Boss HP scaled to your team: **{boss_hp_max:,}**\n\n"
-                f"Each turn your active Pokémon attacks; the next steps in when one faints. "
-                f"Use `raidswap <pos>` to pick who's in front, or `raidheal <item>` to heal."
-            ),
-        ))
+            total_party = sum(len(p["bench"]) for p in raid["participants"])
+            await channel.send(embed=discord.Embed(
+                color=COLORS["red"],
+                description=(
+                    f"⚔️ **The raid battle begins!** {n_trainers} trainer(s) "
+                    f"({total_party} Pokémon) vs **{boss['displayName']}** (Lv.{boss['level']})!\n\n"
+                    f"Boss HP scaled to your team: **{boss_hp_max:,}**\n\n"
+                    f"Each turn your active Pokémon attacks; the next steps in when one faints. "
+                    f"Use `raidswap <pos>` to pick who's in front, or `raidheal <item>` to heal."
+                ),
+            ))
 
         # ── Battle loop ───────────────────────────────────────────────────────
-        for turn in range(1, self.RAID_MAX_TURNS + 1):
+        # Resumed raids pick up after the last turn that was played
+        for turn in range(raid["turn"] + 1, self.RAID_MAX_TURNS + 1):
             await asyncio.sleep(self.RAID_TURN_DELAY)
             raid = self._raids.get(guild.id)
             if not raid:
@@ -3926,6 +4507,7 @@ class PokéBot(commands.Cog):
                 break
 
             # ── Each active trainer's front Pokémon attacks ────────────────────
+            attackers: List[Tuple[dict, dict, str]] = []
             for participant in active_trainers:
                 poke = self._raid_active_mon(participant)
                 if poke is None:
@@ -3948,45 +4530,47 @@ class PokéBot(commands.Cog):
                         except Exception:
                             pass
                     participant[cache_key] = best_move
+                attackers.append((participant, poke, participant[cache_key]))
 
-                move_name = participant[cache_key]
-                try:
-                    move_data = await fetch_move_data(self._session, move_name)
-                except Exception:
+            # One lookup per distinct move, then the whole volley in one batch
+            move_names = list({name for _, _, name in attackers})
+            docs = await asyncio.gather(
+                *(fetch_move_data(self._session, name) for name in move_names),
+                return_exceptions=True,
+            )
+            move_data = {
+                name: MoveData.from_doc(doc)
+                for name, doc in zip(move_names, docs) if not isinstance(doc, BaseException)
+            }
+            ready = []
+            for participant, poke, move_name in attackers:
+                if move_name in move_data:
+                    ready.append((participant, poke, move_name))
+                else:
                     turn_log.append(f"⚠️ {poke['displayName']}'s {move_name} failed!")
-                    continue
 
-                power     = move_data.get("power") or 40
-                move_type = move_data["type"]["name"]
-                accuracy  = move_data.get("accuracy") or 100
-
-                if random.random() * 100 > accuracy:
+            volley = resolve_volley(
+                pack_attackers(
+                    [poke for _, poke, _ in ready],
+                    [move_data[name] for _, _, name in ready],
+                    boss["types"],
+                ),
+                raid["boss_defense"], raid["boss_hp"], self._raid_rng,
+            )
+            raid["boss_hp"] = volley.boss_hp
+            for i, (participant, poke, move_name) in enumerate(ready[:volley.landed]):
+                if not volley.hit[i]:
                     turn_log.append(f"💨 {poke['displayName']} used **{move_name.replace('-', ' ')}** — missed!")
                     continue
-
-                atk      = poke["stats"].get("attack") or poke["stats"].get("special-attack") or 50
-                lvl      = poke["level"]
-                type_eff = calculate_type_effectiveness(move_type, boss["types"])
-                stab     = 1.5 if move_type in poke["types"] else 1.0
-                crit     = 1.5 if random.random() < 0.0625 else 1.0
-                rand_m   = 0.85 + random.random() * 0.15
-                boss_def = min(raid["boss_defense"], 80)
-
-                damage = max(1, math.floor(
-                    (((2 * lvl / 5 + 2) * power * atk / boss_def) / 50 + 2)
-                    * stab * type_eff * rand_m * crit
-                ))
-                raid["boss_hp"] = max(0, raid["boss_hp"] - damage)
+                damage = int(volley.damage[i])
                 participant["damage_dealt"] = participant.get("damage_dealt", 0) + damage
 
-                eff_txt  = effectiveness_label(type_eff)
-                crit_txt = " ⚡ Crit!" if crit > 1 else ""
+                eff_txt  = effectiveness_label(float(volley.eff[i]))
+                crit_txt = " ⚡ Crit!" if volley.crit[i] else ""
                 turn_log.append(
                     f"🎯 **{participant['username']}**'s {poke['displayName']} → "
                     f"**{move_name.replace('-', ' ')}**{crit_txt} {eff_txt} **{damage:,}** dmg"
                 )
-                if raid["boss_hp"] <= 0:
-                    break
 
             # ── Victory check ──────────────────────────────────────────────────
             if raid["boss_hp"] <= 0:
@@ -3995,7 +4579,7 @@ class PokéBot(commands.Cog):
                 embed.title = f"🏆 RAID VICTORY — {boss['displayName']} defeated!"
                 await channel.send(embed=embed)
                 await self._resolve_raid_victory(guild, channel, raid)
-                self._raids.pop(guild.id, None)
+                self._sessions.end_raid(guild.id)
                 return
 
             # ── Boss counterattack (capped by target's max HP) ─────────────────
@@ -4034,7 +4618,7 @@ class PokéBot(commands.Cog):
                 break
 
         # ── Defeat / timeout ──────────────────────────────────────────────────
-        raid = self._raids.pop(guild.id, None)
+        raid = self._sessions.end_raid(guild.id)
         if not raid:
             return
 
@@ -4083,9 +4667,7 @@ class PokéBot(commands.Cog):
             boss["shiny"] = True
             boss["spriteUrl"] = boss.get("shinySpriteUrl") or boss.get("spriteUrl")
 
-        raid_stats = await self.config.guild(guild).encounter_stats()
-        raid_stats["raid_wins"] = raid_stats.get("raid_wins", 0) + 1
-        await self.config.guild(guild).encounter_stats.set(raid_stats)
+        self._encounters.bump(guild.id, raid_wins=1)
 
         lines = []
         for participant in raid["participants"]:
@@ -4128,7 +4710,7 @@ class PokéBot(commands.Cog):
                     break
                 throw_lines.append(f"  🔵 Ball {throw_num}: 💨 Broke free...")
 
-            max_pokemon    = await self.config.guild(guild).max_pokemon()
+            max_pokemon    = (await self._guild_settings(guild.id))["max_pokemon"]
             actually_added = 0
             for _ in range(caught_count):
                 if len(p_data["pokemon"]) < max_pokemon:
@@ -4138,14 +4720,12 @@ class PokéBot(commands.Cog):
                     boss_copy["stats"]["hp"] = boss_copy["stats"]["maxHp"]
                     boss_copy["caughtAt"]    = time.time()
                     boss_copy["nickname"]    = None
-                    p_data["pokemon"].append(boss_copy)
+                    self._collection(member, p_data).add(boss_copy)
                     self._update_dex(p_data, boss_copy)
                     actually_added += 1
             if actually_added:
                 await self._save_player(member, p_data)
-                raid_stats = await self.config.guild(guild).encounter_stats()
-                raid_stats["raid_catches"] = raid_stats.get("raid_catches", 0) + actually_added
-                await self.config.guild(guild).encounter_stats.set(raid_stats)
+                self._encounters.bump(guild.id, raid_catches=actually_added)
 
             caught_str = (
                 f"🎉 **Caught {actually_added}× {boss['displayName']}{'  ✨' if boss_is_shiny else ''}!**"
@@ -4203,12 +4783,15 @@ class PokéBot(commands.Cog):
 
         async with ctx.typing():
             if pokemon_name.strip():
-                slug = pokemon_name.lower().strip().replace(" ", "-")
+                slug, suggestions = self._species_lookup(pokemon_name)
                 try:
+                    if slug is None:
+                        raise LookupError(pokemon_name)
                     boss = await build_pokemon_instance(self._session, slug, level=random.randint(60, 100), allow_shiny=False)
                 except Exception:
-                    await ctx.send(embed=error_embed(f"Couldn't find **{pokemon_name}**. Check the spelling!"))
+                    await ctx.send(embed=error_embed(self._not_found_text(pokemon_name, suggestions)))
                     return
+                slug = boss["name"]
             else:
                 pick  = self._pick_random_raid_boss()
                 slug  = str(pick.get("name", pick["id"])).lower()
@@ -4243,7 +4826,7 @@ class PokéBot(commands.Cog):
             "channel_id":   channel.id,
             "started_at":   time.time(),
         }
-        self._raids[ctx.guild.id] = raid
+        self._sessions.start_raid(ctx.guild.id, raid)
 
         balls_preview = self._raid_balls_awarded(stars, alive=True)
         embed = discord.Embed(
@@ -4284,12 +4867,12 @@ class PokéBot(commands.Cog):
         if not player:
             await ctx.send(embed=error_embed("Start your journey with `start` before joining raids!"))
             return
-        if any(p["member_id"] == ctx.author.id for p in raid["participants"]):
+        if self._sessions.raid_participant(ctx.guild.id, ctx.author.id):
             await ctx.send(embed=error_embed("You've already joined this raid!"))
             return
 
         # Snapshot the party (deep copies so raid damage never touches stored HP)
-        roster = party_mons(player)
+        roster = party_mons(player, self._collection(ctx.author, player))
         if not roster:
             await ctx.send(embed=error_embed("Your party is empty! Add Pokémon with `party add <slot>`."))
             return
@@ -4302,7 +4885,7 @@ class PokéBot(commands.Cog):
 
         # Start on the first healthy party member
         start_idx = next((i for i, m in enumerate(bench) if m["stats"]["hp"] > 0), 0)
-        raid["participants"].append({
+        self._sessions.join_raid(ctx.guild.id, {
             "member_id":     ctx.author.id,
             "username":      ctx.author.display_name,
             "bench":         bench,
@@ -4331,7 +4914,7 @@ class PokéBot(commands.Cog):
             await ctx.send(embed=error_embed("No active raid battle right now."))
             return
 
-        participant = next((p for p in raid["participants"] if p["member_id"] == ctx.author.id), None)
+        participant = self._sessions.raid_participant(ctx.guild.id, ctx.author.id)
         if not participant:
             await ctx.send(embed=error_embed("You're not in this raid!"))
             return
@@ -4371,7 +4954,7 @@ class PokéBot(commands.Cog):
             await ctx.send(embed=error_embed("No active raid battle right now."))
             return
 
-        participant = next((p for p in raid["participants"] if p["member_id"] == ctx.author.id), None)
+        participant = self._sessions.raid_participant(ctx.guild.id, ctx.author.id)
         if not participant:
             await ctx.send(embed=error_embed("You're not in this raid!"))
             return
@@ -4444,7 +5027,7 @@ class PokéBot(commands.Cog):
         if ctx.guild.id not in self._raids:
             await ctx.send(embed=error_embed("No raid is active right now."))
             return
-        self._raids.pop(ctx.guild.id, None)
+        self._sessions.end_raid(ctx.guild.id)
         task = self._raid_tasks.pop(ctx.guild.id, None)
         if task and not task.done():
             task.cancel()
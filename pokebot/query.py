@@ -0,0 +1,215 @@
+"""Filter / sort queries over a trainer's Pokémon collection.
+
+A query is a handful of space-separated tokens, e.g.
+``shiny type:fire lvl:20-40 sort:level``. Results are collection indexes
+(0-based slots), so commands that act on a slot can take a query instead.
+
+Per-field indexes (by type, species, rarity, shiny) and sort orders are
+built the first time a query needs them and cached on the trainer's
+``PlayerCollection`` until the collection changes or the doc is next saved.
+"""
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+
+from .pokeapi import EVOLUTIONS, TYPE_IDS, PlayerCollection
+
+SORT_KEYS = ("slot", "level", "caught", "iv")
+RARITIES  = ("common", "rare", "legendary", "mythical")
+EVO_ITEM_LEVEL = 20   # item/trade evolutions unlock at this level, same as `evolve`
+
+QUERY_HELP = (
+    "`shiny` · `type:<type>` · `name:<species>` · `rarity:<tier>` · "
+    "`lvl:<min>-<max>` · `evo` · `sort:<level|caught|iv|slot>` "
+    "(highest first, slots in order; prefix `-` to reverse)"
+)
+
+
+class QueryError(ValueError):
+    """Raised for a query token that can't be parsed; the message is user-facing."""
+
+
+@dataclass(frozen=True)
+class CollectionQuery:
+    shiny:     Optional[bool] = None
+    types:     Tuple[str, ...] = ()
+    species:   Optional[str] = None
+    rarity:    Optional[str] = None
+    min_level: int = 1
+    max_level: int = 100
+    evo_ready: bool = False
+    sort:      str = "slot"
+    reverse:   bool = False   # `-` prefix: flip the key's default order
+    tokens:    Tuple[str, ...] = field(default=(), compare=False)
+
+    @property
+    def is_empty(self) -> bool:
+        return not self.tokens
+
+
+def parse_query(text: str) -> CollectionQuery:
+    """Parse query tokens into a CollectionQuery (raises QueryError)."""
+    opts: Dict[str, object] = {}
+    types: List[str] = []
+    tokens = tuple(t for t in text.lower().split() if t)
+    for tok in tokens:
+        key, _, val = tok.partition(":")
+        if tok in ("shiny", "shinies"):
+            opts["shiny"] = True
+        elif tok in ("!shiny", "notshiny"):
+            opts["shiny"] = False
+        elif tok in ("evo", "evoready", "evo-ready"):
+            opts["evo_ready"] = True
+        elif key == "type" and val in TYPE_IDS:
+            types.append(val)
+        elif key in ("name", "species") and val:
+            opts["species"] = val
+        elif key == "rarity" and val in RARITIES:
+            opts["rarity"] = val
+        elif key in ("lvl", "level") and val:
+            lo, sep, hi = val.partition("-")
+            try:
+                if val.startswith(">"):
+                    opts["min_level"] = int(val[1:]) + 1
+                elif val.startswith("<"):
+                    opts["max_level"] = int(val[1:]) - 1
+                elif sep:
+                    opts["min_level"], opts["max_level"] = int(lo or 1), int(hi or 100)
+                else:
+                    opts["min_level"] = opts["max_level"] = int(val)
+            except ValueError:
+                raise QueryError(f"Bad level filter `{tok}` — try `lvl:20-40`, `lvl:>30` or `lvl:50`.")
+        elif key == "sort" and val.lstrip("-") in SORT_KEYS:
+            opts["sort"]      = val.lstrip("-")
+            opts["reverse"]   = val.startswith("-")
+        elif TYPE_IDS.get(tok) is not None:
+            types.append(tok)
+        else:
+            raise QueryError(f"Unknown filter `{tok}`. Filters: {QUERY_HELP}")
+    return CollectionQuery(types=tuple(types), tokens=tokens, **opts)
+
+
+def stat_total(mon: dict) -> int:
+    """Sum of a Pokémon's stats (max HP, not current). Stands in for IVs, which aren't stored."""
+    stats = mon.get("stats", {})
+    return sum(v for k, v in stats.items() if k != "hp")
+
+
+def evolution_ready(mon: dict) -> bool:
+    targets = EVOLUTIONS.get(mon.get("id"))
+    if targets is None:
+        return bool(mon.get("evoNotified"))
+    if not targets:
+        return False
+    min_level = targets[0][2] or EVO_ITEM_LEVEL
+    return mon.get("level", 1) >= min_level
+
+
+_SORT_FUNCS = {
+    "level":  lambda m: m.get("level", 1),
+    "caught": lambda m: m.get("caughtAt") or 0,
+    "iv":     stat_total,
+}
+
+
+class QueryIndex:
+    """Lazily built per-field indexes over one collection snapshot."""
+
+    def __init__(self, col: PlayerCollection) -> None:
+        self.col = col
+        self._by_field: Dict[str, Dict[object, List[int]]] = {}
+        self._orders:   Dict[str, List[int]] = {}
+
+    def _field(self, name: str) -> Dict[object, List[int]]:
+        index = self._by_field.get(name)
+        if index is None:
+            index = {}
+            for i, m in enumerate(self.col.mons):
+                if name == "type":
+                    keys = m.get("types", [])
+                elif name == "species":
+                    keys = [m.get("name", "")]
+                elif name == "rarity":
+                    keys = [m.get("rarity", "common")]
+                else:
+                    keys = [bool(m.get("shiny"))]
+                for k in keys:
+                    index.setdefault(k, []).append(i)
+            self._by_field[name] = index
+        return index
+
+    def _order(self, key: str) -> List[int]:
+        order = self._orders.get(key)
+        if order is None:
+            mons = self.col.mons
+            fn   = _SORT_FUNCS[key]
+            # Descending by value, ties keep slot order
+            order = self._orders[key] = sorted(range(len(mons)), key=lambda i: (-fn(mons[i]), i))
+        return order
+
+    def run(self, q: CollectionQuery) -> List[int]:
+        """Slots (0-based) matching the query, in the requested order."""
+        mons = self.col.mons
+        candidates: Optional[set] = None
+
+        def _narrow(slots: List[int]) -> None:
+            nonlocal candidates
+            candidates = set(slots) if candidates is None else candidates & set(slots)
+
+        for t in q.types:
+            _narrow(self._field("type").get(t, []))
+        if q.rarity:
+            _narrow(self._field("rarity").get(q.rarity, []))
+        if q.shiny is not None:
+            _narrow(self._field("shiny").get(q.shiny, []))
+        if q.species:
+            exact = self._field("species").get(q.species)
+            if exact is not None:
+                _narrow(exact)
+            else:
+                _narrow([i for name, slots in self._field("species").items()
+                         if q.species in str(name) for i in slots])
+
+        pool = range(len(mons)) if candidates is None else candidates
+        hits = {
+            i for i in pool
+            if q.min_level <= mons[i].get("level", 1) <= q.max_level
+            and (not q.evo_ready or evolution_ready(mons[i]))
+        }
+        if q.sort == "slot":
+            ordered = sorted(hits)
+            return ordered[::-1] if q.reverse else ordered
+        ordered = [i for i in self._order(q.sort) if i in hits]
+        return ordered[::-1] if q.reverse else ordered
+
+
+def run_query(col: PlayerCollection, q: CollectionQuery) -> List[int]:
+    """Run a query against a collection, reusing its cached index."""
+    index = col.queries
+    if index is None or index.col is not col:
+        index = col.queries = QueryIndex(col)
+    return index.run(q)
+
+
+def select_slot(col: PlayerCollection, selector: str) -> int:
+    """Resolve a slot number or a query matching exactly one Pokémon to a 0-based index.
+
+    Raises QueryError (user-facing message) when nothing or more than one matches.
+    """
+    selector = selector.strip()
+    total = len(col)
+    if selector.isdigit():
+        idx = int(selector) - 1
+        if not 0 <= idx < total:
+            raise QueryError(f"No Pokémon in slot {selector} (slots 1–{total}).")
+        return idx
+    hits = run_query(col, parse_query(selector))
+    if not hits:
+        raise QueryError(f"No Pokémon match `{selector}`.")
+    if len(hits) > 1:
+        shown = ", ".join(f"#{i + 1}" for i in hits[:8]) + ("…" if len(hits) > 8 else "")
+        raise QueryError(
+            f"`{selector}` matches {len(hits)} Pokémon ({shown}) — narrow it down or use a slot number."
+        )
+    return hits[0]
@@ -0,0 +1,104 @@
+"""Single-task deadline scheduler for PokéBot's timed events.
+
+Spawns, flees, post-catch respawns and battle AFK checks are all entries in
+one heap keyed by ``(kind, key)``; one task sleeps until the earliest
+deadline instead of every guild, spawn and battle owning a sleeping task.
+Deadlines are wall-clock times so pending entries can be written to disk and
+picked back up after a reload.
+"""
+from __future__ import annotations
+
+import asyncio
+import heapq
+import itertools
+import logging
+import time
+from typing import Any, Awaitable, Callable, Dict, Hashable, List, Optional, Set, Tuple
+
+log = logging.getLogger("red.pokebot")
+
+EntryKey = Tuple[str, Hashable]
+
+
+class Scheduler:
+    """Heap of one-shot deadlines; re-scheduling a key replaces its old deadline."""
+
+    def __init__(self) -> None:
+        self._heap: List[Tuple[float, int, dict]] = []
+        self._entries: Dict[EntryKey, dict] = {}
+        self._seq  = itertools.count()
+        self._wake = asyncio.Event()
+        self._running: Set[asyncio.Task] = set()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, kind_key: EntryKey) -> bool:
+        return kind_key in self._entries
+
+    def get(self, kind: str, key: Hashable) -> Optional[dict]:
+        return self._entries.get((kind, key))
+
+    def schedule(self, kind: str, key: Hashable, when: float, payload: Optional[dict] = None) -> None:
+        entry = {"kind": kind, "key": key, "when": when, "payload": payload or {}}
+        self._entries[(kind, key)] = entry
+        heapq.heappush(self._heap, (when, next(self._seq), entry))
+        self._wake.set()
+
+    def cancel(self, kind: str, key: Hashable) -> None:
+        # The heap slot goes stale and is skipped when it reaches the top
+        self._entries.pop((kind, key), None)
+
+    def entries(self) -> List[dict]:
+        """Every pending entry, e.g. for persisting."""
+        return list(self._entries.values())
+
+    def _live(self, entry: dict) -> bool:
+        return self._entries.get((entry["kind"], entry["key"])) is entry
+
+    def _pop_due(self, now: float) -> List[dict]:
+        due = []
+        while self._heap and self._heap[0][0] <= now:
+            _, _, entry = heapq.heappop(self._heap)
+            if self._live(entry):
+                del self._entries[(entry["kind"], entry["key"])]
+                due.append(entry)
+        return due
+
+    def _next_deadline(self) -> Optional[float]:
+        while self._heap and not self._live(self._heap[0][2]):
+            heapq.heappop(self._heap)
+        return self._heap[0][0] if self._heap else None
+
+    @staticmethod
+    async def _fire(dispatch: Callable[[dict], Awaitable[Any]], entry: dict) -> None:
+        try:
+            await dispatch(entry)
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            log.exception(f"[PokéBot] scheduled {entry['kind']} for {entry['key']} failed")
+
+    async def run(self, dispatch: Callable[[dict], Awaitable[Any]]) -> None:
+        """Fire due entries through `dispatch` forever. Cancel the task to stop.
+
+        Each due entry runs as its own task, so a slow spawn or a rate-limited
+        send in one guild doesn't hold up every other deadline. Cancelling
+        the scheduler also cancels dispatches still in flight.
+        """
+        try:
+            while True:
+                self._wake.clear()
+                for entry in self._pop_due(time.time()):
+                    task = asyncio.create_task(self._fire(dispatch, entry))
+                    self._running.add(task)
+                    task.add_done_callback(self._running.discard)
+                deadline = self._next_deadline()
+                timeout  = None if deadline is None else max(0.0, deadline - time.time())
+                try:
+                    await asyncio.wait_for(self._wake.wait(), timeout)
+                except asyncio.TimeoutError:
+                    pass
+        finally:
+            for task in self._running:
+                task.cancel()
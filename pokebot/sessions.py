@@ -0,0 +1,103 @@
+"""In-memory registry of PokéBot's live multi-user sessions.
+
+Battles, pending challenges, pending trades and raid participation are kept
+here with a per-user index, so "is this trainer already busy?" is a dict
+lookup instead of a scan over every session. Ending a session through the
+registry drops its index entries; lookups also skip entries whose session
+has already gone, so a stale index can never report a trainer as busy.
+"""
+from __future__ import annotations
+
+from typing import Dict, Optional, Tuple
+
+
+class SessionRegistry:
+    def __init__(self) -> None:
+        self.battles:    Dict[str, dict] = {}   # battle_id -> battle
+        self.challenges: Dict[int, dict] = {}   # challenged_user_id -> challenge
+        self.trades:     Dict[int, dict] = {}   # target_user_id -> pending trade offer
+        self.raids:      Dict[int, dict] = {}   # guild_id -> active raid
+
+        self._user_battle: Dict[int, str] = {}                 # user_id -> battle_id
+        self._user_trade:  Dict[int, int] = {}                 # user_id -> trade key (target id)
+        self._raid_members: Dict[int, Dict[int, dict]] = {}    # guild_id -> user_id -> participant
+
+    # ── Battles ───────────────────────────────────────────────────────────────
+
+    def start_battle(self, battle_id: str, battle: dict) -> None:
+        self.battles[battle_id] = battle
+        for side in ("player1", "player2"):
+            self._user_battle[battle[side]["id"]] = battle_id
+
+    def end_battle(self, battle_id: str) -> Optional[dict]:
+        battle = self.battles.pop(battle_id, None)
+        if battle:
+            for side in ("player1", "player2"):
+                if self._user_battle.get(battle[side]["id"]) == battle_id:
+                    del self._user_battle[battle[side]["id"]]
+        return battle
+
+    def battle_for(self, user_id: int) -> Optional[Tuple[str, dict]]:
+        battle_id = self._user_battle.get(user_id)
+        if battle_id is None:
+            return None
+        battle = self.battles.get(battle_id)
+        if battle is None:
+            del self._user_battle[user_id]
+            return None
+        return battle_id, battle
+
+    # ── Challenges ────────────────────────────────────────────────────────────
+
+    def add_challenge(self, target_id: int, challenge: dict) -> None:
+        self.challenges[target_id] = challenge
+
+    def pop_challenge(self, target_id: int) -> Optional[dict]:
+        return self.challenges.pop(target_id, None)
+
+    # ── Trades ────────────────────────────────────────────────────────────────
+
+    def add_trade(self, target_id: int, trade: dict) -> None:
+        replaced = self.trades.get(target_id)
+        if replaced and self._user_trade.get(replaced["offerer_id"]) == target_id:
+            # The overwritten offer's trainer is no longer part of a pending trade
+            del self._user_trade[replaced["offerer_id"]]
+        self.trades[target_id] = trade
+        self._user_trade[trade["offerer_id"]] = target_id
+        self._user_trade[target_id] = target_id
+
+    def pop_trade(self, target_id: int) -> Optional[dict]:
+        trade = self.trades.pop(target_id, None)
+        if trade:
+            for uid in (trade["offerer_id"], target_id):
+                if self._user_trade.get(uid) == target_id:
+                    del self._user_trade[uid]
+        return trade
+
+    def trade_for(self, user_id: int) -> Optional[dict]:
+        key = self._user_trade.get(user_id)
+        if key is None:
+            return None
+        trade = self.trades.get(key)
+        if trade is None:
+            del self._user_trade[user_id]
+        return trade
+
+    # ── Raids ─────────────────────────────────────────────────────────────────
+
+    def start_raid(self, guild_id: int, raid: dict) -> None:
+        self.raids[guild_id] = raid
+        self._raid_members[guild_id] = {p["member_id"]: p for p in raid.get("participants", [])}
+
+    def join_raid(self, guild_id: int, participant: dict) -> None:
+        self.raids[guild_id]["participants"].append(participant)
+        self._raid_members.setdefault(guild_id, {})[participant["member_id"]] = participant
+
+    def end_raid(self, guild_id: int) -> Optional[dict]:
+        self._raid_members.pop(guild_id, None)
+        return self.raids.pop(guild_id, None)
+
+    def raid_participant(self, guild_id: int, user_id: int) -> Optional[dict]:
+        if guild_id not in self.raids:
+            return None
+        return self._raid_members.get(guild_id, {}).get(user_id)
@@ -0,0 +1,109 @@
+"""Warm-restart snapshot of PokéBot's in-memory sessions.
+
+Pending deadlines, active spawns, battles, raids, guilds waiting on a
+respawn and the pre-rolled spawn buffers are packed into one JSON document.
+The cog writes it periodically and on unload, and reads it back on load, so
+a reload doesn't drop anything players can see. Pokémon are stored compacted
+(species-derived fields dropped, see ``compact_pokemon``) and expanded again
+on restore.
+
+Pending trades and battle challenges aren't included: their confirmation is
+awaited inside the command that created them, which a reload cancels.
+"""
+from __future__ import annotations
+
+import json
+import time
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from .pokeapi import compact_pokemon, expand_pokemon
+
+SNAPSHOT_VERSION = 1
+SNAPSHOT_MAX_AGE = 3600   # battles / raids in an older snapshot are dropped, not resumed
+
+
+def _int_keys(d: Optional[dict]) -> dict:
+    return {int(k): v for k, v in (d or {}).items()}
+
+
+def _battle_mons(battle: dict, fn) -> dict:
+    out = dict(battle)
+    for side in ("player1", "player2"):
+        out[side] = {**battle[side], "pokemon": fn(battle[side]["pokemon"])}
+    return out
+
+
+def _raid_mons(raid: dict, fn) -> dict:
+    out = dict(raid)
+    out["boss"] = fn(raid["boss"])
+    out["participants"] = [
+        {**p, "bench": [fn(m) for m in p.get("bench", [])]} for p in raid.get("participants", [])
+    ]
+    return out
+
+
+def _expanded(mon: dict) -> dict:
+    expand_pokemon(mon)
+    return mon
+
+
+def pack_snapshot(
+    *,
+    schedule: List[dict],
+    spawns: Dict[int, dict],
+    battles: Dict[str, dict],
+    raids: Dict[int, dict],
+    pending_respawn: Dict[int, int],
+    spawn_buffers: Dict[int, List[dict]],
+) -> dict:
+    """Build the JSON-ready snapshot document (Pokémon compacted)."""
+    return {
+        "version":  SNAPSHOT_VERSION,
+        "savedAt":  time.time(),
+        "schedule": schedule,
+        "spawns":   {cid: {**s, "pokemon": compact_pokemon(s["pokemon"])} for cid, s in spawns.items()},
+        "battles":  {bid: _battle_mons(b, compact_pokemon) for bid, b in battles.items()},
+        "raids":    {gid: _raid_mons(r, compact_pokemon) for gid, r in raids.items()},
+        "pendingRespawn": pending_respawn,
+        "spawnBuffers":   {gid: [compact_pokemon(m) for m in buf] for gid, buf in spawn_buffers.items() if buf},
+    }
+
+
+def unpack_snapshot(doc) -> dict:
+    """Inverse of pack_snapshot, with int keys restored and Pokémon expanded.
+
+    Also accepts the older ``schedule.json`` layout (a bare list of deadlines
+    whose flee payloads carry their spawn).
+    """
+    if isinstance(doc, list):
+        spawns = {}
+        for entry in doc:
+            spawn = (entry.get("payload") or {}).pop("spawn", None)
+            if entry.get("kind") == "flee" and spawn:
+                spawns[entry["key"]] = spawn
+        doc = {"savedAt": time.time(), "schedule": doc, "spawns": spawns}
+
+    fresh = time.time() - doc.get("savedAt", 0) <= SNAPSHOT_MAX_AGE
+    return {
+        "schedule": doc.get("schedule", []),
+        "spawns":   {cid: {**s, "pokemon": _expanded(s["pokemon"])} for cid, s in _int_keys(doc.get("spawns")).items()},
+        "battles":  {bid: _battle_mons(b, _expanded) for bid, b in (doc.get("battles") or {}).items()} if fresh else {},
+        "raids":    {gid: _raid_mons(r, _expanded) for gid, r in _int_keys(doc.get("raids")).items()} if fresh else {},
+        "pendingRespawn": _int_keys(doc.get("pendingRespawn")),
+        "spawnBuffers":   {gid: [_expanded(m) for m in buf] for gid, buf in _int_keys(doc.get("spawnBuffers")).items()},
+    }
+
+
+def write_snapshot(path: Path, text: str) -> None:
+    """Atomically replace the snapshot file with already-serialised JSON (blocking; run in an executor)."""
+    tmp = path.with_suffix(".tmp")
+    tmp.write_text(text)
+    tmp.replace(path)
+
+
+def read_snapshot(path: Path):
+    """Parsed snapshot file, or None if there isn't one (blocking)."""
+    if not path.exists():
+        return None
+    return json.loads(path.read_text())
@@ -0,0 +1,337 @@
+"""Packed local PokéAPI store – one indexed SQLite file instead of a JSON file per lookup.
+
+Species and move documents are trimmed to the fields PokéBot actually reads,
+zlib-packed and kept in a single SQLite database. Reads go through a worker
+thread so the event loop never blocks on disk or on JSON parsing.
+"""
+from __future__ import annotations
+
+import asyncio
+import json
+import sqlite3
+import threading
+import zlib
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Set
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS species (
+    id   INTEGER PRIMARY KEY,
+    name TEXT    NOT NULL UNIQUE,
+    doc  BLOB    NOT NULL
+);
+CREATE TABLE IF NOT EXISTS species_summary (
+    id  INTEGER PRIMARY KEY,
+    doc TEXT    NOT NULL
+);
+CREATE TABLE IF NOT EXISTS evolutions (
+    species_id INTEGER PRIMARY KEY,
+    targets    TEXT    NOT NULL
+);
+CREATE TABLE IF NOT EXISTS moves (
+    name TEXT PRIMARY KEY,
+    doc  BLOB NOT NULL
+);
+CREATE TABLE IF NOT EXISTS meta (
+    key   TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+"""
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# Document trimming  (pure)
+# ──────────────────────────────────────────────────────────────────────────────
+
+def build_learnset(raw: dict) -> Dict[str, list]:
+    """Level-up learnset sorted by the earliest level each move is learned.
+
+    Returns parallel lists ``{"levels": [...], "moves": [...]}`` so a moveset
+    for level N is ``moves[:bisect_right(levels, N)]``. Documents that already
+    carry a learnset are returned as-is.
+    """
+    if "learnset" in raw:
+        return raw["learnset"]
+    first: Dict[str, int] = {}
+    for m in raw.get("moves", []):
+        levels = [
+            d["level_learned_at"]
+            for d in m.get("version_group_details", [])
+            if d["move_learn_method"]["name"] == "level-up"
+        ]
+        if levels:
+            first[m["move"]["name"]] = min(levels)
+    ordered = sorted(first.items(), key=lambda kv: (kv[1], kv[0]))
+    return {"levels": [lvl for _, lvl in ordered], "moves": [name for name, _ in ordered]}
+
+
+def slim_pokemon(raw: dict) -> dict:
+    """Trim a raw /pokemon document to the fields PokéBot reads.
+
+    The shape is kept close to PokéAPI's so callers don't care whether a
+    document came from the store or straight off the network. Per-version
+    learn details are folded into a precomputed ``learnset`` and dropped.
+    """
+    sprites  = raw.get("sprites") or {}
+    official = ((sprites.get("other") or {}).get("official-artwork") or {})
+    return {
+        "id":        raw["id"],
+        "name":      raw["name"],
+        "height":    raw.get("height", 0),
+        "weight":    raw.get("weight", 0),
+        "species":   {"name": raw["species"]["name"], "url": raw["species"]["url"]},
+        "types":     [{"type": {"name": t["type"]["name"]}} for t in raw.get("types", [])],
+        "stats":     [
+            {"base_stat": s["base_stat"], "stat": {"name": s["stat"]["name"]}}
+            for s in raw.get("stats", [])
+        ],
+        "abilities": [
+            {"ability": {"name": a["ability"]["name"]}, "is_hidden": a.get("is_hidden", False)}
+            for a in raw.get("abilities", [])
+        ],
+        "sprites": {
+            "front_default": sprites.get("front_default"),
+            "front_shiny":   sprites.get("front_shiny"),
+            "other": {
+                "official-artwork": {
+                    "front_default": official.get("front_default"),
+                    "front_shiny":   official.get("front_shiny"),
+                },
+            },
+        },
+        "moves":    [{"move": {"name": m["move"]["name"]}} for m in raw.get("moves", [])],
+        "learnset": build_learnset(raw),
+    }
+
+
+def summarize_species(doc: dict) -> dict:
+    """The handful of per-species fields every stored Pokémon instance derives from."""
+    sprites = doc.get("sprites") or {}
+    return {
+        "name":        doc["name"],
+        "types":       [t["type"]["name"] for t in doc.get("types", [])],
+        "sprite":      sprites.get("front_default"),
+        "shinySprite": sprites.get("front_shiny") or sprites.get("front_default"),
+    }
+
+
+def id_from_url(url: str) -> int:
+    """Trailing numeric id of a PokéAPI resource URL (``.../pokemon-species/25/`` -> 25)."""
+    return int(url.rstrip("/").rsplit("/", 1)[-1])
+
+
+def walk_evolution_chain(chain: dict) -> Dict[int, List[list]]:
+    """Flatten an /evolution-chain document into species_id -> targets.
+
+    Each target is ``[target_id, name, min_level, trigger]`` (min_level is None
+    for item/trade/friendship evolutions). Every species in the chain gets an
+    entry, so fully evolved species map to an empty list.
+    """
+    graph: Dict[int, List[list]] = {}
+
+    def _walk(node: dict) -> None:
+        targets = []
+        for nxt in node.get("evolves_to", []):
+            deets = nxt["evolution_details"][0] if nxt.get("evolution_details") else {}
+            targets.append([
+                id_from_url(nxt["species"]["url"]),
+                nxt["species"]["name"],
+                deets.get("min_level"),
+                (deets.get("trigger") or {}).get("name"),
+            ])
+            _walk(nxt)
+        graph[id_from_url(node["species"]["url"])] = targets
+
+    _walk(chain["chain"])
+    return graph
+
+
+def slim_move(raw: dict) -> dict:
+    """Trim a raw /move document to the fields PokéBot reads."""
+    return {
+        "id":           raw.get("id"),
+        "name":         raw["name"],
+        "power":        raw.get("power"),
+        "accuracy":     raw.get("accuracy"),
+        "pp":           raw.get("pp"),
+        "priority":     raw.get("priority", 0),
+        "type":         {"name": raw["type"]["name"]},
+        "damage_class": {"name": (raw.get("damage_class") or {}).get("name")},
+    }
+
+
+def _pack(doc: dict) -> bytes:
+    return zlib.compress(json.dumps(doc, separators=(",", ":")).encode("utf-8"))
+
+
+def _unpack(blob: bytes) -> dict:
+    return json.loads(zlib.decompress(blob).decode("utf-8"))
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# Store
+# ──────────────────────────────────────────────────────────────────────────────
+
+class PokeStore:
+    """Single-file species/move store.
+
+    All SQLite access happens behind one lock on a connection shared with the
+    default executor; use the ``a*`` coroutines from async code.
+    """
+
+    def __init__(self, path: Path) -> None:
+        self.path  = path
+        self._lock = threading.Lock()
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(path), check_same_thread=False)
+        self._conn.executescript(SCHEMA)
+        self._conn.commit()
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+    # ── sync API (runs in a worker thread) ────────────────────────────────────
+
+    def get_species(self, key: str) -> Optional[dict]:
+        """Look a species up by national dex id (as text) or API name."""
+        key = str(key).lower()
+        with self._lock:
+            if key.isdigit():
+                row = self._conn.execute("SELECT doc FROM species WHERE id = ?", (int(key),)).fetchone()
+            else:
+                row = self._conn.execute("SELECT doc FROM species WHERE name = ?", (key,)).fetchone()
+        return _unpack(row[0]) if row else None
+
+    def put_species(self, docs: Iterable[dict]) -> None:
+        docs = list(docs)
+        rows      = [(d["id"], d["name"], _pack(d)) for d in docs]
+        summaries = [(d["id"], json.dumps(summarize_species(d))) for d in docs]
+        with self._lock:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO species (id, name, doc) VALUES (?, ?, ?)", rows
+            )
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO species_summary (id, doc) VALUES (?, ?)", summaries
+            )
+            self._conn.commit()
+
+    def species_summaries(self) -> Dict[int, dict]:
+        """Every stored species' summary, backfilling any species stored without one."""
+        with self._lock:
+            missing = self._conn.execute(
+                "SELECT id, doc FROM species WHERE id NOT IN (SELECT id FROM species_summary)"
+            ).fetchall()
+        if missing:
+            self.put_species(_unpack(blob) for _, blob in missing)
+        with self._lock:
+            rows = self._conn.execute("SELECT id, doc FROM species_summary").fetchall()
+        return {sid: json.loads(doc) for sid, doc in rows}
+
+    def put_evolutions(self, graph: Dict[int, List[list]]) -> None:
+        rows = [(sid, json.dumps(targets)) for sid, targets in graph.items()]
+        with self._lock:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO evolutions (species_id, targets) VALUES (?, ?)", rows
+            )
+            self._conn.commit()
+
+    def evolutions(self) -> Dict[int, List[list]]:
+        with self._lock:
+            rows = self._conn.execute("SELECT species_id, targets FROM evolutions").fetchall()
+        return {sid: json.loads(targets) for sid, targets in rows}
+
+    def get_move(self, name: str) -> Optional[dict]:
+        with self._lock:
+            row = self._conn.execute("SELECT doc FROM moves WHERE name = ?", (name,)).fetchone()
+        return _unpack(row[0]) if row else None
+
+    def put_moves(self, docs: Iterable[dict]) -> None:
+        rows = [(d["name"], _pack(d)) for d in docs]
+        with self._lock:
+            self._conn.executemany("INSERT OR REPLACE INTO moves (name, doc) VALUES (?, ?)", rows)
+            self._conn.commit()
+
+    def species_ids(self) -> Set[int]:
+        with self._lock:
+            return {r[0] for r in self._conn.execute("SELECT id FROM species")}
+
+    def move_names(self) -> Set[str]:
+        with self._lock:
+            return {r[0] for r in self._conn.execute("SELECT name FROM moves")}
+
+    def counts(self) -> Dict[str, int]:
+        with self._lock:
+            species = self._conn.execute("SELECT COUNT(*) FROM species").fetchone()[0]
+            moves   = self._conn.execute("SELECT COUNT(*) FROM moves").fetchone()[0]
+            evos    = self._conn.execute("SELECT COUNT(*) FROM evolutions").fetchone()[0]
+        return {"species": species, "moves": moves, "evolutions": evos}
+
+    def get_meta(self, key: str) -> Optional[str]:
+        with self._lock:
+            row = self._conn.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else None
+
+    def set_meta(self, key: str, value: str) -> None:
+        with self._lock:
+            self._conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)", (key, value))
+            self._conn.commit()
+
+    def fold_legacy_cache(self, cache_dir: Path) -> int:
+        """Import the old one-JSON-file-per-lookup cache, then delete those files.
+
+        Returns the number of documents imported.
+        """
+        if not cache_dir.is_dir():
+            return 0
+        species: List[dict] = []
+        moves:   List[dict] = []
+        files = list(cache_dir.glob("*.json"))
+        for f in files:
+            try:
+                raw = json.loads(f.read_text())
+                if f.name.startswith("move_"):
+                    moves.append(slim_move(raw))
+                else:
+                    species.append(slim_pokemon(raw))
+            except Exception:
+                continue
+        if species:
+            self.put_species(species)
+        if moves:
+            self.put_moves(moves)
+        for f in files:
+            try:
+                f.unlink()
+            except OSError:
+                pass
+        return len(species) + len(moves)
+
+    # ── async API ─────────────────────────────────────────────────────────────
+
+    async def _run(self, fn, *args: Any) -> Any:
+        return await asyncio.get_running_loop().run_in_executor(None, fn, *args)
+
+    async def aget_species(self, key: str) -> Optional[dict]:
+        return await self._run(self.get_species, key)
+
+    async def aput_species(self, docs: Iterable[dict]) -> None:
+        await self._run(self.put_species, list(docs))
+
+    async def aget_move(self, name: str) -> Optional[dict]:
+        return await self._run(self.get_move, name)
+
+    async def aput_moves(self, docs: Iterable[dict]) -> None:
+        await self._run(self.put_moves, list(docs))
+
+    async def aspecies_summaries(self) -> Dict[int, dict]:
+        return await self._run(self.species_summaries)
+
+    async def aput_evolutions(self, graph: Dict[int, List[list]]) -> None:
+        await self._run(self.put_evolutions, graph)
+
+    async def aevolutions(self) -> Dict[int, List[list]]:
+        return await self._run(self.evolutions)
+
+    async def acounts(self) -> Dict[str, int]:
+        return await self._run(self.counts)